@@ -60,6 +60,8 @@ DUPLICATE_PREFER = {
     "load": "high_level",
     "save": "high_level",
     "run": "high_level",
+    "sweep": "high_level",
+    "cross_validate": "high_level",
     "list_action": "base",
 }
 # List of modules not to expose
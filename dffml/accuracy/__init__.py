@@ -7,7 +7,11 @@ from .accuracy import (
     AccuracyConfig,
     AccuracyContext,
     AccuracyScorer,
+    AccuracyAccumulator,
+    AccuracyScorersContext,
+    AccuracyScorers,
     InvalidNumberOfFeaturesError,
+    accumulate,
 )
 from .mse import MeanSquaredErrorAccuracy
 from .clf import ClassificationAccuracy
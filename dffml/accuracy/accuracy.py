@@ -1,8 +1,14 @@
 import abc
+from typing import Any, Dict, List, Optional
 
 from ..model import ModelContext
-from ..source.source import SourcesContext
+from ..source.source import DEFAULT_BATCH_SIZE, SourcesContext
 from ..util.entrypoint import base_entry_point
+from ..util.asynchelper import (
+    AsyncContextManagerList,
+    AsyncContextManagerListContext,
+    batched,
+)
 from ..base import (
     config,
     BaseDataFlowFacilitatorObjectContext,
@@ -19,6 +25,43 @@ class AccuracyConfig:
     pass
 
 
+class AccuracyAccumulator(abc.ABC):
+    """
+    Running score of a model's predictions. Updated a batch of predictions at
+    a time, so that predictions don't have to be kept in memory.
+    """
+
+    @abc.abstractmethod
+    def update(self, y: List[Any], y_predict: List[Any]) -> None:
+        """
+        Add a batch of values and the values predicted for them to the score
+        """
+
+    @abc.abstractmethod
+    def result(self) -> float:
+        """
+        Score of all the predictions added
+        """
+
+
+async def accumulate(
+    mctx: ModelContext,
+    sources: SourcesContext,
+    accumulators: List[AccuracyAccumulator],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """
+    Make predictions on records in sources once, updating each accumulator
+    with every batch of predictions.
+    """
+    name = mctx.parent.config.predict.name
+    async for records in batched(mctx.predict(sources), batch_size):
+        y = [record.feature(name) for record in records]
+        y_predict = [record.prediction(name).value for record in records]
+        for accumulator in accumulators:
+            accumulator.update(y, y_predict)
+
+
 class AccuracyContext(abc.ABC, BaseDataFlowFacilitatorObjectContext):
     def __init__(self, parent: "Accuracy") -> None:
         self.parent = parent
@@ -45,6 +88,14 @@ class AccuracyContext(abc.ABC, BaseDataFlowFacilitatorObjectContext):
         """
         raise NotImplementedError()
 
+    def accumulator(self, mctx: ModelContext) -> Optional[AccuracyAccumulator]:
+        """
+        Accumulator for the score of predictions made by ``mctx.predict()``.
+        Scorers which can't be updated a batch at a time return None, and are
+        scored with :py:meth:`score`.
+        """
+        return None
+
 
 @base_entry_point("dffml.accuracy", "accuracy")
 class AccuracyScorer(BaseDataFlowFacilitatorObject):
@@ -58,3 +109,41 @@ class AccuracyScorer(BaseDataFlowFacilitatorObject):
 
     def __call__(self) -> AccuracyContext:
         return self.CONTEXT(self)
+
+
+class AccuracyScorersContext(AsyncContextManagerListContext):
+    async def score(
+        self, mctx: ModelContext, sources: SourcesContext,
+    ) -> Dict[str, float]:
+        """
+        Score a model with each scorer. Scorers with accumulators share one
+        pass of predictions over the sources.
+
+        Returns
+        -------
+        dict
+            The score value from each scorer by its entrypoint label
+        """
+        accumulators = {actx: actx.accumulator(mctx) for actx in self.data}
+        shared = [
+            accumulator
+            for accumulator in accumulators.values()
+            if accumulator is not None
+        ]
+        # Only make predictions here if a scorer will use them
+        if shared:
+            await accumulate(mctx, sources, shared)
+        scores = {}
+        for actx, accumulator in accumulators.items():
+            label = actx.parent.ENTRY_POINT_LABEL
+            if accumulator is None:
+                scores[label] = await actx.score(mctx, sources)
+            else:
+                scores[label] = accumulator.result()
+        return scores
+
+
+class AccuracyScorers(AsyncContextManagerList):
+
+    CONTEXT = AccuracyScorersContext
+    SINGLETON = AccuracyScorer
@@ -1,3 +1,6 @@
+import operator
+from typing import Any, List
+
 from ..base import config
 from ..record import Record
 from ..feature import Feature
@@ -7,7 +10,9 @@ from ..source.source import SourcesContext
 from .accuracy import (
     AccuracyScorer,
     AccuracyContext,
+    AccuracyAccumulator,
     InvalidNumberOfFeaturesError,
+    accumulate,
 )
 
 
@@ -16,26 +21,37 @@ class ClassificationAccuracyConfig:
     pass
 
 
+class ClassificationAccuracyAccumulator(AccuracyAccumulator):
+    def __init__(self):
+        self.total = 0
+        self.right_predictions = 0
+
+    def update(self, y: List[Any], y_predict: List[Any]) -> None:
+        self.total += len(y)
+        self.right_predictions += sum(
+            map(operator.eq, map(str, y), map(str, y_predict))
+        )
+
+    def result(self) -> float:
+        return self.right_predictions / self.total
+
+
 class ClassificationAccuracyContext(AccuracyContext):
     """
     Classification Accuracy
     """
 
-    async def score(self, mctx: ModelContext, sources: SourcesContext):
+    def accumulator(self, mctx: ModelContext):
         if len([mctx.parent.config.predict]) != 1:
             raise InvalidNumberOfFeaturesError(
                 f"{self.__class__.__qualname__} can only assess accuracy of one feature. features: {features}"
             )
-        total = 0
-        right_predictions = 0
-        async for record in mctx.predict(sources):
-            if str(record.feature(mctx.parent.config.predict.name)) == str(
-                record.prediction(mctx.parent.config.predict.name).value
-            ):
-                right_predictions += 1
-            total += 1
-        accuracy = right_predictions / total
-        return accuracy
+        return ClassificationAccuracyAccumulator()
+
+    async def score(self, mctx: ModelContext, sources: SourcesContext):
+        accumulator = self.accumulator(mctx)
+        await accumulate(mctx, sources, [accumulator])
+        return accumulator.result()
 
 
 @entrypoint("clf")
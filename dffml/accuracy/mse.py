@@ -1,3 +1,5 @@
+from typing import Any, List
+
 from ..base import config
 from ..record import Record
 from ..feature import Feature
@@ -7,7 +9,9 @@ from ..source.source import SourcesContext
 from .accuracy import (
     AccuracyScorer,
     AccuracyContext,
+    AccuracyAccumulator,
     InvalidNumberOfFeaturesError,
+    accumulate,
 )
 
 
@@ -16,27 +20,38 @@ class MeanSquaredErrorAccuracyConfig:
     pass
 
 
+class MeanSquaredErrorAccuracyAccumulator(AccuracyAccumulator):
+    def __init__(self):
+        self.total = 0
+        self.squared_error = 0
+
+    def update(self, y: List[Any], y_predict: List[Any]) -> None:
+        self.total += len(y)
+        self.squared_error += sum(
+            abs(value - predicted) ** 2
+            for value, predicted in zip(y, y_predict)
+        )
+
+    def result(self) -> float:
+        return self.squared_error / self.total
+
+
 class MeanSquaredErrorAccuracyContext(AccuracyContext):
     """
     Mean Squared Error
     """
 
-    async def score(self, mctx: ModelContext, sources: SourcesContext):
+    def accumulator(self, mctx: ModelContext):
         if len([mctx.parent.config.predict]) != 1:
             raise InvalidNumberOfFeaturesError(
                 f"{self.__class__.__qualname__} can only assess accuracy of one feature. features: {features}"
             )
-        y = []
-        y_predict = []
-        async for record in mctx.predict(sources):
-            y.append(record.feature(mctx.parent.config.predict.name))
-            y_predict.append(
-                record.prediction(mctx.parent.config.predict.name).value
-            )
-        accuracy = sum(
-            list(map(lambda x, y: abs(x - y) ** 2, y, y_predict))
-        ) / len(y)
-        return accuracy
+        return MeanSquaredErrorAccuracyAccumulator()
+
+    async def score(self, mctx: ModelContext, sources: SourcesContext):
+        accumulator = self.accumulator(mctx)
+        await accumulate(mctx, sources, [accumulator])
+        return accumulator.result()
 
 
 @entrypoint("mse")
@@ -37,7 +37,7 @@ from ..base import field, config
 
 from .dataflow import Dataflow
 from .config import Config
-from .ml import Train, Accuracy, Predict
+from .ml import Train, Accuracy, Sweep, Predict
 from .list import List
 
 version = VERSION
@@ -365,6 +365,7 @@ class CLI(CMD):
     export = Export
     train = Train
     accuracy = Accuracy
+    sweep = Sweep
     predict = Predict
     service = services()
     dataflow = Dataflow
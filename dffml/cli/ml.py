@@ -1,9 +1,11 @@
 import inspect
+from typing import List
 
 from ..model.model import Model
 from ..source.source import Sources, SubsetSources
 from ..util.cli.cmd import CMD, CMDOutputOverride
-from ..high_level import train, predict, accuracy
+from ..high_level import train, predict, accuracy, sweep
+from ..util.data import parser_helper
 from ..util.config.fields import FIELD_SOURCES
 from ..util.cli.cmds import (
     SourcesCMD,
@@ -14,7 +16,7 @@ from ..util.cli.cmds import (
     KeysCMDConfig,
 )
 from ..base import config, field
-from ..accuracy import AccuracyScorer
+from ..accuracy import AccuracyScorers
 
 
 @config
@@ -25,8 +27,10 @@ class MLCMDConfig(SourcesCMDConfig, ModelCMDConfig):
 @config
 class AccuracyCMDConfig:
     model: Model = field("Model used for ML", required=True)
-    scorer: AccuracyScorer = field(
-        "Method to use to score accuracy", required=True
+    scorer: AccuracyScorers = field(
+        "Methods to use to score accuracy. Scorers which support it share one "
+        "pass of predictions",
+        required=True,
     )
     sources: Sources = FIELD_SOURCES
 
@@ -59,12 +63,75 @@ class Accuracy(MLCMD):
 
     CONFIG = AccuracyCMDConfig
 
+    def accuracy_scorer(self):
+        """
+        Scorer to use, or scorers if more than one was given
+        """
+        if not isinstance(self.scorer, AccuracyScorers):
+            self.scorer = AccuracyScorers(self.scorer)
+        # Instantiate the accuracy scorer classes if for some reason they are
+        # classes at this point rather than instances.
+        for i in range(len(self.scorer)):
+            if inspect.isclass(self.scorer[i]):
+                self.scorer[i] = self.scorer[i].withconfig(self.extra_config)
+        # Output only the score if there is one scorer
+        if len(self.scorer) == 1:
+            return self.scorer[0]
+        return self.scorer
+
+    async def run(self):
+        return await accuracy(self.model, self.accuracy_scorer(), self.sources)
+
+
+@config
+class SweepCMDConfig(AccuracyCMDConfig):
+    grid: List[str] = field(
+        "Model config values to try, as property=value1,value2",
+        default_factory=lambda: [],
+    )
+    folds: int = field(
+        "Number of folds to cross validate with. Folds are contiguous slices "
+        "of the records in the order the sources give them unless -shuffle "
+        "is given",
+        default=5,
+    )
+    processes: int = field(
+        "Number of processes to train and score with, defaults to the number "
+        "of CPUs",
+        default=None,
+    )
+    shuffle: bool = field(
+        "Shuffle the records before splitting them into folds", default=False,
+    )
+    seed: int = field(
+        "Seed for shuffling the records, so the folds are the same each time",
+        default=None,
+    )
+
+
+class Sweep(Accuracy):
+    """Cross validate a model with each combination of model config values"""
+
+    CONFIG = SweepCMDConfig
+
     async def run(self):
-        # Instantiate the accuracy scorer class if for some reason it is a class
-        # at this point rather than an instance.
-        if inspect.isclass(self.scorer):
-            self.scorer = self.scorer.withconfig(self.extra_config)
-        return await accuracy(self.model, self.scorer, self.sources)
+        grid = {}
+        for values in self.grid:
+            name, values = values.split("=", maxsplit=1)
+            values = parser_helper(values)
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            grid[name] = list(values)
+        return await sweep(
+            self.model,
+            self.accuracy_scorer(),
+            self.sources,
+            grid=grid,
+            folds=self.folds,
+            processes=self.processes,
+            shuffle=self.shuffle,
+            seed=self.seed,
+        )
 
 
 @config
@@ -147,6 +147,27 @@ class BaseDatabaseContext(
         except:
             await self.update(table_name, data, conditions=[])
 
+    async def insert_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Inserts each dict in `rows` into the table `table_name`. Databases
+        which can insert many rows with one query should override this.
+        """
+        for data in rows:
+            await self.insert(table_name, data)
+
+    async def insert_or_update_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Inserts or updates each dict in `rows` in the table `table_name`.
+        Databases which can upsert many rows with one query should override
+        this.
+        """
+        for data in rows:
+            await self.insert_or_update(table_name, data)
+
 
 @base_entry_point("dffml.db", "db")
 class BaseDatabase(BaseDataFlowObject):
@@ -1,17 +1,36 @@
 import asyncio
 import sqlite3
+import concurrent.futures
+from contextlib import asynccontextmanager
 from typing import Dict, Any, List, Optional, AsyncIterator
 
 
 from .base import BaseDatabase, Conditions
 from .sql import SQLDatabaseContext
-from ..base import config
+from ..base import config, field
 from ..util.entrypoint import entrypoint
 
+# INSERT ... ON CONFLICT DO UPDATE was added in SQLite 3.24.0
+SQLITE_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
 
 @config
 class SqliteDatabaseConfig:
     filename: str
+    connections: int = field(
+        "Number of connections to run queries on, each in its own thread. "
+        "Enables write ahead logging. Must be at least 2, since lookup holds "
+        "a connection until all its rows have been consumed. If 0, queries "
+        "are run on the event loop thread using a single connection",
+        default=0,
+    )
+    fetch_size: int = field(
+        "Number of rows lookup fetches from the database at a time",
+        default=1000,
+    )
+    cached_statements: int = field(
+        "Number of prepared statements each connection caches", default=128
+    )
 
 
 class SqliteDatabaseContext(SQLDatabaseContext):
@@ -20,14 +39,29 @@ class SqliteDatabaseContext(SQLDatabaseContext):
     ) -> None:
         query = self.create_table_query(table_name, cols)
         self.logger.debug(query)
-        self.parent.cursor.execute(query)
+        async with self.parent.connection() as run:
+            await run(self.parent.execute, query, [])
 
     async def insert(self, table_name: str, data: Dict[str, Any]) -> None:
         query, query_values = self.insert_query(table_name, data)
-        async with self.parent.lock:
-            with self.parent.db:
-                self.logger.debug(query)
-                self.parent.cursor.execute(query, list(data.values()))
+        self.logger.debug(query)
+        async with self.parent.connection() as run:
+            await run(self.parent.execute, query, query_values)
+
+    async def insert_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        if not rows:
+            return
+        # All rows are inserted into the columns of the first
+        query, _ = self.insert_query(table_name, rows[0])
+        self.logger.debug(query)
+        async with self.parent.connection() as run:
+            await run(
+                self.parent.executemany,
+                query,
+                [[row[col] for col in rows[0]] for row in rows],
+            )
 
     async def update(
         self,
@@ -38,10 +72,9 @@ class SqliteDatabaseContext(SQLDatabaseContext):
         query, query_values = self.update_query(
             table_name, data, conditions=conditions
         )
-        async with self.parent.lock:
-            with self.parent.db:
-                self.logger.debug(query)
-                self.parent.cursor.execute(query, query_values)
+        self.logger.debug(query)
+        async with self.parent.connection() as run:
+            await run(self.parent.execute, query, query_values)
 
     async def lookup(
         self,
@@ -52,11 +85,17 @@ class SqliteDatabaseContext(SQLDatabaseContext):
         query, query_values = self.lookup_query(
             table_name, cols=cols, conditions=conditions
         )
-        async with self.parent.lock:
-            with self.parent.db:
-                self.logger.debug(query)
-                self.parent.cursor.execute(query, query_values)
-                for row in self.parent.cursor.fetchall():
+        self.logger.debug(query)
+        async with self.parent.connection() as run:
+            cursor = await run(self.parent.select, query, query_values)
+            rows = True
+            while rows:
+                rows = await run(
+                    self.parent.fetchmany,
+                    cursor,
+                    self.parent.config.fetch_size,
+                )
+                for row in rows:
                     yield dict(row)
 
     async def remove(
@@ -65,12 +104,81 @@ class SqliteDatabaseContext(SQLDatabaseContext):
         query, query_values = self.remove_query(
             table_name, conditions=conditions
         )
-        async with self.parent.lock:
-            with self.parent.db:
-                self.logger.debug(query)
-                self.parent.cursor.execute(query, query_values)
+        self.logger.debug(query)
+        async with self.parent.connection() as run:
+            await run(self.parent.execute, query, query_values)
+
+    def insert_or_update_query(
+        self, table_name: str, data: Dict[str, Any], keys: List[str]
+    ):
+        """
+        Creates an insert query which updates the other columns in ``data``
+        of the existing row when one with the same ``keys`` exists.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table.
+        data : dict
+            Columns names are keys, values are data to insert.
+        keys : list
+            Column names of the primary key of the table.
+
+        Returns
+        -------
+        query : str
+            ``INSERT ... ON CONFLICT`` query
+        parameters : tuple
+            Variables to bind
+        """
+        query, query_values = self.insert_query(table_name, data)
+        if not keys:
+            return query, query_values
+        update_exp = ", ".join(
+            [f"`{col}` = excluded.`{col}`" for col in data if col not in keys]
+        )
+        query += f"ON CONFLICT( {', '.join([f'`{col}`' for col in keys])} ) "
+        query += f"DO UPDATE SET {update_exp}" if update_exp else "DO NOTHING"
+        return query, query_values
 
     async def insert_or_update(self, table_name: str, data: Dict[str, Any]):
+        await self.insert_or_update_many(table_name, [data])
+
+    async def insert_or_update_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        if not rows:
+            return
+        async with self.parent.connection() as run:
+            keys = await run(self.parent.primary_key, table_name)
+            if SQLITE_UPSERT and keys and all(col in rows[0] for col in keys):
+                # All rows are inserted into the columns of the first
+                query, _ = self.insert_or_update_query(
+                    table_name, rows[0], keys
+                )
+                self.logger.debug(query)
+                try:
+                    await run(
+                        self.parent.executemany,
+                        query,
+                        [[row[col] for col in rows[0]] for row in rows],
+                    )
+                    return
+                except sqlite3.IntegrityError:
+                    # Conflict on a UNIQUE column which isn't the primary key,
+                    # nothing was written
+                    pass
+        for data in rows:
+            await self.insert_or_update_row(table_name, data)
+
+    async def insert_or_update_row(
+        self, table_name: str, data: Dict[str, Any]
+    ):
+        """
+        Insert a row, or update the row it conflicts with. Used when rows
+        can't be upserted on the primary key, such as when it's not given,
+        rows conflict on another UNIQUE column, or SQLite is older than 3.24.
+        """
         try:
             await self.insert(table_name, data)
         except sqlite3.IntegrityError as e:
@@ -83,6 +191,7 @@ class SqliteDatabaseContext(SQLDatabaseContext):
             _key = e.split("UNIQUE constraint failed:")[-1]
             _key = _key.split(table_name + ".")[-1]
 
+            data = data.copy()
             _keyval = data.pop(_key)
             conditions = [[[_key, "=", _keyval]]]
             await self.update(table_name, data, conditions)
@@ -90,21 +199,126 @@ class SqliteDatabaseContext(SQLDatabaseContext):
 
 @entrypoint("sqlite")
 class SqliteDatabase(BaseDatabase):
+    """
+    SQLite database. By default every query runs on the event loop thread.
+    Set ``connections`` to run queries in threads, so that large lookups
+    don't block other coroutines.
+    """
+
     CONFIG = SqliteDatabaseConfig
     CONTEXT = SqliteDatabaseContext
 
     def __init__(self, cfg):
         super().__init__(cfg)
+        # Queries made while consuming rows from lookup would wait forever for
+        # the connection it holds
+        if self.config.connections == 1:
+            raise ValueError(
+                "connections must be 0 or at least 2, lookup holds a "
+                "connection while rows are consumed"
+            )
         self.lock = None
         self.db = None
         self.cursor = None
+        self.pool = None
+        self.executors = []
+
+    def connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(
+            self.config.filename,
+            cached_statements=self.config.cached_statements,
+            # Pooled connections are only used by their own thread, but are
+            # created and closed by the event loop thread
+            check_same_thread=not self.config.connections,
+        )
+        db.row_factory = sqlite3.Row
+        return db
 
     async def __aenter__(self):
         self.lock = asyncio.Lock()
-        self.db = sqlite3.connect(self.config.filename)
-        self.db.row_factory = sqlite3.Row
+        self.db = self.connect()
         self.cursor = self.db.cursor()
+        # Each connection to an in memory database is a new database
+        if self.config.connections and self.config.filename != ":memory:":
+            # Let readers and a writer use the database at the same time
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.pool = asyncio.Queue()
+            for _ in range(0, self.config.connections):
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                self.executors.append(executor)
+                self.pool.put_nowait((executor, self.connect()))
         return await super().__aenter__()
 
     async def __aexit__(self, _exc_type, _exc_value, _traceback):
+        for executor in self.executors:
+            executor.shutdown()
+        self.executors = []
+        if self.pool is not None:
+            while not self.pool.empty():
+                _executor, db = self.pool.get_nowait()
+                db.close()
+            self.pool = None
         self.db.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Yields a coroutine function which calls the function it is given with
+        a connection, followed by any other arguments. The connection is held
+        until the context exits, so cursors can be used across calls.
+        """
+        if self.pool is None:
+            async with self.lock:
+
+                async def run(func, *args):
+                    return func(self.db, *args)
+
+                yield run
+            return
+        executor, db = await self.pool.get()
+        try:
+            loop = asyncio.get_event_loop()
+
+            async def run(func, *args):
+                return await loop.run_in_executor(executor, func, db, *args)
+
+            yield run
+        finally:
+            self.pool.put_nowait((executor, db))
+
+    @staticmethod
+    def execute(db: sqlite3.Connection, query: str, values: List[Any]):
+        with db:
+            db.execute(query, values)
+
+    @staticmethod
+    def executemany(
+        db: sqlite3.Connection, query: str, values: List[List[Any]]
+    ):
+        with db:
+            db.executemany(query, values)
+
+    @staticmethod
+    def primary_key(db: sqlite3.Connection, table_name: str) -> List[str]:
+        # Columns which are part of the primary key have their (1 based)
+        # position within it as their pk value
+        return [
+            row["name"]
+            for row in sorted(
+                db.execute(f"PRAGMA table_info(`{table_name}`)"),
+                key=lambda row: row["pk"],
+            )
+            if row["pk"]
+        ]
+
+    @staticmethod
+    def select(
+        db: sqlite3.Connection, query: str, values: List[Any]
+    ) -> sqlite3.Cursor:
+        return db.execute(query, values)
+
+    @staticmethod
+    def fetchmany(
+        db: sqlite3.Connection, cursor: sqlite3.Cursor, size: int
+    ) -> List[sqlite3.Row]:
+        return cursor.fetchmany(size)
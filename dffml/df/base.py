@@ -98,6 +98,18 @@ class OperationImplementationContext(BaseDataFlowObjectContext):
         object associated with this operation implementation context.
         """
 
+    async def run_in_executor(self, executor: str, func, *args, **kwargs):
+        """
+        Run a non-async function in the ``"thread"`` or ``"process"`` pool of
+        the orchestrator context's operation implementation network. If there
+        is no network which has pools, such as when using ``test()``, the
+        function is called directly.
+        """
+        nctx = getattr(self.octx, "nctx", None)
+        if getattr(nctx, "run_in_executor", None) is None:
+            return func(*args, **kwargs)
+        return await nctx.run_in_executor(executor, func, *args, **kwargs)
+
     @asynccontextmanager
     async def subflow(self, dataflow):
         """
@@ -277,6 +289,12 @@ def op(
     upon entry is assigned to a parameter in the ``OperationImplementation``
     instance named after the respective key.
 
+    Non-async functions run on the event loop, blocking other operations while
+    they run. Passing ``executor="thread"`` or ``executor="process"`` runs them
+    in the respective pool of the operation implementation network instead.
+    For ``"process"`` the function must be importable, and its inputs and
+    outputs picklable.
+
     Examples
     --------
 
@@ -363,13 +381,27 @@ def op(
                 ]
             )
         )
+        # Non async functions which don't use self can be run in a thread or
+        # process pool via loop.run_in_executor if the operation's executor
+        # is set. Generators are left on the event loop since calling them
+        # does no work.
+        offloadable = not (
+            uses_self
+            or inspect.iscoroutinefunction(func)
+            or inspect.isgeneratorfunction(func)
+            or inspect.isasyncgenfunction(func)
+            or inspect.isclass(func)
+        )
+        if kwargs.get("executor", None) is not None and not offloadable:
+            raise ValueError(
+                f"{func.__qualname__}: executor may only be set for non-async functions which do not use self"
+            )
         # Check if the function uses the operation implementation config
-        # This exists because eventually we will make non async functions
-        # wrapped with op run with loop.run_in_executor when that happens it's
-        # likely that self won't be serializeable into the thread / process.
-        # Config's are guaranteed to be serializable, therefore this lets us
-        # define operations that have configs and needs to access them when
-        # running within another thread.
+        # This exists because non async functions wrapped with op may run with
+        # loop.run_in_executor, self isn't serializeable into the thread /
+        # process. Config's are guaranteed to be serializable, therefore this
+        # lets us define operations that have configs and needs to access them
+        # when running within another thread.
         uses_config = None
         if config_cls is not None:
             for name, param in sig.parameters.items():
@@ -472,8 +504,13 @@ def op(
                             result = await result
                     elif inspect.iscoroutinefunction(func):
                         result = await func(**inputs)
+                    elif offloadable and self.parent.op.executor is not None:
+                        # Only the inputs and outputs need to be serializable
+                        # for the process pool, func is pickled by reference
+                        result = await self.run_in_executor(
+                            self.parent.op.executor, func, **inputs
+                        )
                     else:
-                        # TODO Add auto thread pooling of non-async functions
                         result = func(**inputs)
                     if auto_def_outputs and len(self.parent.op.outputs) == 1:
                         if inspect.isasyncgen(result):
@@ -808,10 +845,21 @@ class BaseInputNetworkContext(BaseDataFlowObjectContext):
         rctx: "BaseRedundancyCheckerContext",
         operation: Operation,
         ctx: Optional[BaseInputSetContext] = None,
+        *,
+        new_input_set: Optional[BaseInputSet] = None,
     ) -> AsyncIterator[BaseParameterSet]:
         """
         Generate all possible permutations of applicable inputs for an operation
-        that, according to the redundancy checker, haven't been run yet.
+        that, according to the redundancy checker, haven't been run yet. If
+        new_input_set is given, implementations may only generate the
+        permutations which include inputs from it.
+        """
+
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Called once all operations for a context have completed and its
+        outputs have been created. Implementations may release anything held
+        for the context.
         """
 
 
@@ -874,10 +922,6 @@ class BaseRedundancyCheckerConfig(NamedTuple):
     key_value_store: BaseKeyValueStore
 
 
-# TODO store redundancy checks by BaseInputSetContext.handle() and add method
-# to remove all associated with a particular handle. Aka allow us to clean up
-# the input, redundancy, etc. networks after execution of a context completes
-# via the orchestrator.
 class BaseRedundancyCheckerContext(BaseDataFlowObjectContext):
     """
     Abstract Base Class for redundancy checking context
@@ -893,6 +937,13 @@ class BaseRedundancyCheckerContext(BaseDataFlowObjectContext):
     async def add(self, operation: Operation, parameter_set: BaseParameterSet):
         pass
 
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Called once all operations for a context have completed. Implementations
+        may forget which operations were run within the context. Those backed
+        by persistent or shared storage may choose to keep them.
+        """
+
 
 @base_entry_point("dffml.redundancy.checker", "rchecker")
 class BaseRedundancyChecker(BaseDataFlowObject):
@@ -902,7 +953,6 @@ class BaseRedundancyChecker(BaseDataFlowObject):
     """
 
 
-# TODO Provide a way to clear out all locks for inputs within a context
 class BaseLockNetworkContext(BaseDataFlowObjectContext):
     @abc.abstractmethod
     async def acquire(self, parameter_set: BaseParameterSet) -> bool:
@@ -911,6 +961,12 @@ class BaseLockNetworkContext(BaseDataFlowObjectContext):
         the parameter set.
         """
 
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Called once all operations for a context have completed.
+        Implementations may release the locks of inputs within the context.
+        """
+
 
 @base_entry_point("dffml.lock.network", "lock", "network")
 class BaseLockNetwork(BaseDataFlowObject):
@@ -4,13 +4,17 @@ import copy
 import asyncio
 import secrets
 import inspect
+import functools
 import itertools
 import traceback
+import collections
+import collections.abc
 import concurrent.futures
 from itertools import product, chain
 from contextlib import asynccontextmanager, AsyncExitStack, ExitStack
 from typing import (
     AsyncIterator,
+    Deque,
     Dict,
     List,
     Tuple,
@@ -19,6 +23,7 @@ from typing import (
     Union,
     Optional,
     Set,
+    FrozenSet,
     Callable,
 )
 
@@ -35,7 +40,9 @@ from .types import (
     Operation,
     Stage,
     DataFlow,
+    InputFlow,
     NO_DEFAULT,
+    _NO_DEFAULT,
 )
 from .base import (
     OperationException,
@@ -74,7 +81,7 @@ from ..base import config, field
 from ..util.entrypoint import entrypoint
 from ..util.cli.arg import Arg
 from ..util.data import ignore_args
-from ..util.asynchelper import aenter_stack, concurrently
+from ..util.asynchelper import aenter_stack
 from ..util.crypto import secure_hash
 
 from .log import LOGGER
@@ -270,6 +277,223 @@ class MemoryInputNetworkContextEntry(NamedTuple):
     ctx: BaseInputSetContext
     definitions: Dict[Definition, List[Input]]
     by_origin: Dict[Union[str, Tuple[str, str]], List[Input]]
+    # Index of inputs by their origin and the name of their definition. Used to
+    # find inputs which could be parameters without searching all inputs from
+    # an origin.
+    by_origin_definition: Dict[
+        Tuple[Union[str, Tuple[str, str]], str], List[Input]
+    ]
+
+
+class MemoryInputSourcePlan(NamedTuple):
+    """
+    Where inputs for an operation's input may come from
+    """
+
+    origin: Union[str, Tuple[str, str]]
+    # Names of definitions inputs from the origin must have
+    definition_names: Tuple[str, ...]
+    # When the input source was a list, origins each parent up the ancestry
+    # tree must have. None otherwise.
+    ancestor_origins: Optional[Tuple[Union[str, Tuple[str, str]], ...]]
+
+
+class MemoryInputPlan(NamedTuple):
+    sources: Tuple[MemoryInputSourcePlan, ...]
+    # Used when there are no inputs in the network for the input
+    default: Optional[Input]
+
+
+class MemoryOperationPlan(NamedTuple):
+    operation: Operation
+    inputs: Dict[str, MemoryInputPlan]
+    # Each condition is satisfied by one or more origins, along with the names
+    # of the definitions inputs from that origin must have
+    conditions: Tuple[
+        Tuple[Tuple[Union[str, Tuple[str, str]], Tuple[str, ...]], ...], ...
+    ]
+    condition_origins: FrozenSet[Union[str, Tuple[str, str]]]
+
+
+class MemoryDataFlowPlan(NamedTuple):
+    """
+    DataFlow compiled into what is needed to match inputs to operations, so
+    that the flow only has to be interpreted once.
+    """
+
+    operations: Dict[str, MemoryOperationPlan]
+    # Instance names of operations which inputs with a given origin and
+    # definition name may be used by, by stage. A definition name of None
+    # means inputs from the origin with any definition.
+    downstream: Dict[
+        Stage, Dict[Tuple[Union[str, Tuple[str, str]], str], Tuple[str, ...]]
+    ]
+
+    @classmethod
+    def compile(cls, dataflow: DataFlow) -> "MemoryDataFlowPlan":
+        """
+        >>> from dffml import *
+        >>>
+        >>> @op
+        ... def double(value: int) -> int:
+        ...     return value * 2
+        >>>
+        >>> plan = MemoryDataFlowPlan.compile(DataFlow(double))
+        >>> plan.operations["double"].inputs["value"].sources
+        (MemoryInputSourcePlan(origin='seed', definition_names=('double.inputs.value',), ancestor_origins=None),)
+        >>> plan.downstream[Stage.PROCESSING]
+        {('seed', 'double.inputs.value'): ('double',)}
+        """
+        operations: Dict[str, MemoryOperationPlan] = {}
+        downstream: Dict[
+            Stage, Dict[Tuple[Union[str, Tuple[str, str]], str], List[str]]
+        ] = {}
+        for instance_name, input_flow in dataflow.flow.items():
+            operation = dataflow.operations[instance_name]
+            stage_downstream = downstream.setdefault(operation.stage, {})
+
+            def add_downstream(origin, definition_names):
+                for definition_name in definition_names:
+                    instance_names = stage_downstream.setdefault(
+                        (origin, definition_name), []
+                    )
+                    if instance_name not in instance_names:
+                        instance_names.append(instance_name)
+
+            inputs: Dict[str, MemoryInputPlan] = {}
+            for input_name, input_sources in input_flow.inputs.items():
+                sources = []
+                # Alternate definitions found in any of the input sources
+                all_alternate_definitions = []
+                for input_source in input_sources:
+                    ancestor_origins = None
+                    if isinstance(input_source, list):
+                        ancestor_origins = []
+                        for ancestor_origin in input_source:
+                            if isinstance(ancestor_origin, dict):
+                                ancestor_origins.extend(
+                                    ancestor_origin.items()
+                                )
+                            else:
+                                ancestor_origins.append(ancestor_origin)
+                        # The first is the origin of the input itself
+                        ancestor_origins = tuple(ancestor_origins[1:])
+                    for origin in MemoryInputNetworkContext._origins(
+                        input_source
+                    ):
+                        # Check if the origin is a tuple where the first value
+                        # is the origin (such as "seed") and the second value
+                        # is an array of allowed alternate Definition's (their
+                        # names) within that origin. These definitions will be
+                        # used instead of the default one the input specified
+                        # for the operation).
+                        (
+                            alternate_definitions,
+                            origin,
+                        ) = input_flow.get_alternate_definitions(origin)
+                        all_alternate_definitions.extend(alternate_definitions)
+                        # TODO(p2) We favored comparing names to defintions
+                        # because sometimes we create defintions which have
+                        # specs which create new types which will not equal
+                        # each other. We maybe want to consider switching to
+                        # comparing exported Defintions
+                        if alternate_definitions:
+                            definition_names = tuple(alternate_definitions)
+                        elif isinstance(origin, str):
+                            definition_names = (
+                                operation.inputs[input_name].name,
+                            )
+                        else:
+                            definition_names = (
+                                dataflow.operations[origin[0]]
+                                .outputs[origin[1]]
+                                .name,
+                            )
+                        sources.append(
+                            MemoryInputSourcePlan(
+                                origin=origin,
+                                definition_names=definition_names,
+                                ancestor_origins=ancestor_origins,
+                            )
+                        )
+                        add_downstream(origin, definition_names)
+                # If there is no data in the network for the input, the
+                # default will either come from the definition attached to
+                # input_name, or it will come from one of the alternate
+                # definition given within the input flow for the input_name.
+                default = None
+                check_for_default_value = [operation.inputs[input_name]] + [
+                    dataflow.definitions[definition_name]
+                    for definition_name in all_alternate_definitions
+                    if definition_name in dataflow.definitions
+                ]
+                for definition in check_for_default_value:
+                    # Definitions which have been copied will have a copy of
+                    # NO_DEFAULT, so we can't check by identity
+                    if not isinstance(definition.default, _NO_DEFAULT):
+                        # The uid is deterministic so that the redundancy
+                        # checker sees the same default each time
+                        default = Input(
+                            value=definition.default,
+                            definition=definition,
+                            uid=f"{operation.instance_name}.inputs.{input_name}.default",
+                        )
+                        break
+                # Operations with defaults may be able to run when any input
+                # from the origin arrives
+                if default is not None:
+                    for source in sources:
+                        add_downstream(source.origin, (None,))
+                inputs[input_name] = MemoryInputPlan(
+                    sources=tuple(sources), default=default
+                )
+            conditions = []
+            for i, condition_source in enumerate(input_flow.conditions):
+                # Create a list of places this input originates from
+                origins = []
+                if isinstance(condition_source, dict):
+                    origins.extend(condition_source.items())
+                else:
+                    origins.append(condition_source)
+                condition = []
+                for origin in origins:
+                    (
+                        alternate_definitions,
+                        origin,
+                    ) = input_flow.get_alternate_definitions(origin)
+                    if alternate_definitions:
+                        definition_names = tuple(alternate_definitions)
+                    elif isinstance(condition_source, str):
+                        definition_names = (operation.conditions[i].name,)
+                    else:
+                        definition_names = (
+                            dataflow.operations[origin[0]]
+                            .outputs[origin[1]]
+                            .name,
+                        )
+                    condition.append((origin, definition_names))
+                    add_downstream(origin, definition_names)
+                conditions.append(tuple(condition))
+            operations[instance_name] = MemoryOperationPlan(
+                operation=operation,
+                inputs=inputs,
+                conditions=tuple(conditions),
+                condition_origins=frozenset(
+                    origin
+                    for condition in conditions
+                    for origin, _definition_names in condition
+                ),
+            )
+        return cls(
+            operations=operations,
+            downstream={
+                stage: {
+                    key: tuple(instance_names)
+                    for key, instance_names in stage_downstream.items()
+                }
+                for stage, stage_downstream in downstream.items()
+            },
+        )
 
 
 class MemoryDefinitionSetContext(BaseDefinitionSetContext):
@@ -278,7 +502,7 @@ class MemoryDefinitionSetContext(BaseDefinitionSetContext):
         handle = await self.ctx.handle()
         handle_string = handle.as_string()
         # Associate inputs with their context handle grouped by definition
-        async with self.parent.ctxhd_lock:
+        async with self.parent.ctx_lock(handle_string):
             # Yield all items under the context for the given definition
             entry = self.parent.ctxhd[handle_string]
             for item in entry.definitions[definition]:
@@ -293,9 +517,28 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
         self.ctx_notification_set = NotificationSet()
         self.input_notification_set = {}
         # Organize by context handle string then by definition within that
-        self.ctxhd: Dict[str, Dict[Definition, Any]] = {}
-        # TODO Create ctxhd_locks dict to manage a per context lock
-        self.ctxhd_lock = asyncio.Lock()
+        self.ctxhd: Dict[str, MemoryInputNetworkContextEntry] = {}
+        # Each context has its own lock so that contexts never wait on each
+        # other when adding or gathering inputs
+        self.ctxhd_locks: Dict[str, asyncio.Lock] = {}
+
+    @asynccontextmanager
+    async def ctx_lock(self, handle_string: str):
+        """
+        Hold the lock guarding the inputs of the context with the given handle
+        string
+        """
+        while True:
+            if not handle_string in self.ctxhd_locks:
+                self.ctxhd_locks[handle_string] = asyncio.Lock()
+            lock = self.ctxhd_locks[handle_string]
+            async with lock:
+                # The lock is removed along with the context. If that happened
+                # while we waited, a new lock may already guard the context.
+                if self.ctxhd_locks.get(handle_string) is not lock:
+                    continue
+                yield
+                return
 
     async def receive_from_parent_flow(self, inputs: List[Input]):
         """
@@ -303,23 +546,46 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
         """
         if not inputs:
             return
-        async with self.ctxhd_lock:
-            ctx_keys = list(self.ctxhd.keys())
+        ctx_keys = list(self.ctxhd.keys())
         self.logger.debug(f"Receiving {inputs} from parent flow")
         self.logger.debug(f"Forwarding inputs to contexts {ctx_keys}")
         for ctx in ctx_keys:
-            await self.sadd(ctx, *inputs)
+            # Skip contexts which completed while we were forwarding
+            if ctx in self.ctxhd:
+                await self.sadd(ctx, *inputs)
 
     async def add(self, input_set: BaseInputSet):
         # Grab the input set context handle
         handle = await input_set.ctx.handle()
         handle_string = handle.as_string()
-        # TODO These ctx.add calls should probably happen after inputs are in
-        # self.ctxhd
 
         # remove unvalidated inputs
         unvalidated_input_set = await input_set.remove_unvalidated_inputs()
 
+        # Associate inputs with their context handle grouped by definition.
+        # This happens before notification so that gather_inputs will always
+        # find the inputs which it was notified about.
+        async with self.ctx_lock(handle_string):
+            # Create dict for handle_string if not present
+            if not handle_string in self.ctxhd:
+                self.ctxhd[handle_string] = MemoryInputNetworkContextEntry(
+                    ctx=input_set.ctx,
+                    definitions={},
+                    by_origin={},
+                    by_origin_definition={},
+                )
+            entry = self.ctxhd[handle_string]
+            # Go through each item in the input set
+            async for item in input_set.inputs():
+                # Add input to by defintion set
+                entry.definitions.setdefault(item.definition, []).append(item)
+                # Add input to by origin set
+                entry.by_origin.setdefault(item.origin, []).append(item)
+                # Add input to by origin and definition name index
+                entry.by_origin_definition.setdefault(
+                    (item.origin, item.definition.name), []
+                ).append(item)
+
         # If the context for this input set does not exist create a
         # NotificationSet for it to notify the orchestrator
         if not handle_string in self.input_notification_set:
@@ -329,30 +595,6 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
         # Add the input set to the incoming inputs
         async with self.input_notification_set[handle_string]() as ctx:
             await ctx.add((unvalidated_input_set, input_set))
-        # Associate inputs with their context handle grouped by definition
-        async with self.ctxhd_lock:
-            # Create dict for handle_string if not present
-            if not handle_string in self.ctxhd:
-                self.ctxhd[handle_string] = MemoryInputNetworkContextEntry(
-                    ctx=input_set.ctx, definitions={}, by_origin={}
-                )
-            # Go through each item in the input set
-            async for item in input_set.inputs():
-                # Create set for item definition if not present
-                if (
-                    not item.definition
-                    in self.ctxhd[handle_string].definitions
-                ):
-                    self.ctxhd[handle_string].definitions[item.definition] = []
-                # Add input to by defintion set
-                self.ctxhd[handle_string].definitions[item.definition].append(
-                    item
-                )
-                # Create set for item origin if not present
-                if not item.origin in self.ctxhd[handle_string].by_origin:
-                    self.ctxhd[handle_string].by_origin[item.origin] = []
-                # Add input to by origin set
-                self.ctxhd[handle_string].by_origin[item.origin].append(item)
 
     async def uadd(self, *args: Input):
         """
@@ -401,6 +643,40 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
         )
         return ctx
 
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Remove all inputs and notifications for a context which has completed
+        """
+        handle_string = (await ctx.handle()).as_string()
+        async with self.ctx_lock(handle_string):
+            self.ctxhd.pop(handle_string, None)
+            self.input_notification_set.pop(handle_string, None)
+            # Anything waiting on the lock will take a new one
+            self.ctxhd_locks.pop(handle_string, None)
+        # Nothing waits on new contexts via ctx(), so the notification for this
+        # context may never have been taken out of the notification set
+        async with self.ctx_notification_set.lock:
+            notification_items = []
+            for item in self.ctx_notification_set.notification_items:
+                if (await item[1].handle()).as_string() != handle_string:
+                    notification_items.append(item)
+            self.ctx_notification_set.notification_items = notification_items
+            if not notification_items:
+                self.ctx_notification_set.event_added.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of contexts and inputs within the input network
+        """
+        return {
+            "contexts": len(self.ctxhd),
+            "inputs": sum(
+                len(items)
+                for entry in self.ctxhd.values()
+                for items in entry.definitions.values()
+            ),
+        }
+
     async def ctx(self) -> Tuple[bool, BaseInputSetContext]:
         async with self.ctx_notification_set() as ctx:
             return await ctx.added()
@@ -426,10 +702,13 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
     async def definition(
         self, ctx: BaseInputSetContext, definition: str
     ) -> Definition:
-        async with self.ctxhd_lock:
-            # Grab the input set context handle
-            handle_string = (await ctx.handle()).as_string()
-            # Ensure that the handle_string is present in ctxhd
+        # Grab the input set context handle
+        handle_string = (await ctx.handle()).as_string()
+        # Ensure that the handle_string is present in ctxhd
+        if not handle_string in self.ctxhd:
+            raise ContextNotPresent(handle_string)
+        async with self.ctx_lock(handle_string):
+            # Ensure the context was not removed while we waited for the lock
             if not handle_string in self.ctxhd:
                 raise ContextNotPresent(handle_string)
             # Search through the definitions to find one with a matching name
@@ -457,31 +736,36 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
         operation: Operation,
         dataflow: DataFlow,
         ctx: BaseInputSetContext,
+        *,
+        plan: Optional[MemoryDataFlowPlan] = None,
     ) -> bool:
-        async with self.ctxhd_lock:
-            # Grab the input set context handle
-            handle_string = (await ctx.handle()).as_string()
-            # Ensure that the handle_string is present in ctxhd
+        if plan is None:
+            plan = MemoryDataFlowPlan.compile(dataflow)
+        # Grab the input set context handle
+        handle_string = (await ctx.handle()).as_string()
+        # Ensure that the handle_string is present in ctxhd
+        if not handle_string in self.ctxhd:
+            return
+        async with self.ctx_lock(handle_string):
+            # Ensure the context was not removed while we waited for the lock
             if not handle_string in self.ctxhd:
                 return
             # Limit search to given context via context handle
-            return await self._check_conditions(
-                operation, dataflow, self.ctxhd[handle_string].by_origin
+            return self._check_conditions(
+                plan.operations[operation.instance_name],
+                self.ctxhd[handle_string],
             )
 
-    async def _check_conditions(
-        self,
-        operation: Operation,
-        dataflow: DataFlow,
-        by_origin: Dict[Union[str, Tuple[str, str]], List[Input]],
+    @staticmethod
+    def _check_conditions(
+        operation_plan: MemoryOperationPlan,
+        entry: MemoryInputNetworkContextEntry,
     ) -> bool:
-        # Grab the input flow to check for definition overrides
-        input_flow = dataflow.flow[operation.instance_name]
         # Return that all conditions are satisfied if there are none to satisfy
-        if not input_flow.conditions:
+        if not operation_plan.conditions:
             return True
         # Check that all conditions are present and logicly True
-        for i, condition_source in enumerate(input_flow.conditions):
+        for condition in operation_plan.conditions:
             # We must check if we found an Input where the definition
             # matches the definition of the condition in addition to
             # checking that the Input's value is True. If we were not
@@ -489,275 +773,268 @@ class MemoryInputNetworkContext(BaseInputNetworkContext):
             # saying that the lack of presence equates with the
             # condition being True.
             condition_found_and_true = False
-            # Create a list of places this input originates from
-            origins = []
-            if isinstance(condition_source, dict):
-                for origin in condition_source.items():
-                    origins.append(origin)
-            else:
-                origins.append(condition_source)
             # Ensure all conditions from all origins are True
-            for origin in origins:
-                # See comment in input_flow.inputs section
-                (
-                    alternate_definitions,
-                    origin,
-                ) = input_flow.get_alternate_definitions(origin)
+            for origin, definition_names in condition:
                 # Bail if the condition doesn't exist
-                if not origin in by_origin:
+                if not origin in entry.by_origin:
                     return
-                # Bail if the condition is not True
-                for item in by_origin[origin]:
-                    # TODO(p2) Alright, this shits fucked, way not clean
-                    # / clear. We're just trying to skip any conditions
-                    # (and inputs for input_flow.inputs.items()) where
-                    # the definition doesn't match, but it's within the
-                    # correct origin.
-                    if alternate_definitions:
-                        if item.definition.name not in alternate_definitions:
-                            continue
-                    elif isinstance(condition_source, str):
-                        if (
-                            item.definition.name
-                            != operation.conditions[i].name
-                        ):
-                            continue
-                    elif (
-                        item.definition.name
-                        != dataflow.operations[origin[0]]
-                        .outputs[origin[1]]
-                        .name
-                    ):
-                        continue
-                    condition_found_and_true = bool(item.value)
+                # The most recently added input with a matching definition
+                # determines if the condition is True
+                if len(definition_names) == 1:
+                    items = entry.by_origin_definition.get(
+                        (origin, definition_names[0]), []
+                    )
+                else:
+                    items = [
+                        item
+                        for item in entry.by_origin[origin]
+                        if item.definition.name in definition_names
+                    ]
+                if items:
+                    condition_found_and_true = bool(items[-1].value)
             # Ensure we were able to find a condition within the input
             # network, and that when we found it it's value was True.
             if condition_found_and_true:
                 return True
         return False
 
+    @staticmethod
+    def _origins(input_source) -> List[Union[str, Tuple[str, str]]]:
+        """
+        Create a list of places an input originates from. When the
+        input_source is a list we look at the first instance in the list for
+        the immediate alternate definition. The rest of the list are the
+        origins of its ancestors.
+        """
+        if isinstance(input_source, list):
+            input_source = input_source[0]
+        if isinstance(input_source, dict):
+            return list(input_source.items())
+        return [input_source]
+
+    @staticmethod
+    def _ancestor_origins_match(
+        operation: Operation,
+        input_name: str,
+        ancestor_origins: Tuple[Union[str, Tuple[str, str]], ...],
+        item: Input,
+    ) -> bool:
+        """
+        When the input source was a list of alternate definitions we need to
+        check each parent to verity that it's origin matches with the list
+        given by the input source
+        """
+        current_parent = item
+        for ancestor_origin in ancestor_origins:
+            # Go through all the parents. Create a list of possible parents
+            # based on if their origin matches the alternate definition
+            possible_parents = [
+                parent
+                for parent in current_parent.parents
+                # If the input source is a dict then we need to convert it to a
+                # tuple for comparison to the origin
+                if parent.origin == ancestor_origin
+            ]
+            if not possible_parents:
+                return False
+            elif len(possible_parents) > 1:
+                # TODO Go through each option and check if either is a viable
+                # option. Our current implementation only allows for valeting
+                # one path, due to a single current_parent If there is more
+                # than one option raise an error since we don't know who to
+                # choose
+                raise MultipleAncestorsFoundError(
+                    (
+                        operation.instance_name,
+                        input_name,
+                        ancestor_origin,
+                        [parent.__dict__ for parent in possible_parents],
+                    )
+                )
+            # The current_parent becomes the only possible parent
+            current_parent = possible_parents[0]
+        return True
+
+    def _gather(
+        self,
+        operation_plan: MemoryOperationPlan,
+        entry: MemoryInputNetworkContextEntry,
+    ) -> Optional[Dict[str, List[Input]]]:
+        """
+        Map each input of the operation to the inputs within the context which
+        could be used for it. Returns None if there is no data, and no default
+        value, for one of the operation's inputs.
+        """
+        gather: Dict[str, List[Input]] = {}
+        # Gather all inputs with matching definitions and contexts
+        for input_name, input_plan in operation_plan.inputs.items():
+            gather[input_name] = []
+            for source in input_plan.sources:
+                # Look up inputs from the origin with matching definitions
+                for definition_name in source.definition_names:
+                    for item in entry.by_origin_definition.get(
+                        (source.origin, definition_name), []
+                    ):
+                        # If we didn't find any ancestor paths that matched
+                        # then we don't use this Input
+                        if (
+                            source.ancestor_origins is not None
+                            and not self._ancestor_origins_match(
+                                operation_plan.operation,
+                                input_name,
+                                source.ancestor_origins,
+                                item,
+                            )
+                        ):
+                            continue
+                        gather[input_name].append(item)
+            # There is no data in the network for an input
+            if not gather[input_name]:
+                # If there is no default value, we don't have a complete
+                # paremeter set, so we bail out
+                if input_plan.default is None:
+                    return None
+                gather[input_name].append(input_plan.default)
+        return gather
+
     async def gather_inputs(
         self,
         rctx: "BaseRedundancyCheckerContext",
         operation: Operation,
         dataflow: DataFlow,
         ctx: Optional[BaseInputSetContext] = None,
+        *,
+        new_input_set: Optional[BaseInputSet] = None,
+        plan: Optional[MemoryDataFlowPlan] = None,
     ) -> AsyncIterator[BaseParameterSet]:
-        # Create a mapping of definitions to inputs for that definition
-        gather: Dict[str, List[Parameter]] = {}
-        async with self.ctxhd_lock:
-            # If no context is given we will generate input pairs for all
-            # contexts
-            contexts = self.ctxhd.values()
-            # If a context is given only search definitions within that context
-            if not ctx is None:
-                # Grab the input set context handle
-                handle_string = (await ctx.handle()).as_string()
-                # Ensure that the handle_string is present in ctxhd
+        """
+        Generate permutations of applicable inputs for an operation. If
+        new_input_set is given, only permutations which include at least one
+        of the new inputs are generated. All others were generated when the
+        inputs they were made of entered the network.
+
+        The plan is the dataflow compiled by the orchestrator, it will be
+        compiled from the dataflow if not given.
+        """
+        if plan is None:
+            plan = MemoryDataFlowPlan.compile(dataflow)
+        operation_plan = plan.operations[operation.instance_name]
+        # Inputs which just entered the network
+        new_uids = set()
+        new_origins = set()
+        if new_input_set is not None:
+            async for item in new_input_set.inputs():
+                new_uids.add(item.uid)
+                new_origins.add(item.origin)
+        # If the new inputs were conditions then permutations of existing
+        # inputs which were previously blocked may now be able to run. In that
+        # case we have to generate all permutations
+        incremental = bool(
+            new_uids
+            and not new_origins.intersection(operation_plan.condition_origins)
+        )
+        # Contexts along with mappings of input names to matching inputs
+        gathered: List[Tuple[BaseInputSetContext, Dict[str, List[Input]]]] = []
+        # If no context is given we will generate input pairs for all
+        # contexts
+        handle_strings = list(self.ctxhd.keys())
+        # If a context is given only search definitions within that context
+        if not ctx is None:
+            # Grab the input set context handle
+            handle_strings = [(await ctx.handle()).as_string()]
+        for handle_string in handle_strings:
+            # Ensure that the handle_string is present in ctxhd
+            if not handle_string in self.ctxhd:
+                continue
+            # Only the context being searched is locked
+            async with self.ctx_lock(handle_string):
+                # Ensure the context was not removed while we waited for the
+                # lock
                 if not handle_string in self.ctxhd:
-                    return
-                # Limit search to given context via context handle
-                contexts = [self.ctxhd[handle_string]]
-            for ctx, _, by_origin in contexts:
+                    continue
+                entry = self.ctxhd[handle_string]
                 # Ensure we were able to find a condition within the input
                 # network, and that when we found it it's value was True.
-                if not await self._check_conditions(
-                    operation, dataflow, by_origin
-                ):
-                    return
-                # Grab the input flow to check for definition overrides
-                input_flow = dataflow.flow[operation.instance_name]
-                # Gather all inputs with matching definitions and contexts
-                for input_name, input_sources in input_flow.inputs.items():
-                    # Create parameters for all the inputs
-                    gather[input_name] = []
-                    for input_source in input_sources:
-                        # Create a list of places this input originates from
-                        origins = []
-                        # Handle the case where we look at the first instance in
-                        # the list for the immediate alternate definition then
-                        # trace back through input origins to make sure they all
-                        # match
-                        if isinstance(input_source, list):
-                            # TODO Refactor this since we have duplicate code
-                            if isinstance(input_source[0], dict):
-                                for origin in input_source[0].items():
-                                    origins.append(origin)
-                            else:
-                                origins.append(input_source[0])
-                        elif isinstance(input_source, dict):
-                            for origin in input_source.items():
-                                origins.append(origin)
-                        else:
-                            origins.append(input_source)
-                        for origin in origins:
-                            # Check if the origin is a tuple where the first
-                            # value is the origin (such as "seed") and the
-                            # second value is an array of allowed alternate
-                            # Definition's (their names) within that origin.
-                            # These definitions will be used instead of the
-                            # default one the input specified for the
-                            # operation).
-                            (
-                                alternate_definitions,
-                                origin,
-                            ) = input_flow.get_alternate_definitions(origin)
-                            # Don't try to grab inputs from an origin that
-                            # doesn't have any to give us
-                            if not origin in by_origin:
-                                continue
-                            # Generate parameters from inputs
-                            for item in by_origin[origin]:
-                                # TODO(p2) We favored comparing names to
-                                # defintions because sometimes we create
-                                # defintions which have specs which create new
-                                # types which will not equal each other. We
-                                # maybe want to consider switching to comparing
-                                # exported Defintions
-                                if alternate_definitions:
-                                    if (
-                                        item.definition.name
-                                        not in alternate_definitions
-                                    ):
-                                        continue
-                                elif isinstance(origin, str):
-                                    if (
-                                        item.definition.name
-                                        != operation.inputs[input_name].name
-                                    ):
-                                        continue
-                                elif (
-                                    item.definition.name
-                                    != dataflow.operations[origin[0]]
-                                    .outputs[origin[1]]
-                                    .name
-                                ):
-                                    continue
-                                # When the input_source is a list of alternate
-                                # definitions we need to check each parent to
-                                # verity that it's origin matches with the list
-                                # given by input_source
-                                if isinstance(input_source, list):
-                                    all_parent_origins_match = True
-                                    # Make a list of all the origins
-                                    ancestor_origins = []
-                                    for ancestor_origin in input_source:
-                                        if isinstance(ancestor_origin, dict):
-                                            for (
-                                                ancestor_origin
-                                            ) in ancestor_origin.items():
-                                                ancestor_origins.append(
-                                                    ancestor_origin
-                                                )
-                                        else:
-                                            ancestor_origins.append(
-                                                ancestor_origin
-                                            )
-                                    i = 1
-                                    current_parent = item
-                                    while i < len(ancestor_origins):
-                                        ancestor_origin = ancestor_origins[i]
-                                        # Go through all the parents. Create a
-                                        # list of possible parents based on if
-                                        # their origin matches the alternate
-                                        # definition
-                                        possible_parents = [
-                                            parent
-                                            for parent in current_parent.parents
-                                            # If the input source is a dict then
-                                            # we need to convert it to a tuple
-                                            # for comparison to the origin
-                                            if parent.origin == ancestor_origin
-                                        ]
-                                        if not possible_parents:
-                                            all_parent_origins_match = False
-                                            break
-                                        elif len(possible_parents) > 1:
-                                            # TODO Go through each option and
-                                            # check if either is a viable
-                                            # option. Our current implementation
-                                            # only allows for valeting one path,
-                                            # due to a single current_parent
-                                            # If there is more than one option
-                                            # raise an error since we don't know
-                                            # who to choose
-                                            raise MultipleAncestorsFoundError(
-                                                (
-                                                    operation.instance_name,
-                                                    input_name,
-                                                    ancestor_origin,
-                                                    [
-                                                        parent.__dict__
-                                                        for parent in possible_parents
-                                                    ],
-                                                )
-                                            )
-                                        # Move on to the next origin to validate
-                                        i += 1
-                                        # The current_parent becomes the only
-                                        # possible parent
-                                        current_parent = possible_parents[0]
-                                    # If we didn't find any ancestor paths that
-                                    # matched then we don't use this Input
-                                    if not all_parent_origins_match:
-                                        continue
-                                gather[input_name].append(
-                                    Parameter(
-                                        key=input_name,
-                                        value=item.value,
-                                        origin=item,
-                                        definition=operation.inputs[
-                                            input_name
-                                        ],
-                                    )
-                                )
-                    # There is no data in the network for an input
-                    if not gather[input_name]:
-                        # Check if there is a default value for the parameter,
-                        # if so use it. That default will either come from the
-                        # definition attached to input_name, or it will come
-                        # from one of the alternate definition given within the
-                        # input flow for the input_name.
-                        check_for_default_value = [
-                            operation.inputs[input_name]
-                        ] + alternate_definitions
-                        for definition in check_for_default_value:
-                            # Check if the definition has a default value that is not _NO_DEFAULT
-                            if "dffml.df.types._NO_DEFAULT" not in repr(
-                                definition.default
-                            ):
-                                gather[input_name].append(
-                                    Parameter(
-                                        key=input_name,
-                                        value=definition.default,
-                                        origin=item,
-                                        definition=operation.inputs[
-                                            input_name
-                                        ],
-                                    )
-                                )
-                                break
-                        # If there is no default value, we don't have a complete
-                        # paremeter set, so we bail out
-                        else:
-                            return
-        # Generate all possible permutations of applicable inputs
-        # Create the parameter set for each
-        products = list(
-            map(
-                lambda permutation: MemoryParameterSet(
-                    MemoryParameterSetConfig(ctx=ctx, parameters=permutation)
-                ),
-                product(*list(gather.values())),
+                if not self._check_conditions(operation_plan, entry):
+                    continue
+                gather = self._gather(operation_plan, entry)
+                if gather is not None:
+                    gathered.append((entry.ctx, gather))
+        for ctx, gather in gathered:
+            # Parameters are created once per input and shared between the
+            # permutations which use them
+            parameters: Dict[Tuple[str, str], Parameter] = {}
+
+            def parameter(input_name: str, item: Input) -> Parameter:
+                key = (input_name, item.uid)
+                if key not in parameters:
+                    parameters[key] = Parameter(
+                        key=input_name,
+                        value=item.value,
+                        origin=item,
+                        definition=operation.inputs[input_name],
+                    )
+                return parameters[key]
+
+            input_names = list(gather.keys())
+            # When every input is a default value no input will ever be new, so
+            # the single permutation of defaults is generated every time. The
+            # redundancy checker ensures it is only run once.
+            all_defaults = all(
+                items[0] is operation_plan.inputs[input_name].default
+                for input_name, items in gather.items()
             )
-        )
-        # Check if each permutation has been executed before
-        async for parameter_set, taken in rctx.take_if_non_existant(
-            operation, *products
-        ):
-            # If taken then yield the permutation
-            if taken:
-                yield parameter_set
+            if not incremental or all_defaults:
+                # Generate all possible permutations of applicable inputs
+                permutations = product(*gather.values())
+            else:
+                # Generate only the permutations which include a new input.
+                # For each input name i, take new inputs at i, inputs which
+                # are not new for names before i, and all inputs for names
+                # after i. Each new permutation is generated exactly once.
+                old = {
+                    input_name: [
+                        item
+                        for item in gather[input_name]
+                        if item.uid not in new_uids
+                    ]
+                    for input_name in input_names
+                }
+                permutations = chain.from_iterable(
+                    product(
+                        *[old[input_name] for input_name in input_names[:i]],
+                        [
+                            item
+                            for item in gather[input_names[i]]
+                            if item.uid in new_uids
+                        ],
+                        *[
+                            gather[input_name]
+                            for input_name in input_names[i + 1 :]
+                        ],
+                    )
+                    for i in range(0, len(input_names))
+                )
+            # Create the parameter set for each permutation
+            for permutation in permutations:
+                parameter_set = MemoryParameterSet(
+                    MemoryParameterSetConfig(
+                        ctx=ctx,
+                        parameters=[
+                            parameter(input_name, item)
+                            for input_name, item in zip(
+                                input_names, permutation
+                            )
+                        ],
+                    )
+                )
+                # Check if the permutation has been executed before
+                async for parameter_set, taken in rctx.take_if_non_existant(
+                    operation, parameter_set
+                ):
+                    # If taken then yield the permutation
+                    if taken:
+                        yield parameter_set
 
 
 @entrypoint("memory")
@@ -832,6 +1109,12 @@ class MemoryRedundancyCheckerConfig:
     kvstore: BaseKeyValueStore = field(
         "Key value store to use", default_factory=lambda: MemoryKeyValueStore()
     )
+    key: str = field(
+        "Key creation method, 'tuple' (kept in memory) or 'sha384' (for "
+        "persistent or shared key value stores). Defaults to 'tuple' for "
+        "MemoryKeyValueStore, otherwise 'sha384'",
+        default=None,
+    )
 
 
 class MemoryRedundancyCheckerContext(BaseRedundancyCheckerContext):
@@ -840,6 +1123,9 @@ class MemoryRedundancyCheckerContext(BaseRedundancyCheckerContext):
     ) -> None:
         super().__init__(config, parent)
         self.kvctx = None
+        # Keys of operation and parameter set pairs which have been taken,
+        # organized by context handle string. Used when keys are tuples.
+        self.taken: Dict[str, Set[Tuple[str, ...]]] = {}
 
     async def __aenter__(self) -> "MemoryRedundancyCheckerContext":
         self.__stack = AsyncExitStack()
@@ -863,52 +1149,55 @@ class MemoryRedundancyCheckerContext(BaseRedundancyCheckerContext):
 
     async def unique(
         self, operation: Operation, parameter_set: BaseParameterSet
-    ) -> str:
+    ) -> Union[str, Tuple[str, ...]]:
         """
-        SHA384 hash of the parameter set context handle as a string, the
-        operation.instance_name, and the sorted list of input uuids.
+        Key for the operation and parameter set created using the key method
+        the redundancy checker was configured with. Tuple keys are the
+        parameter set context handle as a string, the operation.instance_name,
+        and the sorted list of input uuids. These are the same str objects the
+        inputs reference, so no new strings are created.
         """
-        return self._unique(
-            operation.instance_name,
-            (await parameter_set.ctx.handle()).as_string(),
-            *[item.origin.uid async for item in parameter_set.parameters()],
-        )
-
-    async def _take(self, coro) -> bool:
-        return await self.kvctx.conditional_set(
-            await coro, "\x01", checker=lambda value: value != "\x01"
-        )
+        handle_string = (await parameter_set.ctx.handle()).as_string()
+        uids = [item.origin.uid async for item in parameter_set.parameters()]
+        if self.parent.key == "tuple":
+            return (handle_string, operation.instance_name, *sorted(uids))
+        return self._unique(operation.instance_name, handle_string, *uids)
 
     async def take_if_non_existant(
         self, operation: Operation, *parameter_sets: BaseParameterSet
     ) -> bool:
-        # TODO(p4) Run tests to choose an optimal threaded vs non-threaded value
-        if len(parameter_sets) < 4:
-            for parameter_set in parameter_sets:
-                yield parameter_set, await self._take(
-                    self.unique(operation, parameter_set)
+        for parameter_set in parameter_sets:
+            key = await self.unique(operation, parameter_set)
+            if self.parent.key == "tuple":
+                # Nothing is awaited between checking for and adding the key,
+                # so no lock is needed. Keys are grouped by context handle
+                # string so that they can be removed with the context.
+                taken = self.taken.setdefault(key[0], set())
+                if key in taken:
+                    yield parameter_set, False
+                    continue
+                taken.add(key)
+                yield parameter_set, True
+            else:
+                yield parameter_set, await self.kvctx.conditional_set(
+                    key, "\x01", checker=lambda value: value != "\x01",
                 )
-        else:
-            async for parameter_set, taken in concurrently(
-                {
-                    asyncio.create_task(
-                        self._take(
-                            self.parent.loop.run_in_executor(
-                                self.parent.pool,
-                                self._unique,
-                                operation.instance_name,
-                                (await parameter_set.ctx.handle()).as_string(),
-                                *[
-                                    item.origin.uid
-                                    async for item in parameter_set.parameters()
-                                ],
-                            )
-                        )
-                    ): parameter_set
-                    for parameter_set in parameter_sets
-                }
-            ):
-                yield parameter_set, taken
+
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Forget the tuple keys of operations run within the context. SHA384 keys
+        are left in the key value store, which may be persistent or shared.
+        """
+        self.taken.pop((await ctx.handle()).as_string(), None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of keys held in memory
+        """
+        redundancy_keys = sum(map(len, self.taken.values()))
+        if isinstance(self.kvctx, MemoryKeyValueStoreContext):
+            redundancy_keys += len(self.kvctx.memory)
+        return {"redundancy_keys": redundancy_keys}
 
 
 @entrypoint("memory")
@@ -919,29 +1208,31 @@ class MemoryRedundancyChecker(BaseRedundancyChecker, BaseMemoryDataFlowObject):
 
     CONTEXT = MemoryRedundancyCheckerContext
     CONFIG = MemoryRedundancyCheckerConfig
+    KEYS = ("tuple", "sha384")
 
     def __init__(self, config):
         super().__init__(config)
-        self.loop = None
-        self.pool = None
-        self.__pool = None
+        self.key = self.config.key
+        if self.key is None:
+            self.key = (
+                "tuple"
+                if isinstance(self.config.kvstore, MemoryKeyValueStore)
+                else "sha384"
+            )
+        if self.key not in self.KEYS:
+            raise ValueError(
+                f"Redundancy checker key {self.key!r} not in {self.KEYS}"
+            )
 
     async def __aenter__(self) -> "MemoryRedundancyCheckerContext":
         self.__stack = AsyncExitStack()
-        self.__exit_stack = ExitStack()
-        self.__exit_stack.__enter__()
         await self.__stack.__aenter__()
         self.kvstore = await self.__stack.enter_async_context(
             self.config.kvstore
         )
-        self.loop = asyncio.get_event_loop()
-        self.pool = self.__exit_stack.enter_context(
-            concurrent.futures.ThreadPoolExecutor()
-        )
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        self.__exit_stack.__exit__(exc_type, exc_value, traceback)
         await self.__stack.__aexit__(exc_type, exc_value, traceback)
 
 
@@ -956,7 +1247,8 @@ class MemoryLockNetworkContext(BaseLockNetworkContext):
     ) -> None:
         super().__init__(config, parent)
         self.lock = asyncio.Lock()
-        self.locks: Dict[str, asyncio.Lock] = {}
+        # Locks for inputs by context handle string then input uid
+        self.locks: Dict[str, Dict[str, asyncio.Lock]] = {}
 
     @asynccontextmanager
     async def acquire(self, parameter_set: BaseParameterSet):
@@ -965,6 +1257,7 @@ class MemoryLockNetworkContext(BaseLockNetworkContext):
         prior to running an operation using the input.
         """
         need_lock = {}
+        handle_string = (await parameter_set.ctx.handle()).as_string()
         # Acquire the master lock to find and or create needed locks
         async with self.lock:
             # Get all the inputs up the ancestry tree
@@ -974,11 +1267,12 @@ class MemoryLockNetworkContext(BaseLockNetworkContext):
             ]
             # Only lock the ones which require it
             for item in filter(lambda item: item.definition.lock, inputs):
+                locks = self.locks.setdefault(handle_string, {})
                 # Create the lock for the input if not present
-                if not item.uid in self.locks:
-                    self.locks[item.uid] = asyncio.Lock()
+                if not item.uid in locks:
+                    locks[item.uid] = asyncio.Lock()
                 # Retrieve the lock
-                need_lock[item.uid] = (item, self.locks[item.uid])
+                need_lock[item.uid] = (item, locks[item.uid])
         # Use AsyncExitStack to lock the variable amount of inputs required
         async with AsyncExitStack() as stack:
             # Take all the locks we found we needed for this parameter set
@@ -990,6 +1284,19 @@ class MemoryLockNetworkContext(BaseLockNetworkContext):
             # All locks for these parameters have been acquired
             yield
 
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Release the locks of inputs within a context which has completed
+        """
+        async with self.lock:
+            self.locks.pop((await ctx.handle()).as_string(), None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of input locks held in memory
+        """
+        return {"locks": sum(map(len, self.locks.values()))}
+
 
 @entrypoint("memory")
 class MemoryLockNetwork(BaseLockNetwork, BaseMemoryDataFlowObject):
@@ -1004,6 +1311,14 @@ class MemoryOperationImplementationNetworkConfig:
         "Operation implementations to load on initialization",
         default_factory=lambda: {},
     )
+    thread_pool_size: int = field(
+        "Maximum number of threads for operations with executor set to thread",
+        default=None,
+    )
+    process_pool_size: int = field(
+        "Maximum number of processes for operations with executor set to process",
+        default=None,
+    )
 
 
 class MemoryOperationImplementationNetworkContext(
@@ -1177,6 +1492,15 @@ class MemoryOperationImplementationNetworkContext(
                     traceback.format_exc().rstrip(),
                 )
 
+    async def run_in_executor(self, executor: str, func, *args, **kwargs):
+        """
+        Run func in the network's "thread" or "process" pool
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            self.parent.pool(executor),
+            functools.partial(func, *args, **kwargs),
+        )
+
     async def operation_completed(self):
         await self.completed_event.wait()
         self.completed_event.clear()
@@ -1193,8 +1517,18 @@ class MemoryOperationImplementationNetworkContext(
         network when complete
         """
         # Ensure that we can run the operation
-        # Lock all inputs which cannot be used simultaneously
-        async with octx.lctx.acquire(parameter_set):
+        async with AsyncExitStack() as stack:
+            # Lock all inputs which cannot be used simultaneously. Skipped for
+            # operations which the orchestrator found can never be run with
+            # inputs that must be locked.
+            lock_required = getattr(octx, "lock_required", None)
+            if (
+                lock_required is None
+                or operation.instance_name in lock_required
+            ):
+                await stack.enter_async_context(
+                    octx.lctx.acquire(parameter_set)
+                )
             # Run the operation
             outputs = await self.run(
                 parameter_set.ctx,
@@ -1273,9 +1607,54 @@ class MemoryOperationImplementationNetwork(
 
     CONTEXT = MemoryOperationImplementationNetworkContext
     CONFIG = MemoryOperationImplementationNetworkConfig
+    EXECUTORS = {
+        "thread": (concurrent.futures.ThreadPoolExecutor, "thread_pool_size"),
+        "process": (
+            concurrent.futures.ProcessPoolExecutor,
+            "process_pool_size",
+        ),
+    }
+
+    def __init__(self, config: BaseConfig) -> None:
+        super().__init__(config)
+        # Pools shared by all contexts, created on first use
+        self.pools: Dict[str, concurrent.futures.Executor] = {}
+        # Pools are shut down on exit, set on enter
+        self._exit_stack = None
+
+    async def __aenter__(self) -> "MemoryOperationImplementationNetwork":
+        self._exit_stack = ExitStack()
+        self._exit_stack.__enter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._exit_stack.__exit__(exc_type, exc_value, traceback)
+        self._exit_stack = None
+        self.pools = {}
+
+    def pool(self, executor: str) -> concurrent.futures.Executor:
+        """
+        Returns the "thread" or "process" pool, creating it if needed
+        """
+        if executor not in self.pools:
+            if executor not in self.EXECUTORS:
+                raise ValueError(
+                    f"Executor {executor!r} not in {list(self.EXECUTORS)}"
+                )
+            if self._exit_stack is None:
+                raise RuntimeError(
+                    f"{self.__class__.__qualname__} must be entered with "
+                    f"'async with' before creating its {executor} pool"
+                )
+            pool_cls, size_property = self.EXECUTORS[executor]
+            self.pools[executor] = self._exit_stack.enter_context(
+                pool_cls(max_workers=getattr(self.config, size_property))
+            )
+        return self.pools[executor]
 
 
 MEMORYORCHESTRATORCONFIG_MAX_CTXS: int = None
+MEMORYORCHESTRATORCONFIG_MAX_OPERATIONS: int = None
 
 
 @config
@@ -1300,6 +1679,9 @@ class MemoryOrchestratorConfig:
     )
     # Maximum number of contexts to run concurrently
     max_ctxs: int = MEMORYORCHESTRATORCONFIG_MAX_CTXS
+    # Maximum number of operations to run concurrently. Operations which are
+    # ready to run once this limit is reached wait in a queue.
+    max_operations: int = MEMORYORCHESTRATORCONFIG_MAX_OPERATIONS
 
 
 @config
@@ -1311,6 +1693,9 @@ class MemoryOrchestratorContextConfig:
     reuse: Dict[str, BaseDataFlowObjectContext] = None
     # Maximum number of contexts to run concurrently
     max_ctxs: int = MEMORYORCHESTRATORCONFIG_MAX_CTXS
+    # Maximum number of operations to run concurrently. Operations which are
+    # ready to run once this limit is reached wait in a queue.
+    max_operations: int = MEMORYORCHESTRATORCONFIG_MAX_OPERATIONS
 
     def __post_init__(self):
         if self.reuse is None:
@@ -1327,6 +1712,22 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
         self._stack = None
         # Maps instance_name to OrchestratorContext
         self.subflows = {}
+        # Number of operations running, in total and by instance_name
+        self.operations_running = 0
+        self.operations_running_by_instance_name: Dict[str, int] = {}
+        # Number of operations waiting for the number of running operations to
+        # go below max_operations or their max_concurrent
+        self.operations_queued = 0
+        self.operations_queued_max = 0
+        # Set and replaced each time an operation completes, so that contexts
+        # with queued operations can wait for one to complete
+        self.operation_completed = None
+        # Instance names of operations which may be run with inputs that must
+        # be locked. Set when the dataflow is initialized.
+        self.lock_required: Set[str] = set()
+        # Dataflow compiled into what is needed to match inputs to operations.
+        # Set when the dataflow is initialized.
+        self.plan: Optional[MemoryDataFlowPlan] = None
 
     async def __aenter__(self) -> "BaseOrchestratorContext":
         # TODO(subflows) In all of these contexts we are about to enter, they
@@ -1357,6 +1758,7 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                 self.logger.debug("Reusing %s: %s", name, ctx)
                 del enter[name]
                 setattr(self, name, ctx)
+        self.operation_completed = asyncio.Event()
         # Creat the exit stack and enter all the contexts we won't be reusing
         self._stack = AsyncExitStack()
         self._stack = await aenter_stack(self, enter)
@@ -1377,6 +1779,10 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
         3. Seed input network context with given inputs
         """
         self.logger.debug("Initializing dataflow: %s", dataflow)
+        # Find which operations will need to lock their inputs
+        self.lock_required = self.operations_requiring_locks(dataflow)
+        # Compile the dataflow so that it is only interpreted once
+        self.plan = MemoryDataFlowPlan.compile(dataflow)
         # Add operations to operations network context
         await self.octx.add(dataflow.operations.values())
         # Instantiate all operations
@@ -1420,6 +1826,98 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                         operation, opimp_config, opimp=opimp
                     )
 
+    @staticmethod
+    def operations_requiring_locks(dataflow: DataFlow) -> Set[str]:
+        """
+        Instance names of operations which may be run with an input, or an
+        input with an ancestor, whose definition has lock set. An operation
+        requires locks if one of its inputs can be of a lockable definition,
+        or if one of its inputs can come from an operation which requires
+        locks.
+
+        >>> from dffml import *
+        >>>
+        >>> LOCKED = Definition(name="locked", primitive="str", lock=True)
+        >>>
+        >>> @op(outputs={"result": LOCKED})
+        ... def create() -> str:
+        ...     return "created"
+        >>>
+        >>> @op(inputs={"value": LOCKED})
+        ... def use(value: str) -> str:
+        ...     return value
+        >>>
+        >>> @op
+        ... def other(value: int) -> int:
+        ...     return value
+        >>>
+        >>> sorted(
+        ...     MemoryOrchestratorContext.operations_requiring_locks(
+        ...         DataFlow.auto(create, use, other)
+        ...     )
+        ... )
+        ['use']
+        """
+        if not any(
+            definition.lock for definition in dataflow.definitions.values()
+        ):
+            return set()
+        # Definitions and upstream operations which inputs to each operation
+        # may come from
+        definitions: Dict[str, Set[str]] = {}
+        upstream: Dict[str, Set[str]] = {}
+        for instance_name, operation in dataflow.operations.items():
+            definitions[instance_name] = {
+                definition.name for definition in operation.inputs.values()
+            }
+            upstream[instance_name] = set()
+            input_flow = dataflow.flow.get(instance_name, InputFlow())
+            for input_sources in input_flow.inputs.values():
+                for input_source in input_sources:
+                    # Lists also give the origins of ancestors
+                    if not isinstance(input_source, list):
+                        input_source = [input_source]
+                    for source in input_source:
+                        origins = (
+                            source.items()
+                            if isinstance(source, dict)
+                            else [source]
+                        )
+                        for origin in origins:
+                            (
+                                alternate_definitions,
+                                origin,
+                            ) = input_flow.get_alternate_definitions(origin)
+                            definitions[instance_name].update(
+                                alternate_definitions
+                            )
+                            if (
+                                isinstance(origin, tuple)
+                                and origin[0] in dataflow.operations
+                            ):
+                                upstream[instance_name].add(origin[0])
+        lock_required = {
+            instance_name
+            for instance_name, names in definitions.items()
+            if any(
+                name in dataflow.definitions
+                and dataflow.definitions[name].lock
+                for name in names
+            )
+        }
+        # Operations downstream of ones requiring locks may be run with
+        # lockable ancestors
+        changed = True
+        while changed:
+            changed = False
+            for instance_name, upstream_names in upstream.items():
+                if instance_name not in lock_required and (
+                    upstream_names & lock_required
+                ):
+                    lock_required.add(instance_name)
+                    changed = True
+        return lock_required
+
     async def seed_inputs(
         self,
         *,
@@ -1485,102 +1983,133 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                     instance_name
                 ].ictx.receive_from_parent_flow(inputs)
 
-    # TODO(dfass) Get rid of run_operations, make it run_dataflow. Pass down the
-    # dataflow to everything. Make inputs a list of InputSets or an
-    # asyncgenerator of InputSets. Add a parameter which tells us if we should
-    # exit when all operations are complete or continue to wait for more inputs
-    # from the asyncgenerator. Make that parameter an asyncio.Event
-    async def run(
+    async def seed_contexts(
         self,
         *input_sets: Union[List[Input], BaseInputSet],
-        strict: bool = True,
         ctx: Optional[BaseInputSetContext] = None,
-        halt: Optional[asyncio.Event] = None,
-    ) -> AsyncIterator[Tuple[BaseContextHandle, Dict[str, Any]]]:
+    ) -> AsyncIterator[BaseInputSetContext]:
         """
-        Run a DataFlow.
+        Seed each input set given to :py:meth:`run` into the input network,
+        yielding the context it was added under.
+
+        Input sets are only seeded as they are requested. When given an
+        asynchronous iterator, each item it yields may be a list of
+        :py:class:`Input <dffml.df.types.Input>` objects, a
+        :py:class:`BaseInputSet`, or a tuple of a context (or string to be
+        used as a context) and a list of inputs.
         """
-        # Lists of contexts we care about for this dataflow
-        ctxs: List[BaseInputSetContext] = []
-        self.logger.debug("Running %s: %s", self.config.dataflow, input_sets)
         if not input_sets:
             # If there are no input sets, add only seed inputs
-            ctxs.append(await self.seed_inputs(ctx=ctx))
+            yield await self.seed_inputs(ctx=ctx)
             await self.forward_inputs_to_subflow(self.config.dataflow.seed)
-        if len(input_sets) == 1 and inspect.isasyncgen(input_sets[0]):
-            # Check if inputs is an asyncgenerator
-            # If it is, start a coroutine to wait for new inputs or input sets
-            # from it. When new inputs are received, add the seed inputs from
-            # the dataflow to the context.
-            # TODO(dfass) Grab inputs from asyncgen, combine with seed
-            raise NotImplementedError("asyncgen not yet supported")
-        elif len(input_sets) == 1 and isinstance(input_sets[0], dict):
-            # Helper to quickly add inputs under string context
-            for ctx_string, input_set in input_sets[0].items():
-                await self.forward_inputs_to_subflow(input_set)
-                ctxs.append(
-                    await self.seed_inputs(
+        elif len(input_sets) == 1 and isinstance(
+            input_sets[0], collections.abc.AsyncIterator
+        ):
+            # Grab inputs from the asynchronous iterator as they are requested
+            async for input_set in input_sets[0]:
+                if isinstance(input_set, tuple):
+                    ctx_string, input_set = input_set
+                    await self.forward_inputs_to_subflow(input_set)
+                    yield await self.seed_inputs(
                         ctx=StringInputSetContext(ctx_string)
                         if isinstance(ctx_string, str)
                         else ctx_string,
                         input_set=input_set,
                     )
+                else:
+                    yield await self.seed_inputs(ctx=ctx, input_set=input_set)
+        elif len(input_sets) == 1 and isinstance(input_sets[0], dict):
+            # Helper to quickly add inputs under string context
+            for ctx_string, input_set in input_sets[0].items():
+                await self.forward_inputs_to_subflow(input_set)
+                yield await self.seed_inputs(
+                    ctx=StringInputSetContext(ctx_string)
+                    if isinstance(ctx_string, str)
+                    else ctx_string,
+                    input_set=input_set,
                 )
         else:
             # For inputs sets that are of type BaseInputSetContext or list
             for input_set in input_sets:
-                ctxs.append(
-                    await self.seed_inputs(ctx=ctx, input_set=input_set)
-                )
-        # TODO Add check that ctx returned is the ctx corresponding to uadd.
-        # We'll have to make uadd return the ctx so we can compare.
-        # TODO Send the context back into some list maintained by
-        # run_operations so that if there is another run_dataflow method
-        # running on the same orchestrator context it will get the context
-        # it's waiting for and return
-        # BEGIN old run_operations
-        # Set of tasks we are waiting on
-        # TODO Make some way to cap the number of context's who have operations
-        # executing. Or maybe just the number of operations. Or both.
+                yield await self.seed_inputs(ctx=ctx, input_set=input_set)
+
+    # TODO(dfass) Get rid of run_operations, make it run_dataflow. Pass down the
+    # dataflow to everything. Add a parameter which tells us if we should
+    # exit when all operations are complete or continue to wait for more inputs
+    # from the asyncgenerator. Make that parameter an asyncio.Event
+    async def run(
+        self,
+        *input_sets: Union[List[Input], BaseInputSet],
+        strict: bool = True,
+        ctx: Optional[BaseInputSetContext] = None,
+        halt: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[Tuple[BaseContextHandle, Dict[str, Any]]]:
+        """
+        Run a DataFlow.
+
+        Input sets may be given as lists of inputs, input sets, a dict mapping
+        contexts to lists of inputs, or a single asynchronous iterator which
+        yields any of those forms (see :py:meth:`seed_contexts`).
+
+        When ``max_ctxs`` is set, new contexts are only seeded once a running
+        context completes. Combined with an asynchronous iterator this allows
+        for streaming any number of contexts through the dataflow without
+        holding all of them in memory.
+        """
+        self.logger.debug("Running %s: %s", self.config.dataflow, input_sets)
+        # Contexts are seeded as slots to run them become available
+        contexts = self.seed_contexts(*input_sets, ctx=ctx)
+        # Pull from asynchronous iterators in a task so that results of running
+        # contexts can be yielded while we wait for the next input set
+        streaming = len(input_sets) == 1 and isinstance(
+            input_sets[0], collections.abc.AsyncIterator
+        )
+        pull = None
+        # Set of tasks running contexts we are waiting on
         tasks = set()
-        # Track the number of contexts running
-        num_ctxs = 0
-        # If the max_ctxs is more than the total number of contexts, then set max_ctxs to None
-        if self.config.max_ctxs is not None and self.config.max_ctxs > len(
-            ctxs
-        ):
-            self.config.max_ctxs = None
-        # Create tasks to wait on the results of each of the contexts submitted
-        for ctxs_index in range(0, len(ctxs)):
-            if (
-                self.config.max_ctxs is not None
-                and num_ctxs >= self.config.max_ctxs
-            ):
-                break
-            # Grab the context by its index
-            ctx = ctxs[ctxs_index]
+
+        async def kickstart(ctx):
             self.logger.debug(
                 "kickstarting context: %s", (await ctx.handle()).as_string()
             )
-            tasks.add(
-                asyncio.create_task(
-                    self.run_operations_for_ctx(ctx, strict=strict)
-                )
-            )
-            # Ensure we don't run more contexts conncurrently than requested
-            num_ctxs += 1
+            tasks.add(asyncio.create_task(self.run_ctx(ctx, strict=strict)))
+
         try:
-            # Return when outstanding operations reaches zero
-            while tasks:
+            while True:
+                # Ensure we don't run more contexts concurrently than requested
+                while (
+                    contexts is not None
+                    and pull is None
+                    and (
+                        self.config.max_ctxs is None
+                        or len(tasks) < self.config.max_ctxs
+                    )
+                ):
+                    if streaming:
+                        pull = asyncio.create_task(contexts.__anext__())
+                        break
+                    try:
+                        await kickstart(await contexts.__anext__())
+                    except StopAsyncIteration:
+                        contexts = None
+                # Return when all contexts have been seeded and have completed
+                if not tasks and pull is None:
+                    break
                 # Wait for incoming events
                 done, _pending = await asyncio.wait(
-                    tasks, return_when=asyncio.FIRST_COMPLETED
+                    tasks if pull is None else tasks.union([pull]),
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-
+                if pull in done:
+                    done.remove(pull)
+                    try:
+                        await kickstart(pull.result())
+                    except StopAsyncIteration:
+                        contexts = None
+                    pull = None
                 for task in done:
                     # Remove the task from the set of tasks we are waiting for
                     tasks.remove(task)
-                    num_ctxs -= 1
                     # Get the tasks exception if any
                     exception = task.exception()
                     if strict and exception is not None:
@@ -1597,30 +2126,11 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                         # output operations
                         ctx, results = task.result()
                         yield ctx, results
-                    # Create more tasks to wait on the results of each of the
-                    # contexts submitted if we are caping the number of them
-                    while (
-                        self.config.max_ctxs is not None
-                        and num_ctxs <= self.config.max_ctxs
-                        and ctxs_index < len(ctxs)
-                    ):
-                        # Grab the context by it's index
-                        ctx = ctxs[ctxs_index]
-                        self.logger.debug(
-                            "kickstarting context: %s",
-                            (await ctx.handle()).as_string(),
-                        )
-                        tasks.add(
-                            asyncio.create_task(
-                                self.run_operations_for_ctx(ctx, strict=strict)
-                            )
-                        )
-                        # Keep track of which index we're at
-                        ctxs_index += 1
-                        # Ensure we don't run more contexts conncurrently than requested
-                        num_ctxs += 1
-                self.logger.debug("ctx.outstanding: %d", len(tasks) - 1)
+                self.logger.debug("ctx.outstanding: %d", len(tasks))
         finally:
+            # Stop pulling new contexts now that we know we are done
+            if pull is not None:
+                pull.cancel()
             # Cancel tasks which we don't need anymore now that we know we are done
             for task in tasks:
                 if not task.done():
@@ -1642,16 +2152,53 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
         input set context novel input pairings. Yield novel input pairings
         along with their operations as they are generated.
         """
+        plan = self.plan
+        if plan is None or dataflow is not self.config.dataflow:
+            plan = MemoryDataFlowPlan.compile(dataflow)
+        if new_input_set is None:
+            operations = self.octx.operations(dataflow, stage=stage)
+        else:
+            operations = self.downstream_operations(
+                plan, new_input_set, stage=stage
+            )
         # Get operations which may possibly run as a result of these new inputs
-        async for operation in self.octx.operations(
-            dataflow, input_set=new_input_set, stage=stage
-        ):
+        async for operation in operations:
             # Generate all pairs of un-run input combinations
             async for parameter_set in self.ictx.gather_inputs(
-                self.rctx, operation, dataflow, ctx=ctx
+                self.rctx,
+                operation,
+                dataflow,
+                ctx=ctx,
+                new_input_set=new_input_set,
+                plan=plan,
             ):
                 yield operation, parameter_set
 
+    @staticmethod
+    async def downstream_operations(
+        plan: MemoryDataFlowPlan,
+        input_set: BaseInputSet,
+        *,
+        stage: Stage = Stage.PROCESSING,
+    ) -> AsyncIterator[Operation]:
+        """
+        Operations which inputs from the input set may be used by, as inputs
+        or conditions, according to their origins and definitions.
+        """
+        downstream = plan.downstream.get(stage, {})
+        instance_names: Dict[str, None] = {}
+        async for item in input_set.inputs():
+            origin = item.origin
+            if isinstance(origin, Operation):
+                origin = origin.instance_name
+            for instance_name in chain(
+                downstream.get((origin, item.definition.name), ()),
+                downstream.get((origin, None), ()),
+            ):
+                instance_names[instance_name] = None
+        for instance_name in instance_names:
+            yield plan.operations[instance_name].operation
+
     async def validator_target_set_pairs(
         self,
         ctx: BaseInputSetContext,
@@ -1682,22 +2229,156 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                 if taken:
                     yield validator, parameter_set
 
-    async def dispatch_auto_starts(self, ctx):
+    async def auto_start_operation_parameter_set_pairs(
+        self, ctx: BaseInputSetContext
+    ) -> AsyncIterator[Tuple[Operation, BaseParameterSet]]:
         """
-        Schedule the running of all operations without inputs
+        Yield all operations without inputs, along with an empty parameter set
         """
         for operation in self.config.dataflow.operations.values():
             if operation.inputs or not await self.ictx.check_conditions(
-                operation, self.config.dataflow, ctx
+                operation, self.config.dataflow, ctx, plan=self.plan
             ):
                 continue
-            parameter_set = MemoryParameterSet(
+            yield operation, MemoryParameterSet(
                 MemoryParameterSetConfig(ctx=ctx, parameters=[])
             )
-            task = await self.nctx.dispatch(self, operation, parameter_set)
-            task.operation = operation
-            task.parameter_set = parameter_set
-            yield task
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of operations running, queued, and the most which have been
+        queued at once. Along with the number of contexts, inputs, redundancy
+        keys, and locks held by the networks which report them. Contexts are
+        removed from the networks once they complete, so these should stay flat
+        across runs.
+
+        >>> import asyncio
+        >>> from dffml import *
+        >>>
+        >>> async def main():
+        ...     async with MemoryOrchestrator(max_operations=2) as orchestrator:
+        ...         async with orchestrator(DataFlow.auto()) as octx:
+        ...             print(octx.stats())
+        >>>
+        >>> asyncio.run(main())
+        {'operations_running': 0, 'operations_queued': 0, 'operations_queued_max': 0, 'contexts': 0, 'inputs': 0, 'locks': 0, 'redundancy_keys': 0}
+        """
+        stats = {
+            "operations_running": self.operations_running,
+            "operations_queued": self.operations_queued,
+            "operations_queued_max": self.operations_queued_max,
+        }
+        for network in (self.ictx, self.lctx, self.rctx):
+            if hasattr(network, "stats"):
+                stats.update(network.stats())
+        return stats
+
+    def operation_can_run(self, operation: Operation) -> bool:
+        """
+        Check that running another instance of operation wouldn't exceed
+        max_operations or the operation's max_concurrent
+        """
+        if (
+            self.config.max_operations is not None
+            and self.operations_running >= self.config.max_operations
+        ):
+            return False
+        if operation.max_concurrent is not None and (
+            self.operations_running_by_instance_name.get(
+                operation.instance_name, 0
+            )
+            >= operation.max_concurrent
+        ):
+            return False
+        return True
+
+    def _operation_done(self, operation: Operation, _task: asyncio.Task):
+        self.operations_running -= 1
+        self.operations_running_by_instance_name[operation.instance_name] -= 1
+        # Wake up everything waiting on the event and replace it so that it
+        # can be waited on again
+        self.operation_completed.set()
+        self.operation_completed = asyncio.Event()
+
+    async def dispatch_queued(
+        self,
+        queued: Dict[str, Deque[Tuple[Operation, BaseParameterSet]]],
+        tasks: Set[asyncio.Task],
+    ) -> None:
+        """
+        Dispatch queued operation and parameter set pairs while doing so would
+        not exceed any concurrency limits. Adds the dispatched tasks to tasks.
+        """
+        for instance_name in list(queued.keys()):
+            pairs = queued[instance_name]
+            while pairs and self.operation_can_run(pairs[0][0]):
+                operation, parameter_set = pairs.popleft()
+                self.operations_queued -= 1
+                self.operations_running += 1
+                self.operations_running_by_instance_name.setdefault(
+                    instance_name, 0
+                )
+                self.operations_running_by_instance_name[instance_name] += 1
+                task = await self.nctx.dispatch(self, operation, parameter_set)
+                task.operation = operation
+                task.parameter_set = parameter_set
+                task.add_done_callback(
+                    functools.partial(self._operation_done, operation)
+                )
+                tasks.add(task)
+                self.logger.debug(
+                    "[%s]: dispatch operation: %s",
+                    (await parameter_set.ctx.handle()).as_string(),
+                    operation.instance_name,
+                )
+            if not pairs:
+                del queued[instance_name]
+        # Track the most operations which have been left waiting at once
+        self.operations_queued_max = max(
+            self.operations_queued, self.operations_queued_max
+        )
+
+    def queue(
+        self,
+        queued: Dict[str, Deque[Tuple[Operation, BaseParameterSet]]],
+        operation: Operation,
+        parameter_set: BaseParameterSet,
+    ) -> None:
+        """
+        Add an operation and parameter set pair to the queue of pairs waiting
+        to be dispatched
+        """
+        queued.setdefault(operation.instance_name, collections.deque()).append(
+            (operation, parameter_set)
+        )
+        self.operations_queued += 1
+
+    async def run_ctx(
+        self, ctx: BaseInputSetContext, *, strict: bool = True
+    ) -> Tuple[BaseInputSetContext, Dict[str, Any]]:
+        """
+        Run all operations for a context. Once its outputs have been created
+        the context is removed from the networks this orchestrator context
+        owns (see :py:meth:`remove_ctx`), so that memory use does not grow with
+        the number of contexts run.
+        """
+        try:
+            return await self.run_operations_for_ctx(ctx, strict=strict)
+        finally:
+            await self.remove_ctx(ctx)
+
+    async def remove_ctx(self, ctx: BaseInputSetContext):
+        """
+        Release everything the input network, lock network, and redundancy
+        checker hold for a context which has completed. Networks given to us
+        via ``reuse`` belong to a parent orchestrator context, which may still
+        be running the context (as is the case with
+        :py:func:`remap <dffml.operation.output.remap>`), so they are left as
+        they are.
+        """
+        for name in ("ictx", "lctx", "rctx"):
+            if name not in self.config.reuse:
+                await getattr(self, name).remove_ctx(ctx)
 
     async def run_operations_for_ctx(
         self, ctx: BaseContextHandle, *, strict: bool = True
@@ -1706,11 +2387,18 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
         more = True
         # Set of tasks we are waiting on
         tasks = set()
-        # String representing the context we are executing operations for
-        ctx_str = (await ctx.handle()).as_string()
+        # Operation and parameter set pairs waiting to be dispatched, by
+        # operation instance_name
+        queued: Dict[str, Deque[Tuple[Operation, BaseParameterSet]]] = {}
+        # Task which completes when any operation in any context completes.
+        # Used to wake up when queued operations may be able to run.
+        operation_completed = None
         # schedule running of operations with no inputs
-        async for task in self.dispatch_auto_starts(ctx):
-            tasks.add(task)
+        async for operation, parameter_set in self.auto_start_operation_parameter_set_pairs(
+            ctx
+        ):
+            self.queue(queued, operation, parameter_set)
+        await self.dispatch_queued(queued, tasks)
         # Create initial events to wait on
         # TODO(dfass) Make ictx.added(ctx) specific to dataflow
         input_set_enters_network = asyncio.create_task(self.ictx.added(ctx))
@@ -1720,8 +2408,10 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
             while tasks:
                 if (
                     not more
-                    and len(tasks) == 1
-                    and input_set_enters_network in tasks
+                    and not queued
+                    and not tasks.difference(
+                        [input_set_enters_network, operation_completed]
+                    )
                 ):
                     break
                 # Wait for incoming events
@@ -1767,19 +2457,7 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                                 self.config.dataflow,
                                 unvalidated_input_set,
                             ):
-                                dispatch_operation = await self.nctx.dispatch(
-                                    self, operation, parameter_set
-                                )
-                                dispatch_operation.operation = operation
-                                dispatch_operation.parameter_set = (
-                                    parameter_set
-                                )
-                                tasks.add(dispatch_operation)
-                                self.logger.debug(
-                                    "[%s]: dispatch operation: %s",
-                                    ctx_str,
-                                    operation.instance_name,
-                                )
+                                self.queue(queued, operation, parameter_set)
                             # forward inputs to subflow
                             await self.forward_inputs_to_subflow(
                                 [x async for x in new_input_set.inputs()]
@@ -1794,25 +2472,25 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                                 # Validation operations shouldn't be run here
                                 if operation.validator:
                                     continue
-                                # Dispatch the operation and input set for running
-                                dispatch_operation = await self.nctx.dispatch(
-                                    self, operation, parameter_set
-                                )
-                                dispatch_operation.operation = operation
-                                dispatch_operation.parameter_set = (
-                                    parameter_set
-                                )
-                                tasks.add(dispatch_operation)
-                                self.logger.debug(
-                                    "[%s]: dispatch operation: %s",
-                                    ctx_str,
-                                    operation.instance_name,
-                                )
+                                # Queue the operation and input set for running
+                                self.queue(queued, operation, parameter_set)
                         # Create a another task to waits for new input sets
                         input_set_enters_network = asyncio.create_task(
                             self.ictx.added(ctx)
                         )
                         tasks.add(input_set_enters_network)
+                # Dispatch as many queued operations as the concurrency limits
+                # allow
+                await self.dispatch_queued(queued, tasks)
+                # If some are still waiting, wake up when any operation
+                # completes, since it might be in another context
+                if queued and (
+                    operation_completed is None or operation_completed.done()
+                ):
+                    operation_completed = asyncio.create_task(
+                        self.operation_completed.wait()
+                    )
+                    tasks.add(operation_completed)
         finally:
             # Cancel tasks which we don't need anymore now that we know we are done
             for task in tasks:
@@ -1820,6 +2498,9 @@ class MemoryOrchestratorContext(BaseOrchestratorContext):
                     task.cancel()
                 else:
                     task.exception()
+            # Drop operations which never got dispatched
+            for pairs in queued.values():
+                self.operations_queued -= len(pairs)
             # Run cleanup
             async for _operation, _results in self.run_stage(
                 ctx, Stage.CLEANUP
@@ -1893,6 +2574,7 @@ class MemoryOrchestrator(BaseOrchestrator, BaseMemoryDataFlowObject):
         config = dataflow
         if isinstance(dataflow, DataFlow):
             kwargs.setdefault("max_ctxs", self.config.max_ctxs)
+            kwargs.setdefault("max_operations", self.config.max_operations)
             config = MemoryOrchestratorContextConfig(
                 uid=secrets.token_hex(), dataflow=dataflow, **kwargs
             )
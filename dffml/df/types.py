@@ -90,7 +90,7 @@ class Definition(NamedTuple):
 
     def export(self):
         exported = dict(self._asdict())
-        if "dffml.df.types._NO_DEFAULT" in repr(self.default):
+        if isinstance(self.default, _NO_DEFAULT):
             del exported["default"]
         if not self.lock:
             del exported["lock"]
@@ -179,6 +179,12 @@ class Operation(Entrypoint):
     instance_name: Optional[str] = None
     validator: bool = False
     retry: int = 0
+    # Maximum number of instances of this operation which may run at the same
+    # time within an orchestrator context
+    max_concurrent: Optional[int] = None
+    # Run non-async implementations in a "thread" or "process" pool of the
+    # operation implementation network instead of on the event loop
+    executor: Optional[str] = None
 
     def _replace(self, **kwargs):
         return replace(self, **kwargs)
@@ -204,6 +210,10 @@ class Operation(Entrypoint):
             del exported["conditions"]
         if not exported["expand"]:
             del exported["expand"]
+        if self.max_concurrent is not None:
+            exported["max_concurrent"] = self.max_concurrent
+        if self.executor is not None:
+            exported["executor"] = self.executor
         return exported
 
     @classmethod
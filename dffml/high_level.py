@@ -2,9 +2,14 @@
 High level abstraction interfaces to DFFML. These are probably going to be used
 in a lot of quick and dirty python files.
 """
+import random
 import asyncio
 import pathlib
+import itertools
+import functools
 import contextlib
+import dataclasses
+import concurrent.futures
 from typing import Optional, Tuple, List, Union, Dict, Any, AsyncIterator
 
 from .record import Record
@@ -12,8 +17,13 @@ from .model.model import Model
 from .df.types import DataFlow, Input
 from .df.memory import MemoryOrchestrator
 from .model.accuracy import Accuracy
-from .accuracy.accuracy import AccuracyScorer, AccuracyContext
+from .accuracy.accuracy import (
+    AccuracyScorer,
+    AccuracyContext,
+    AccuracyScorers,
+)
 from .source.source import (
+    DEFAULT_BATCH_SIZE,
     Sources,
     SourcesContext,
     BaseSource,
@@ -286,8 +296,7 @@ async def save(source: BaseSource, *args: Record) -> None:
     myrecord,untagged,1,0.1,0,10,1.0
     """
     async with _records_to_sources(source) as sctx:
-        for record in args:
-            await sctx.update(record)
+        await sctx.update_many(list(args))
 
 
 async def load(source: BaseSource, *args: str) -> AsyncIterator[Record]:
@@ -409,20 +418,27 @@ async def train(model, *args: Union[BaseSource, Record, Dict[str, Any]]):
 
 async def accuracy(
     model,
-    accuracy_scorer: Union[AccuracyScorer, AccuracyContext],
+    accuracy_scorer: Union[AccuracyScorer, AccuracyScorers],
     *args: Union[BaseSource, Record, Dict[str, Any]],
-) -> float:
+) -> Union[float, Dict[str, float]]:
     """
     Assess the accuracy of a machine learning model.
 
     Provide records to the model to assess the percent accuracy of its
     prediction abilities. The model should be already instantiated and trained.
 
+    Pass :py:class:`AccuracyScorers <dffml.accuracy.accuracy.AccuracyScorers>`
+    to get the score from several scorers. Scorers which support it share one
+    pass of predictions over the records.
+
     Parameters
     ----------
     model : Model
         Machine Learning model to use. See :doc:`/plugins/dffml_model` for
         models options.
+    accuracy_scorer : AccuracyScorer or AccuracyScorers
+        Method, or methods, to use to score accuracy. See
+        :doc:`/plugins/dffml_accuracy` for options.
     *args : list
         Input data for training. Could be a ``dict``, :py:class:`Record`,
         filename, one of the data :doc:`/plugins/dffml_source`, or a filename
@@ -434,6 +450,9 @@ async def accuracy(
         A decimal value representing the percent of the time the model made the
         correct prediction. For some models this has another meaning. Please see
         the documentation for the model your using for further details.
+    dict
+        The score from each scorer by its entrypoint label, if given
+        ``AccuracyScorers``.
 
     Examples
     --------
@@ -462,6 +481,21 @@ async def accuracy(
     >>>
     >>> asyncio.run(main())
     Accuracy: 0.0
+    >>>
+    >>> async def main():
+    ...     print(
+    ...         await accuracy(
+    ...             model,
+    ...             AccuracyScorers(
+    ...                 MeanSquaredErrorAccuracy(), ClassificationAccuracy()
+    ...             ),
+    ...             {"Years": 4, "Salary": 50},
+    ...             {"Years": 5, "Salary": 60},
+    ...         ),
+    ...     )
+    >>>
+    >>> asyncio.run(main())
+    {'mse': 0.0, 'clf': 1.0}
     """
     async with contextlib.AsyncExitStack() as astack:
         # Open sources
@@ -471,7 +505,7 @@ async def accuracy(
             model = await astack.enter_async_context(model)
             mctx = await astack.enter_async_context(model())
         # Allow for keep models open
-        if isinstance(accuracy_scorer, AccuracyScorer):
+        if isinstance(accuracy_scorer, (AccuracyScorer, AccuracyScorers)):
             accuracy_scorer = await astack.enter_async_context(accuracy_scorer)
             actx = await astack.enter_async_context(accuracy_scorer())
         else:
@@ -479,6 +513,11 @@ async def accuracy(
             # through something like pydantic. See issue #36
             raise TypeError(f"{accuracy_scorer} is not an AccuracyScorer")
         # Run accuracy method
+        if isinstance(accuracy_scorer, AccuracyScorers):
+            return {
+                label: float(score)
+                for label, score in (await actx.score(mctx, sctx)).items()
+            }
         return float(await actx.score(mctx, sctx))
 
 
@@ -503,7 +542,7 @@ async def predict(
         filename, or one of the data :doc:`/plugins/dffml_source`.
     update : boolean, optional
         If ``True`` prediction data within records will be written back to all
-        sources given. Defaults to ``False``.
+        sources given, many records at a time. Defaults to ``False``.
     keep_record : boolean, optional
         If ``True`` the results will be kept as their ``Record`` objects instead
         of being converted to a ``(record.key, features, predictions)`` tuple.
@@ -548,12 +587,321 @@ async def predict(
         if isinstance(model, Model):
             model = await astack.enter_async_context(model)
             mctx = await astack.enter_async_context(model())
-        # Run predictions
-        async for record in mctx.predict(sctx):
-            yield record if keep_record else (
-                record.key,
-                record.features(),
-                record.predictions(),
+        # Records waiting to be written back to the sources
+        updated = []
+        try:
+            # Run predictions
+            async for record in mctx.predict(sctx):
+                yield record if keep_record else (
+                    record.key,
+                    record.features(),
+                    record.predictions(),
+                )
+                if update:
+                    updated.append(record)
+                    if len(updated) == DEFAULT_BATCH_SIZE:
+                        await sctx.update_many(updated)
+                        updated = []
+        finally:
+            if updated:
+                await sctx.update_many(updated)
+
+
+# Records being swept over by sweep(), set in each process it uses
+_SWEEP_RECORDS: List[Record] = []
+
+
+def _sweep_init(records: List[Record]):
+    global _SWEEP_RECORDS
+    _SWEEP_RECORDS = records
+
+
+async def _score_fold(
+    model,
+    accuracy_scorer: Union[AccuracyScorer, AccuracyScorers],
+    records: List[Record],
+    folds: int,
+    fold: int,
+) -> Union[float, Dict[str, float]]:
+    """
+    Train on all but one fold of the records and score on that fold
+    """
+    start = len(records) * fold // folds
+    stop = len(records) * (fold + 1) // folds
+    await train(model, *records[:start], *records[stop:])
+    return await accuracy(model, accuracy_scorer, *records[start:stop])
+
+
+def _score_fold_in_process(model, accuracy_scorer, folds: int, fold: int):
+    return asyncio.run(
+        _score_fold(model, accuracy_scorer, _SWEEP_RECORDS, folds, fold)
+    )
+
+
+async def sweep(
+    model,
+    accuracy_scorer: Union[AccuracyScorer, AccuracyScorers],
+    *args: Union[BaseSource, Record, Dict[str, Any]],
+    grid: Optional[Dict[str, List[Any]]] = None,
+    folds: int = 5,
+    processes: Optional[int] = None,
+    shuffle: bool = False,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Cross validate a model with every combination of values of its config
+    properties given in a grid.
+
+    Records are read from the sources once and kept in memory. Each fold of
+    each config is trained and scored in a pool of processes, which are given
+    the records when they start rather than with every fold. The model for
+    each is saved under the model's ``location``, in a directory named by the
+    index of its config and then the fold.
+
+    Folds are contiguous slices of the records in the order the sources give
+    them. If the records are sorted, for instance by the feature being
+    predicted, set ``shuffle`` so that each fold is a random sample of them.
+
+    Parameters
+    ----------
+    model : Model
+        Machine Learning model to use. Its config is the base for each config
+        in the grid.
+    accuracy_scorer : AccuracyScorer or AccuracyScorers
+        Method, or methods, to use to score accuracy.
+    *args : list
+        Input data to train and score on. Could be a ``dict``,
+        :py:class:`Record`, filename, or one of the data
+        :doc:`/plugins/dffml_source`.
+    grid : dict, optional
+        Values to try for each config property, by property name.
+    folds : int, optional
+        Number of folds to split the records into. Each fold is scored on by a
+        model trained on the others. Defaults to 5.
+    processes : int, optional
+        Number of processes to train and score with. Defaults to the number of
+        CPUs. With 1 folds are trained and scored one at a time in this
+        process.
+    shuffle : bool, optional
+        Shuffle the records before splitting them into folds. Defaults to
+        False.
+    seed : int, optional
+        Seed for shuffling the records, so that the folds are the same each
+        time. Defaults to a different order each time.
+
+    Returns
+    -------
+    list
+        A row for each fold of each config, with the config values from the
+        grid, the ``fold``, and its ``accuracy``. If given ``AccuracyScorers``
+        there is a score by each scorer's entrypoint label instead.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from dffml import *
+    >>>
+    >>> model = SLRModel(
+    ...     features=Features(
+    ...         Feature("Years", int, 1),
+    ...     ),
+    ...     predict=Feature("Salary", int, 1),
+    ...     location="tempdir",
+    ... )
+    >>>
+    >>> async def main():
+    ...     for row in await sweep(
+    ...         model,
+    ...         MeanSquaredErrorAccuracy(),
+    ...         *[
+    ...             {"Years": i, "Expertise": i % 2, "Salary": (i + 1) * 10}
+    ...             for i in range(6)
+    ...         ],
+    ...         grid={
+    ...             "features": [
+    ...                 Features(Feature("Years", int, 1)),
+    ...                 Features(Feature("Expertise", int, 1)),
+    ...             ],
+    ...         },
+    ...         folds=2,
+    ...     ):
+    ...         print(
+    ...             row["features"].names(),
+    ...             row["fold"],
+    ...             round(row["accuracy"]),
+    ...         )
+    >>>
+    >>> asyncio.run(main())
+    ['Years'] 0 0
+    ['Years'] 1 0
+    ['Expertise'] 0 927
+    ['Expertise'] 1 967
+    """
+    if folds < 2:
+        raise ValueError(f"Need at least 2 folds to cross validate: {folds}")
+    if grid is None:
+        grid = {}
+    if "location" in grid:
+        raise ValueError(
+            "location can't be swept over, the model for each config is "
+            "saved under the model's location"
+        )
+    # Keys of the scores in each row, which the grid can't also use
+    if isinstance(accuracy_scorer, AccuracyScorers):
+        labels = [scorer.ENTRY_POINT_LABEL for scorer in accuracy_scorer]
+    else:
+        labels = ["accuracy"]
+    collisions = set(grid).intersection(["fold", *labels])
+    if collisions:
+        raise ValueError(
+            f"Grid keys {sorted(collisions)} are used by the fold and scores "
+            "of each row"
+        )
+    # Config values for every combination of values in the grid
+    params = [
+        dict(zip(grid.keys(), values))
+        for values in itertools.product(*grid.values())
+    ]
+    jobs = [
+        (
+            i,
+            fold,
+            model.__class__(
+                dataclasses.replace(
+                    model.config,
+                    location=pathlib.Path(
+                        model.config.location, str(i), str(fold)
+                    ),
+                    **param,
+                )
+            ),
+        )
+        for i, param in enumerate(params)
+        for fold in range(folds)
+    ]
+    # Read the records once
+    async with _records_to_sources(*args) as sctx:
+        records = [record async for record in sctx.records()]
+    if shuffle:
+        random.Random(seed).shuffle(records)
+    if processes == 1:
+        scores = [
+            await _score_fold(job_model, accuracy_scorer, records, folds, fold)
+            for _i, fold, job_model in jobs
+        ]
+    else:
+        loop = asyncio.get_event_loop()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_sweep_init,
+            initargs=(records,),
+        ) as pool:
+            scores = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        pool,
+                        functools.partial(
+                            _score_fold_in_process,
+                            job_model,
+                            accuracy_scorer,
+                            folds,
+                            fold,
+                        ),
+                    )
+                    for _i, fold, job_model in jobs
+                ]
             )
-            if update:
-                await sctx.update(record)
+    rows = []
+    for (i, fold, _job_model), score in zip(jobs, scores):
+        row = {**params[i], "fold": fold}
+        if isinstance(score, dict):
+            row.update(score)
+        else:
+            row["accuracy"] = score
+        rows.append(row)
+    return rows
+
+
+async def cross_validate(
+    model,
+    accuracy_scorer: Union[AccuracyScorer, AccuracyScorers],
+    *args: Union[BaseSource, Record, Dict[str, Any]],
+    folds: int = 5,
+    processes: Optional[int] = None,
+    shuffle: bool = False,
+    seed: Optional[int] = None,
+) -> List[Union[float, Dict[str, float]]]:
+    """
+    Assess the accuracy of a machine learning model with k-fold cross
+    validation. See :py:func:`sweep` for details.
+
+    Parameters
+    ----------
+    model : Model
+        Machine Learning model to use.
+    accuracy_scorer : AccuracyScorer or AccuracyScorers
+        Method, or methods, to use to score accuracy.
+    *args : list
+        Input data to train and score on. Could be a ``dict``,
+        :py:class:`Record`, filename, or one of the data
+        :doc:`/plugins/dffml_source`.
+    folds : int, optional
+        Number of folds to split the records into. Defaults to 5.
+    processes : int, optional
+        Number of processes to train and score with. Defaults to the number of
+        CPUs.
+    shuffle : bool, optional
+        Shuffle the records before splitting them into folds, rather than
+        using contiguous slices of them. Defaults to False.
+    seed : int, optional
+        Seed for shuffling the records.
+
+    Returns
+    -------
+    list
+        The score of each fold. If given ``AccuracyScorers``, a dict of the
+        score by each scorer's entrypoint label.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from dffml import *
+    >>>
+    >>> model = SLRModel(
+    ...     features=Features(
+    ...         Feature("Years", int, 1),
+    ...     ),
+    ...     predict=Feature("Salary", int, 1),
+    ...     location="tempdir",
+    ... )
+    >>>
+    >>> async def main():
+    ...     print(
+    ...         await cross_validate(
+    ...             model,
+    ...             MeanSquaredErrorAccuracy(),
+    ...             *[{"Years": i, "Salary": (i + 1) * 10} for i in range(6)],
+    ...             folds=3,
+    ...         )
+    ...     )
+    >>>
+    >>> asyncio.run(main())
+    [0.0, 0.0, 0.0]
+    """
+    rows = await sweep(
+        model,
+        accuracy_scorer,
+        *args,
+        folds=folds,
+        processes=processes,
+        shuffle=shuffle,
+        seed=seed,
+    )
+    # Rows are in order of fold, leave only the scores
+    for row in rows:
+        del row["fold"]
+    if isinstance(accuracy_scorer, AccuracyScorers):
+        return rows
+    return [row["accuracy"] for row in rows]
@@ -98,7 +98,7 @@ class SLRModel(SimpleModel):
             -model-location tempdir \
             -sources f=csv \
             -source-filename dataset.csv \
-            -scorer mse \
+            -scorer mse
         1.0
 
     Make a prediction
@@ -35,6 +35,38 @@ accuracy.__doc__ = (
 )
 
 
+def sweep(*args, **kwargs):
+    return asyncio.run(high_level.sweep(*args, **kwargs))
+
+
+sweep.__doc__ = (
+    high_level.sweep.__doc__.replace("await ", "")
+    .replace("async ", "")
+    .replace("asyncio.run(main())", "main()")
+    .replace("    >>> import asyncio\n", "")
+    .replace(
+        "    >>> from dffml import *\n",
+        "    >>> from dffml import *\n    >>> from dffml.noasync import *\n",
+    )
+)
+
+
+def cross_validate(*args, **kwargs):
+    return asyncio.run(high_level.cross_validate(*args, **kwargs))
+
+
+cross_validate.__doc__ = (
+    high_level.cross_validate.__doc__.replace("await ", "")
+    .replace("async ", "")
+    .replace("asyncio.run(main())", "main()")
+    .replace("    >>> import asyncio\n", "")
+    .replace(
+        "    >>> from dffml import *\n",
+        "    >>> from dffml import *\n    >>> from dffml.noasync import *\n",
+    )
+)
+
+
 def predict(*args, **kwargs):
     async_gen = high_level.predict(*args, **kwargs).__aiter__()
 
@@ -0,0 +1,317 @@
+"""
+Caches feature data of another source on disk
+"""
+import os
+import json
+import asyncio
+import contextlib
+import shutil
+import pathlib
+import tempfile
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from ..record import Record
+from ..base import config, field
+from ..util.entrypoint import entrypoint
+from ..util.crypto import secure_hash
+from .source import (
+    DEFAULT_BATCH_SIZE,
+    BaseSource,
+    BaseSourceContext,
+    RecordBatch,
+    column_array,
+)
+
+
+@config
+class FeatureCacheSourceConfig:
+    source: BaseSource = field("Source whose feature data is cached")
+    directory: pathlib.Path = field(
+        "Directory to store cached feature data in"
+    )
+
+
+class FeatureCacheSourceContext(BaseSourceContext):
+    """
+    The wrapped source is only opened once something other than cached feature
+    data is needed from it.
+    """
+
+    async def source(self) -> BaseSourceContext:
+        """
+        Context of the wrapped source, opening it if needed
+        """
+        if self.sctx is None:
+            await self.parent.open()
+            self.sctx = await self.stack.enter_async_context(
+                self.parent.source()
+            )
+        return self.sctx
+
+    async def update(self, record: Record):
+        await (await self.source()).update(record)
+        self.parent.clear()
+
+    async def update_many(self, records: List[Record]):
+        await (await self.source()).update_many(records)
+        self.parent.clear()
+
+    async def record(self, key: str) -> Record:
+        return await (await self.source()).record(key)
+
+    async def records(self) -> AsyncIterator[Record]:
+        async for record in (await self.source()).records():
+            yield record
+
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        return await (await self.source()).records_by_key(keys)
+
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        if numpy is None or not self.parent.cacheable():
+            async for batch in (await self.source()).batches(
+                features, batch_size
+            ):
+                yield batch
+            return
+        path = self.parent.cache_path(features)
+        if not path.is_dir():
+            keys = []
+            columns = {feature: [] for feature in features}
+            async for batch in (await self.source()).batches(
+                features, batch_size
+            ):
+                keys.extend(batch.keys)
+                for feature in features:
+                    columns[feature].extend(batch.features[feature])
+            if not self.parent.save(path, features, keys, columns):
+                # Feature data which can't be cached is given as it was read
+                columns = {
+                    feature: column_array(column)
+                    for feature, column in columns.items()
+                }
+                for start in range(0, len(keys), batch_size):
+                    stop = start + batch_size
+                    yield RecordBatch(
+                        keys[start:stop],
+                        {
+                            feature: column[start:stop]
+                            for feature, column in columns.items()
+                        },
+                    )
+                return
+        for batch in self.parent.load(path, features, batch_size):
+            yield batch
+
+    async def __aenter__(self) -> "FeatureCacheSourceContext":
+        self.sctx = None
+        self.stack = contextlib.AsyncExitStack()
+        await self.stack.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stack.__aexit__(exc_type, exc_value, traceback)
+
+
+@entrypoint("cache")
+class FeatureCacheSource(BaseSource):
+    """
+    Caches the feature data of batches from another source on disk, as a NumPy
+    ``.npy`` file for each feature. Later batches of the same features are
+    read from memory mapped cache files rather than the source, which isn't
+    opened unless records are needed from it.
+
+    The cache is keyed by the source's config, the size and modification time
+    of its file, and the features requested. Data cached before the file last
+    changed is removed when new data is cached. Updating records through this
+    source clears the source's cache, as do sources which write their file
+    when closed if ``readwrite`` is set. Sources without a ``filename`` which
+    is a file, such as databases or ``memory``, can change without this
+    source knowing, so their batches are passed on without being cached.
+    Features whose values don't all have the same type, or can't be stored in
+    a NumPy array without pickling, are not cached. NumPy must be installed to
+    cache anything.
+
+    The first batches of features which are cached are given once all of the
+    source's feature data has been read and cached. Their columns are always
+    NumPy arrays, memory mapped copy-on-write from the cache files, so they
+    can be changed without changing the cache. Batches which aren't cached
+    have columns as the source gives them.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import pathlib
+    >>> from dffml import *
+    >>>
+    >>> pathlib.Path("data.csv").write_text(
+    ...     "key,x,y\\n" + "".join(f"{i},{i},{i * 2}\\n" for i in range(5))
+    ... )
+    38
+    >>>
+    >>> source = FeatureCacheSource(
+    ...     source=CSVSource(filename="data.csv"),
+    ...     directory="cache",
+    ... )
+    >>>
+    >>> async def main():
+    ...     async with source, source() as sctx:
+    ...         for _ in range(2):
+    ...             async for batch in sctx.batches(["x", "y"], 3):
+    ...                 print(batch.keys, batch.features["y"].tolist())
+    >>>
+    >>> asyncio.run(main())
+    ['0', '1', '2'] [0, 2, 4]
+    ['3', '4'] [6, 8]
+    ['0', '1', '2'] [0, 2, 4]
+    ['3', '4'] [6, 8]
+    """
+
+    CONFIG = FeatureCacheSourceConfig
+    CONTEXT = FeatureCacheSourceContext
+
+    async def __aenter__(self) -> "FeatureCacheSource":
+        self.source = self.config.source
+        self.opened = False
+        self.warned = False
+        self.lock = asyncio.Lock()
+        self.stack = contextlib.AsyncExitStack()
+        await self.stack.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stack.__aexit__(exc_type, exc_value, traceback)
+
+    async def open(self):
+        """
+        Open the wrapped source, if it isn't already
+        """
+        async with self.lock:
+            if not self.opened:
+                await self.stack.enter_async_context(self.source)
+                self.opened = True
+
+    def cacheable(self) -> bool:
+        """
+        If the source has a file to tell when its data changes. Logs a warning
+        the first time it doesn't.
+        """
+        filename = getattr(self.config.source.config, "filename", None)
+        if filename is not None and os.path.isfile(filename):
+            return True
+        if not self.warned:
+            self.warned = True
+            self.logger.warning(
+                "%s has no file to tell when its data changes, not caching",
+                self.config.source.__class__.__qualname__,
+            )
+        return False
+
+    def source_path(self) -> pathlib.Path:
+        """
+        Directory of the cached feature data of the source
+        """
+        key = [
+            self.config.source.__class__.__qualname__,
+            repr(self.config.source.config),
+        ]
+        return pathlib.Path(
+            self.config.directory, secure_hash(json.dumps(key), "sha384")
+        )
+
+    def state_path(self) -> pathlib.Path:
+        """
+        Directory of the cached feature data of the source in the current
+        state of its file
+        """
+        stat = os.stat(self.config.source.config.filename)
+        key = [stat.st_size, stat.st_mtime_ns]
+        return self.source_path() / secure_hash(json.dumps(key), "sha384")
+
+    def cache_path(self, features: List[str]) -> pathlib.Path:
+        """
+        Directory of the cached data of the given features
+        """
+        return self.state_path() / secure_hash(json.dumps(features), "sha384")
+
+    def clear(self):
+        """
+        Remove the cached feature data of the source
+        """
+        shutil.rmtree(self.source_path(), ignore_errors=True)
+
+    @staticmethod
+    def cache_array(column: List[Any]) -> Optional["numpy.ndarray"]:
+        """
+        Column as an array which can be memory mapped, or None
+        """
+        array = column_array(column)
+        # Arrays of objects are pickled rather than mapped
+        if array.dtype.hasobject:
+            return None
+        return array
+
+    def save(
+        self,
+        path: pathlib.Path,
+        features: List[str],
+        keys: List[str],
+        columns: Dict[str, List[Any]],
+    ) -> bool:
+        """
+        Write the feature data for each key to the cache directory at path.
+        Returns if the feature data is cached.
+        """
+        if not keys:
+            return False
+        arrays = [self.cache_array(columns[feature]) for feature in features]
+        if any(array is None for array in arrays):
+            self.logger.debug("%s: not caching %s", path, features)
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary directory and move it into place once
+        # complete, so that a partially written cache is never read
+        tempdir = pathlib.Path(tempfile.mkdtemp(dir=path.parent))
+        try:
+            numpy.save(tempdir / "keys.npy", numpy.asarray(keys, dtype=str))
+            for i, array in enumerate(arrays):
+                numpy.save(tempdir / f"{i}.npy", array)
+            (tempdir / "features.json").write_text(json.dumps(features))
+            os.replace(tempdir, path)
+        except OSError:
+            # Cached by another source at the same time
+            shutil.rmtree(tempdir, ignore_errors=True)
+            return path.is_dir()
+        self.logger.debug("%s: cached %d records", path, len(keys))
+        # Remove data cached before the file last changed
+        for state_path in path.parent.parent.iterdir():
+            if state_path != path.parent:
+                shutil.rmtree(state_path, ignore_errors=True)
+        return True
+
+    def load(self, path: pathlib.Path, features: List[str], batch_size: int):
+        """
+        Batches of feature data from the cache directory at path. Columns are
+        slices of arrays memory mapped copy-on-write from the cache files.
+        """
+        keys = numpy.load(path / "keys.npy", mmap_mode="r")
+        columns = {
+            feature: numpy.load(path / f"{i}.npy", mmap_mode="c")
+            for i, feature in enumerate(features)
+        }
+        for start in range(0, len(keys), batch_size):
+            stop = start + batch_size
+            yield RecordBatch(
+                keys[start:stop].tolist(),
+                {
+                    feature: column[start:stop]
+                    for feature, column in columns.items()
+                },
+            )
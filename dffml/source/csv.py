@@ -3,24 +3,96 @@
 """
 Loads records from a csv file, using columns as features
 """
+import os
 import csv
 import ast
+import dbm
 import itertools
 import asyncio
-from typing import Dict, List
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+)
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 
 from ..record import Record
+from .source import DEFAULT_BATCH_SIZE, BaseSourceContext, RecordBatch
 from .memory import MemorySource
-from .file import FileSource, FileSourceConfig
+from .file import FileSource, FileSourceConfig, FileSourceContext
 from ..base import config
+from ..feature import Features
 from ..util.entrypoint import entrypoint
 from ..configloader.configloader import ConfigLoaders
 
 csv.register_dialect("strip", skipinitialspace=True)
 
 
+class CSVSourceStreamReadOnlyError(Exception):
+    """
+    Raised when a CSVSource in stream mode is asked to write records.
+    """
+
+
+def literal(value: str) -> Any:
+    """
+    Python literal represented by value, or value itself if it isn't one
+    """
+    try:
+        return ast.literal_eval(value)
+    except (SyntaxError, ValueError):
+        return value
+
+
+def boolean(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ["1", "yes", "true", "on"]:
+        return True
+    elif lowered in ["0", "no", "false", "off"]:
+        return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
+def converter(dtype) -> Callable[[str], Any]:
+    """
+    Function to convert the values of a column with the given dtype. Values
+    which can't be cast directly fall back to :py:func:`literal`.
+    """
+    if dtype is None or dtype not in (str, int, float, bool):
+        return literal
+    elif dtype is str:
+        return str
+    cast = boolean if dtype is bool else dtype
+
+    def convert(value: str) -> Any:
+        try:
+            return cast(value)
+        except ValueError:
+            return literal(value)
+
+    return convert
+
+
+class CSVHeaders(NamedTuple):
+    """
+    Indexes of the columns of a CSV file, by the role they play in creating
+    a Record
+    """
+
+    tag: int
+    key: int
+    # Column, feature name, and function to convert values
+    features: List[Tuple[int, str, Callable[[str], Any]]]
+    # Target name, prediction column, and confidence column
+    predictions: List[Tuple[str, int, int]]
+
+
 @dataclass
 class OpenCSVFile:
     write_out: Dict
@@ -45,6 +117,9 @@ CSV_SOURCE_CONFIG_DEFAULT_tag_COLUMN = "tag"
 CSV_SOURCE_CONFIG_DEFAULT_DELIMITER = ","
 CSV_SOURCE_CONFIG_DEFAULT_LOADFILES_NAME = None
 CSV_SOURCE_CONFIG_DEFAULT_NOSTRIP = False
+CSV_SOURCE_CONFIG_DEFAULT_STREAM = False
+CSV_SOURCE_CONFIG_DEFAULT_INDEX = None
+CSV_SOURCE_CONFIG_DEFAULT_DTYPES = None
 
 
 @config
@@ -55,6 +130,46 @@ class CSVSourceConfig(FileSourceConfig):
     delimiter: str = CSV_SOURCE_CONFIG_DEFAULT_DELIMITER
     loadfiles: List[str] = CSV_SOURCE_CONFIG_DEFAULT_LOADFILES_NAME
     nostrip: bool = CSV_SOURCE_CONFIG_DEFAULT_NOSTRIP
+    stream: bool = CSV_SOURCE_CONFIG_DEFAULT_STREAM
+    index: str = CSV_SOURCE_CONFIG_DEFAULT_INDEX
+    dtypes: Features = CSV_SOURCE_CONFIG_DEFAULT_DTYPES
+
+
+class CSVSourceStreamContext(BaseSourceContext):
+    """
+    Parses records from the file as they are requested rather than holding
+    them all in memory
+    """
+
+    async def update(self, record):
+        raise CSVSourceStreamReadOnlyError(
+            f"{self.parent.config.filename} opened in stream mode"
+        )
+
+    async def records(self) -> AsyncIterator[Record]:
+        async for _tag, _key, record in self.parent.stream_records():
+            yield record
+
+    async def record(self, key: str) -> Record:
+        if self.parent.offsets is not None:
+            return await self.parent.indexed_record(key)
+        async for _tag, record_key, record in self.parent.stream_records():
+            if record_key == key:
+                return record
+        return Record(key)
+
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        # Features loaded from other files are handled by records()
+        if self.parent.config.loadfiles and any(
+            feature in self.parent.config.loadfiles for feature in features
+        ):
+            batches = super().batches(features, batch_size)
+        else:
+            batches = self.parent.stream_batches(features, batch_size)
+        async for batch in batches:
+            yield batch
 
 
 # CSVSource is a bit of a mess
@@ -62,9 +177,18 @@ class CSVSourceConfig(FileSourceConfig):
 class CSVSource(FileSource, MemorySource):
     """
     Uses a CSV file as the source of record feature data
+
+    By default all records are loaded into memory when the source is opened.
+    If ``stream`` is set, records are instead parsed from the file each time
+    they are iterated over, which keeps memory usage flat for large files.
+    Streaming sources are read only. Looking up a single record in stream
+    mode scans the file, unless ``index`` is given, in which case the byte
+    offset of each row is stored in an on disk database at that path. The
+    index is rebuilt whenever the CSV file changes.
     """
 
     CONFIG = CSVSourceConfig
+    CONTEXT = FileSourceContext
 
     # Headers we've added to track data other than feature data for a record
     CSV_HEADERS = ["prediction", "confidence"]
@@ -73,6 +197,39 @@ class CSVSource(FileSource, MemorySource):
     OPEN_CSV_FILES_LOCK: asyncio.Lock = asyncio.Lock()
     CONFIG_LOADER = ConfigLoaders()
 
+    def __init__(self, config):
+        super().__init__(config)
+        # Key offset index, opened when streaming with an index
+        self.offsets = None
+        if getattr(self.config, "stream", False) and self.config.readwrite:
+            raise CSVSourceStreamReadOnlyError(
+                f"{self.config.filename}: stream and readwrite are exclusive"
+            )
+
+    def __call__(self) -> BaseSourceContext:
+        if self.config.stream:
+            return CSVSourceStreamContext(self)
+        return super().__call__()
+
+    async def _open(self):
+        await super()._open()
+        if (
+            self.config.stream
+            and self.config.index
+            and os.path.isfile(self.config.filename)
+        ):
+            self.offsets = self.open_index()
+
+    def keeps_records_in_memory(self) -> bool:
+        # Streamed records are read from the file every time
+        return not self.config.stream and super().keeps_records_in_memory()
+
+    async def _close(self):
+        if self.offsets is not None:
+            self.offsets.close()
+            self.offsets = None
+        await super()._close()
+
     @asynccontextmanager
     async def _open_csv(self, fd=None):
         async with self.OPEN_CSV_FILES_LOCK:
@@ -90,108 +247,283 @@ class CSVSource(FileSource, MemorySource):
             yield self.OPEN_CSV_FILES[self.config.filename]
 
     async def _empty_file_init(self):
+        if self.config.stream:
+            return {}
         async with self._open_csv():
             return {}
 
-    async def read_csv(self, fd, open_file):
-        dict_reader = csv.DictReader(
+    def reader(self, fd) -> Tuple[List[str], Iterator[List[str]]]:
+        """
+        Read the header of a CSV stream. Returns the column names and an
+        iterator over the rows which follow, skipping blank lines.
+        """
+        reader = csv.reader(
             fd, delimiter=self.config.delimiter, dialect="strip"
         )
+        return next(reader, []), filter(None, reader)
+
+    async def read_csv(self, fd, open_file):
+        fieldnames, rows = self.reader(fd)
         # Record what headers are present when the file was opened
-        if not self.config.key in dict_reader.fieldnames:
+        if not self.config.key in fieldnames:
             open_file.write_back_key = False
-        if self.config.tagcol in dict_reader.fieldnames:
+        if self.config.tagcol in fieldnames:
             open_file.write_back_tag = True
+        headers = self.classify_headers(fieldnames)
         # Store all the records by their tag in write_out
         open_file.write_out = {}
         # If there is no key track row index to be used as key by tag
         index = {}
-        for row in dict_reader:
-            # Strip the keys and values of row
+        for row in rows:
+            tag, key = self.row_tag_and_key(row, headers, index)
+            # Add the record to our internal memory representation
+            open_file.write_out.setdefault(tag, {})
+            open_file.write_out[tag][key] = await self.parse_row(
+                row, headers, key
+            )
+
+    def classify_headers(self, fieldnames: List[str]) -> CSVHeaders:
+        """
+        Sort the columns of the file into the tag and key columns, the
+        prediction and confidence columns we added, and feature columns. This
+        is done once per file rather than for every row.
+        """
+        dtypes = {}
+        if self.config.dtypes:
+            dtypes = {
+                feature.name: feature.dtype
+                for feature in self.config.dtypes
+                if feature.length == 1
+            }
+        tag = None
+        key = None
+        features = []
+        columns = {}
+        for column, name in enumerate(fieldnames):
             if not self.config.nostrip:
-                row = {k.strip(): v.strip() for k, v in row.items()}
-            # Grab tag from row
-            tag = row.get(self.config.tagcol, self.config.tag)
-            # Load via ConfigLoaders if loadfiles parameter is given
-            cfgl_data = {}
-            if self.config.loadfiles:
-                for loadfile in self.config.loadfiles:
-                    async with self.CONFIG_LOADER as cfgl:
-                        _, cfgl_data[loadfile] = await cfgl.load_file(
-                            row[loadfile]
-                        )
-            if self.config.tagcol in row:
-                del row[self.config.tagcol]
-            index.setdefault(tag, 0)
-            # Grab key from row
-            key = row.get(self.config.key, str(index[tag]))
-            if self.config.key in row:
-                del row[self.config.key]
-            else:
-                index[tag] += 1
-            # Record data we are going to parse from this row (must include
-            # features).
-            record_data = {}
-            # Parse headers we as the CSV source added
-            csv_meta = {}
-            row_keys = []
-            # getting all keys starting with "prediction","confidence"
-            for header in self.CSV_HEADERS:
-                row_keys.extend(
-                    list(
-                        filter(
-                            lambda x: x.startswith(header + "_"), row.keys()
-                        )
-                    )
+                name = name.strip()
+            columns[name] = column
+            if name == self.config.tagcol:
+                tag = column
+            elif name == self.config.key:
+                key = column
+            elif not any(
+                name.startswith(header + "_") for header in self.CSV_HEADERS
+            ):
+                features.append(
+                    (column, name, converter(dtypes.get(name, None)))
                 )
-            # pop all prediction data from row and save in csv_meta
-            for header in row_keys:
-                value = row.get(header, None)
-                if value is not None and value != "":
-                    csv_meta[header] = row[header]
-                    # Remove from feature data
-                    del row[header]
-            # Set the features
-            features = {}
-            for _key, _value in row.items():
-                if self.config.loadfiles:
-                    if _key in self.config.loadfiles:
-                        _value = cfgl_data[_key]
-                if _value != "":
-                    try:
-                        features[_key] = ast.literal_eval(_value)
-                    except (SyntaxError, ValueError):
-                        features[_key] = _value
-            if features:
-                record_data["features"] = features
-
-            # Getting all prediction target names
-            target_keys = filter(
-                lambda x: x.startswith("prediction_"), csv_meta.keys()
-            )
-            target_keys = map(
-                lambda x: x.replace("prediction_", ""), target_keys
+        predictions = [
+            (
+                name[len("prediction_") :],
+                column,
+                columns.get("confidence_" + name[len("prediction_") :]),
             )
+            for name, column in columns.items()
+            if name.startswith("prediction_")
+        ]
+        return CSVHeaders(
+            tag=tag, key=key, features=features, predictions=predictions
+        )
 
-            predictions = {
-                target_name: {
-                    "value": str(csv_meta["prediction_" + target_name]),
-                    "confidence": float(csv_meta["confidence_" + target_name]),
+    def value(self, row: List[str], column: int) -> str:
+        """
+        Value of column in row, stripped unless nostrip is set
+        """
+        if self.config.nostrip:
+            return row[column]
+        return row[column].strip()
+
+    def row_tag_and_key(
+        self, row: List[str], headers: CSVHeaders, index: Dict[str, int]
+    ) -> Tuple[str, str]:
+        """
+        Grab the tag and key from row. If there is no key column the number
+        of rows seen so far with the same tag is used as the key.
+        """
+        tag = self.config.tag
+        if headers.tag is not None:
+            tag = self.value(row, headers.tag)
+        if headers.key is not None:
+            return tag, self.value(row, headers.key)
+        index.setdefault(tag, 0)
+        index[tag] += 1
+        return tag, str(index[tag] - 1)
+
+    async def parse_row(
+        self, row: List[str], headers: CSVHeaders, key: str
+    ) -> Record:
+        """
+        Create a Record from a row of the CSV file
+        """
+        # Record data we are going to parse from this row (must include
+        # features).
+        record_data = {}
+        # Set the features
+        features = {}
+        for column, name, convert in headers.features:
+            value = self.value(row, column)
+            # Load via ConfigLoaders if loadfiles parameter is given
+            if self.config.loadfiles and name in self.config.loadfiles:
+                async with self.CONFIG_LOADER as cfgl:
+                    _, features[name] = await cfgl.load_file(value)
+            elif value != "":
+                features[name] = convert(value)
+        if features:
+            record_data["features"] = features
+        # Parse headers we as the CSV source added
+        predictions = {}
+        for target_name, prediction, confidence in headers.predictions:
+            value = self.value(row, prediction)
+            if value != "":
+                predictions[target_name] = {
+                    "value": value,
+                    "confidence": float(self.value(row, confidence)),
                 }
-                for target_name in target_keys
+        record_data.update({"prediction": predictions})
+        return Record(key, data=record_data)
+
+    async def stream_records(self) -> AsyncIterator[Tuple[str, str, Record]]:
+        """
+        Parse the file one row at a time, yielding the tag, key, and Record
+        for each row with the configured tag
+        """
+        if not os.path.isfile(self.config.filename):
+            return
+        with self.read_opener() as fd:
+            fieldnames, rows = self.reader(fd)
+            headers = self.classify_headers(fieldnames)
+            index = {}
+            for row in rows:
+                tag, key = self.row_tag_and_key(row, headers, index)
+                if tag == self.config.tag:
+                    yield tag, key, await self.parse_row(row, headers, key)
+
+    async def stream_batches(
+        self, features: List[str], batch_size: int
+    ) -> AsyncIterator[RecordBatch]:
+        """
+        Parse the file one row at a time into batches of feature data,
+        without creating a Record for each row
+        """
+        if not os.path.isfile(self.config.filename):
+            return
+        with self.read_opener() as fd:
+            fieldnames, rows = self.reader(fd)
+            headers = self.classify_headers(fieldnames)
+            columns = {
+                name: (column, convert)
+                for column, name, convert in headers.features
             }
-            record_data.update({"prediction": predictions})
-            # If there was no data in the row, skip it
-            if not record_data and key == str(index[tag] - 1):
-                continue
-            # Add the record to our internal memory representation
-            open_file.write_out.setdefault(tag, {})
-            open_file.write_out[tag][key] = Record(key, data=record_data)
+            # No row has all the features
+            if not all(feature in columns for feature in features):
+                return
+            columns = [columns[feature] for feature in features]
+            batch = RecordBatch([], {feature: [] for feature in features})
+            index = {}
+            for row in rows:
+                tag, key = self.row_tag_and_key(row, headers, index)
+                if tag != self.config.tag:
+                    continue
+                values = [self.value(row, column) for column, _ in columns]
+                if "" in values:
+                    continue
+                batch.keys.append(key)
+                for feature, (_, convert), value in zip(
+                    features, columns, values
+                ):
+                    batch.features[feature].append(convert(value))
+                if len(batch.keys) == batch_size:
+                    yield batch.arrays()
+                    batch = RecordBatch(
+                        [], {feature: [] for feature in features}
+                    )
+            if batch.keys:
+                yield batch.arrays()
+
+    @staticmethod
+    def index_key(tag: str, key: str) -> bytes:
+        return f"{tag}\0{key}".encode()
+
+    def index_stamp(self) -> bytes:
+        stat = os.stat(self.config.filename)
+        return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+    def open_index(self):
+        """
+        Open the on disk index of row offsets, building it if it doesn't exist
+        or the CSV file changed since it was built
+        """
+        stamp = self.index_stamp()
+        offsets = dbm.open(str(self.config.index), "c")
+        try:
+            if offsets[self.index_key("", "")] == stamp:
+                return offsets
+        except KeyError:
+            pass
+        offsets.close()
+        self.logger.debug("Building index %s", self.config.index)
+        offsets = dbm.open(str(self.config.index), "n")
+        with self.read_opener() as fd:
+            # Position of the first line of the row the reader is reading.
+            # Blank lines are skipped by the reader, so they don't start rows.
+            start = None
+
+            def lines():
+                nonlocal start
+                while True:
+                    position = fd.tell()
+                    line = fd.readline()
+                    if not line:
+                        return
+                    if start is None and line.strip("\r\n"):
+                        start = position
+                    yield line
+
+            fieldnames, rows = self.reader(lines())
+            headers = self.classify_headers(fieldnames)
+            index = {}
+            while True:
+                start = None
+                try:
+                    row = next(rows)
+                except StopIteration:
+                    break
+                tag, key = self.row_tag_and_key(row, headers, index)
+                offsets[self.index_key(tag, key)] = str(start).encode()
+        # The empty tag and key can't come from a row, use it for the stamp
+        offsets[self.index_key("", "")] = stamp
+        return offsets
+
+    async def indexed_record(self, key: str) -> Record:
+        """
+        Parse the record with the given key using its offset in the index
+        """
+        try:
+            offset = int(self.offsets[self.index_key(self.config.tag, key)])
+        except KeyError:
+            return Record(key)
+        with self.read_opener() as fd:
+            fieldnames, _rows = self.reader(fd)
+            fd.seek(offset)
+            row = next(
+                filter(
+                    None,
+                    csv.reader(
+                        fd, delimiter=self.config.delimiter, dialect="strip"
+                    ),
+                )
+            )
+        return await self.parse_row(
+            row, self.classify_headers(fieldnames), key
+        )
 
     async def load_fd(self, fd):
         """
         Parses a CSV stream into Record instances
         """
+        if self.config.stream:
+            return
         async with self._open_csv(fd) as open_file:
             self.mem = open_file.write_out.get(self.config.tag, {})
         self.logger.debug("%r loaded %d records", self, len(self.mem))
@@ -206,7 +538,10 @@ class CSVSource(FileSource, MemorySource):
             open_file.write_out[self.config.tag].update(self.mem)
             # Bail if not last open source for this file
             if not (await open_file.dec()):
-                return
+                return False
+            if fd is None:
+                del self.OPEN_CSV_FILES[self.config.filename]
+                return False
             # Add our headers
             fieldnames = (
                 [] if not open_file.write_back_key else [self.config.key]
@@ -253,3 +588,4 @@ class CSVSource(FileSource, MemorySource):
             del self.OPEN_CSV_FILES[self.config.filename]
             self.logger.debug(f"{self.config.filename} written")
         self.logger.debug("%r saved %d records", self, len(self.mem))
+        return True
@@ -1,59 +1,162 @@
 """
 Expose Pandas DataFrame as DFFML Source
 """
-from typing import Dict, List, AsyncIterator
+import itertools
+from typing import Any, Dict, List, Tuple, Iterator, AsyncIterator
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
 
 
 from ..record import Record
 from ..base import config, field
 from ..util.entrypoint import entrypoint
 from ..util.net import DEFAULT_PROTOCOL_ALLOWLIST
-from .source import BaseSourceContext, BaseSource
+from .source import (
+    DEFAULT_BATCH_SIZE,
+    BaseSourceContext,
+    BaseSource,
+    RecordBatch,
+)
 
 
 class DataFrameSourceContext(BaseSourceContext):
+    """
+    Updates are kept until the context exits, or records are read within it,
+    and then written to the DataFrame one column at a time.
+    """
+
+    def __init__(self, parent: "DataFrameSource") -> None:
+        super().__init__(parent)
+        # Column values to write, by record key
+        self.pending: Dict[str, Dict[str, Any]] = {}
+
     async def update(self, record: Record):
         # Shorthand for DataFrame
         df = self.parent.config.dataframe
+        row = self.pending.setdefault(record.key, {})
         # Store feature data
         features = record.features()
         for col in df.columns:
             if col in features:
-                df.loc[record.key, col] = features[col]
+                row[col] = features[col]
         # Store prediction
         predictions = record.predictions()
         for col in self.parent.config.predictions:
             if col in predictions:
-                df.loc[record.key, col] = predictions[col]["value"]
+                row[col] = predictions[col]["value"]
+
+    def flush(self):
+        """
+        Write pending updates to the DataFrame
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        df = self.parent.config.dataframe
+        # Assign values of rows which exist with one assignment per column
+        columns: Dict[str, Tuple[List[Any], List[Any]]] = {}
+        new = {}
+        for key, row in pending.items():
+            label = self.parent.index_label(key)
+            if label is None:
+                new[key] = row
+                continue
+            for col, value in row.items():
+                labels, values = columns.setdefault(col, ([], []))
+                labels.append(label)
+                values.append(value)
+        for col, (labels, values) in columns.items():
+            df.loc[labels, col] = values
+        # Add rows which don't exist to the DataFrame itself, rather than a
+        # copy, so that whoever passed it in sees them
+        for col in dict.fromkeys(itertools.chain(*new.values())):
+            if col not in df.columns:
+                df[col] = float("nan")
+        for key, row in new.items():
+            df.loc[key] = [row.get(col, float("nan")) for col in df.columns]
 
     async def records(self) -> AsyncIterator[Record]:
-        for row in self.parent.config.dataframe.itertuples():
-            features = dict(row._asdict())
-            predictions = {
-                key: {"value": features[key]}
-                for key in self.parent.config.predictions
-            }
-            del features["Index"]
-            for key in predictions.keys():
-                if key in features:
-                    del features[key]
+        self.flush()
+        df = self.parent.config.dataframe
+        predictions = [
+            col for col in self.parent.config.predictions if col in df.columns
+        ]
+        features = [col for col in df.columns if col not in predictions]
+        # Convert each column to a list of Python objects at once rather than
+        # converting each row
+        for key, feature_values, prediction_values in zip(
+            map(str, df.index),
+            self.rows(df, features),
+            self.rows(df, predictions),
+        ):
             yield Record(
-                str(row.Index),
-                data={"features": features, "prediction": predictions},
+                key,
+                data={
+                    "features": dict(zip(features, feature_values)),
+                    "prediction": {
+                        col: {"value": value}
+                        for col, value in zip(predictions, prediction_values)
+                    },
+                },
             )
 
+    @staticmethod
+    def rows(df, columns: List[str]) -> Iterator[Tuple[Any, ...]]:
+        if not columns:
+            return itertools.repeat(())
+        return zip(*[df[col].tolist() for col in columns])
+
     async def record(self, key: str) -> Record:
-        data = self.parent.config.dataframe.iloc[int(key)]
+        self.flush()
+        label = self.parent.index_label(key)
+        if label is None:
+            return Record(key)
+        data = self.parent.config.dataframe.loc[label]
         predictions = {
-            key: data[key] for key in self.parent.config.predictions
+            col: {"value": value}
+            for col, value in data.items()
+            if col in self.parent.config.predictions
         }
         features = {
-            key: value for key in data.items() if key not in predictions
+            col: value
+            for col, value in data.items()
+            if col not in self.parent.config.predictions
         }
         return Record(
-            str(key), data={"features": features, "prediction": predictions},
+            key, data={"features": features, "prediction": predictions},
         )
 
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        self.flush()
+        df = self.parent.config.dataframe
+        # Prediction columns are not features
+        if not all(
+            feature in df.columns
+            and feature not in self.parent.config.predictions
+            for feature in features
+        ):
+            return
+        # Columns are already NumPy arrays, batches are slices (views) of them
+        columns = {feature: df[feature].to_numpy() for feature in features}
+        keys = list(map(str, df.index))
+        for start in range(0, len(df), batch_size):
+            stop = start + batch_size
+            yield RecordBatch(
+                keys[start:stop],
+                {
+                    feature: column[start:stop]
+                    for feature, column in columns.items()
+                },
+            )
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
 
 @config
 class DataFrameSourceConfig:
@@ -177,15 +280,11 @@ class DataFrameSource(BaseSource):
         super().__init__(config)
         # Create DataFrame if not given
         if self.config.dataframe is None:
-            try:
-                # Try import
-                import pandas
-            except (ModuleNotFoundError, ImportError) as error:
-                # If it fails say that pandas must be installed to create new
-                # DataFrames
+            # Say that pandas must be installed to create new DataFrames
+            if pandas is None:
                 raise PandasNotInstalled(
                     "Pandas is required to create new DataFrames. $ pip install pandas"
-                ) from error
+                )
             # TODO Modify this in line with changes for #1168
             if self.config.html is not None:
                 dataframes = pandas.read_html(self.config.html)
@@ -200,3 +299,19 @@ class DataFrameSource(BaseSource):
             else:
                 # Create empty DataFrame
                 self.config.dataframe = pandas.DataFrame()
+
+    def index_label(self, key: str):
+        """
+        Label in the index of the DataFrame of the row with the given record
+        key, or None. Keys are strings, labels of the default index are ints.
+        """
+        index = self.config.dataframe.index
+        if key in index:
+            return key
+        try:
+            label = int(key)
+        except ValueError:
+            return None
+        if str(label) == key and label in index:
+            return label
+        return None
@@ -1,10 +1,15 @@
 import collections
-from typing import Type, AsyncIterator, List
+from typing import Any, Type, AsyncIterator, Dict, List
 
 from ..base import config, BaseConfig
 from ..db.base import BaseDatabase, Condition
 from ..record import Record
-from ..source.source import BaseSource, BaseSourceContext
+from ..source.source import (
+    DEFAULT_BATCH_SIZE,
+    BaseSource,
+    BaseSourceContext,
+    RecordBatch,
+)
 from ..util.entrypoint import entrypoint
 
 
@@ -16,7 +21,11 @@ class DbSourceConfig(BaseConfig):
 
 
 class DbSourceContext(BaseSourceContext):
-    async def update(self, record: Record):
+    # Number of keys looked up per query by records_by_key. Kept under the
+    # default maximum number of bound parameters in SQLite.
+    KEYS_PER_QUERY = 500
+
+    def convert_to_row(self, record: Record) -> Dict[str, Any]:
         model_columns = self.parent.config.model_columns
         key_value_pairs = collections.OrderedDict()
         for key in model_columns:
@@ -41,17 +50,80 @@ class DbSourceContext(BaseSourceContext):
                     key_value_pairs[key] = 1
             else:
                 key_value_pairs[key] = record.data.__dict__[key]
+        return key_value_pairs
+
+    async def update(self, record: Record):
+        row = self.convert_to_row(record)
+        async with self.parent.db() as db_ctx:
+            await db_ctx.insert_or_update(self.parent.config.table_name, row)
+        self.logger.debug("update: %s", row)
+
+    async def update_many(self, records: List[Record]):
+        rows = list(map(self.convert_to_row, records))
         async with self.parent.db() as db_ctx:
-            await db_ctx.insert_or_update(
-                self.parent.config.table_name, key_value_pairs
+            await db_ctx.insert_or_update_many(
+                self.parent.config.table_name, rows
             )
-        self.logger.debug("update: %s", await self.record(record.key))
+        self.logger.debug("update_many: %d records", len(rows))
 
     async def records(self) -> AsyncIterator[Record]:
         async with self.parent.db() as db_ctx:
             async for result in db_ctx.lookup(self.parent.config.table_name):
                 yield self.convert_to_record(result)
 
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        columns = ["feature_" + feature for feature in features]
+        if not all(
+            column in self.parent.config.model_columns for column in columns
+        ):
+            async for batch in super().batches(features, batch_size):
+                yield batch
+            return
+        # Only select the columns of the requested features, from rows where
+        # none of them are NULL, as records without a value for a feature
+        # don't have that feature
+        batch = RecordBatch([], {feature: [] for feature in features})
+        async with self.parent.db() as db_ctx:
+            async for row in db_ctx.lookup(
+                self.parent.config.table_name,
+                cols=["key"] + columns,
+                conditions=[
+                    [Condition(column, "IS NOT", None)] for column in columns
+                ],
+            ):
+                batch.keys.append(str(row["key"]))
+                for feature, column in zip(features, columns):
+                    batch.features[feature].append(row[column])
+                if len(batch.keys) == batch_size:
+                    yield batch.arrays()
+                    batch = RecordBatch(
+                        [], {feature: [] for feature in features}
+                    )
+        if batch.keys:
+            yield batch.arrays()
+
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        found = {key: Record(key) for key in keys}
+        keys = list(found.keys())
+        async with self.parent.db() as db_ctx:
+            for i in range(0, len(keys), self.KEYS_PER_QUERY):
+                # Conditions in the same list are joined with OR
+                async for row in db_ctx.lookup(
+                    self.parent.config.table_name,
+                    cols=None,
+                    conditions=[
+                        [
+                            Condition("key", "=", key)
+                            for key in keys[i : i + self.KEYS_PER_QUERY]
+                        ]
+                    ],
+                ):
+                    record = self.convert_to_record(row)
+                    found[record.key].merge(record)
+        return found
+
     def convert_to_record(self, result):
         modified_record = {
             "key": "",
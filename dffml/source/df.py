@@ -1,5 +1,5 @@
 import pathlib
-from typing import Type, AsyncIterator, Dict, List, Any
+from typing import Type, AsyncIterator, Dict, List, Any, Tuple
 
 from dffml.base import config, BaseConfig, field
 from dffml.configloader.configloader import BaseConfigLoader
@@ -123,6 +123,9 @@ class DataFlowSourceContext(BaseSourceContext):
     async def update(self, record: Record):
         await self.sctx.update(record)
 
+    async def update_many(self, records: List[Record]):
+        await self.sctx.update_many(records)
+
     # TODO Implement this method. We forgot to implement it when we initially
     # added the DataFlowSourceContext
     async def record(self, key: str) -> AsyncIterator[Record]:
@@ -142,13 +145,37 @@ class DataFlowSourceContext(BaseSourceContext):
                     ctx.record.evaluated(result)
                 return ctx.record
 
-    async def records(self) -> AsyncIterator[Record]:
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        if self.parent.config.all_for_single or not keys:
+            return await super().records_by_key(keys)
+        records = await self.sctx.records_by_key(keys)
+        # Run the dataflow once for all the records
+        found = {}
         async for ctx, result in self.octx.run(
             {
                 RecordInputSetContext(record): await self.input_set(record)
-                async for record in self.sctx.records()
+                for record in records.values()
             },
             strict=not self.parent.config.no_strict,
+        ):
+            if result:
+                ctx.record.evaluated(result)
+            found[ctx.record.key] = ctx.record
+        # Contexts complete in any order. Those which failed when no_strict is
+        # set are never yielded, their records are left as the source has them
+        return {key: found.get(key, records[key]) for key in keys}
+
+    async def record_input_sets(
+        self,
+    ) -> AsyncIterator[Tuple[RecordInputSetContext, List[Input]]]:
+        async for record in self.sctx.records():
+            yield RecordInputSetContext(record), await self.input_set(record)
+
+    async def records(self) -> AsyncIterator[Record]:
+        # Stream records into the orchestrator rather than creating every
+        # context up front
+        async for ctx, result in self.octx.run(
+            self.record_input_sets(), strict=not self.parent.config.no_strict,
         ):
             if result:
                 ctx.record.evaluated(result)
@@ -4,15 +4,19 @@ import os
 import io
 import abc
 import bz2
+import json
 import gzip
 import lzma
 import errno
 import zipfile
 from contextlib import contextmanager
 import pathlib
+from typing import List
 
-from ..base import config
+from ..base import config, field
+from ..record import Record
 from .source import BaseSource
+from .memory import MemorySourceContext
 from ..util.entrypoint import entrypoint
 
 
@@ -22,12 +26,46 @@ class FileSourceConfig:
     tag: str = "untagged"
     readwrite: bool = False
     allowempty: bool = False
+    journal: bool = field(
+        "Append records to a JSON lines journal next to the file as they are "
+        "updated. The journal is replayed when the file is opened",
+        default=False,
+    )
+    keep_journal: bool = field(
+        "Don't rewrite the file on close, leave the journal to be replayed on "
+        "open. The file is rewritten by the next source to close it without "
+        "this set",
+        default=False,
+    )
+
+
+class FileSourceContext(MemorySourceContext):
+    """
+    Context of file sources which keep their records in memory. Updated
+    records are appended to the journal, if the source has one open.
+    """
+
+    async def update(self, record: Record):
+        await super().update(record)
+        self.parent.journal_records([record])
+
+    async def update_many(self, records: List[Record]):
+        for record in records:
+            await super().update(record)
+        self.parent.journal_records(records)
 
 
 @entrypoint("file")
 class FileSource(BaseSource):
     """
     FileSource reads and write from a file on open / close.
+
+    In journal mode updated records are also appended to a journal file as
+    they are updated, so that progress is kept if the process dies before the
+    file is rewritten on close. Subclasses which keep records in memory use
+    :py:class:`FileSourceContext` to write the journal. An existing journal is
+    replayed whenever the file is opened, and removed once the file is
+    rewritten.
     """
 
     CONFIG = FileSourceConfig
@@ -41,6 +79,7 @@ class FileSource(BaseSource):
 
         if isinstance(getattr(self.config, "filename", None), str):
             self.config.filename = pathlib.Path(self.config.filename)
+        self.journal_fd = None
 
     async def __aenter__(self) -> "BaseSourceContext":
         await self._open()
@@ -62,52 +101,178 @@ class FileSource(BaseSource):
                     + "initializing memory to empty dict"
                 )
                 self.mem = await self._empty_file_init()
-                return
             else:
                 raise FileNotFoundError(
                     errno.ENOENT,
                     os.strerror(errno.ENOENT),
                     self.config.filename,
                 )
+        else:
+            with self.read_opener() as fd:
+                await self.load_fd(fd)
+        # Updates may have been left in the journal by a source which had it
+        # open, whether or not this one does
+        if self.journal_path().is_file():
+            if self.keeps_records_in_memory():
+                self.replay_journal()
+            else:
+                self.logger.warning(
+                    "%s: not replaying journal, updates in it are missing",
+                    self.journal_path(),
+                )
+        if getattr(self.config, "journal", False) and self.config.readwrite:
+            self.journal_fd = self.open_journal()
+
+    def keeps_records_in_memory(self) -> bool:
+        """
+        If the source's records are kept in memory by
+        :py:class:`FileSourceContext`, where the journal can be replayed and
+        which ``dump_fd`` can be told are closed without writing
+        """
+        return issubclass(self.CONTEXT, FileSourceContext)
+
+    def read_opener(self):
+        """
+        Open the file for reading, decompressing it based on its suffix
+        """
         if self.config.filename.suffix == ".gz":
-            opener = gzip.open(self.config.filename, self.READMODE_COMPRESSED)
+            return gzip.open(self.config.filename, self.READMODE_COMPRESSED)
         elif self.config.filename.suffix == ".bz2":
-            opener = bz2.open(self.config.filename, self.READMODE_COMPRESSED)
+            return bz2.open(self.config.filename, self.READMODE_COMPRESSED)
         elif (
             self.config.filename.suffix == ".xz"
             or self.config.filename.suffix == ".lzma"
         ):
-            opener = lzma.open(self.config.filename, self.READMODE_COMPRESSED)
+            return lzma.open(self.config.filename, self.READMODE_COMPRESSED)
         elif self.config.filename.suffix == ".zip":
-            opener = self.zip_opener_helper()
-        else:
-            opener = open(self.config.filename, self.READMODE)
-        with opener as fd:
-            await self.load_fd(fd)
+            return self.zip_opener_helper()
+        return open(self.config.filename, self.READMODE)
+
+    def write_opener(self, filename: pathlib.Path = None):
+        """
+        Open a file for writing, compressing it based on the suffix of the
+        source's file. Defaults to the source's file.
+        """
+        if self.config.filename.suffix == ".zip":
+            if filename is None:
+                return self.zip_closer_helper()
+            return self.zip_closer_helper(filename)
+        if filename is None:
+            filename = self.config.filename
+        if self.config.filename.suffix == ".gz":
+            return gzip.open(filename, self.WRITEMODE_COMPRESSED)
+        elif self.config.filename.suffix == ".bz2":
+            return bz2.open(filename, self.WRITEMODE_COMPRESSED)
+        elif (
+            self.config.filename.suffix == ".xz"
+            or self.config.filename.suffix == ".lzma"
+        ):
+            return lzma.open(filename, self.WRITEMODE_COMPRESSED)
+        return open(filename, self.WRITEMODE, newline="")
 
     async def _close(self):
-        if self.config.readwrite:
-            if self.config.filename.suffix == ".gz":
-                close = gzip.open(
-                    self.config.filename, self.WRITEMODE_COMPRESSED
-                )
-            elif self.config.filename.suffix == ".bz2":
-                close = bz2.open(
-                    self.config.filename, self.WRITEMODE_COMPRESSED
-                )
-            elif (
-                self.config.filename.suffix == ".xz"
-                or self.config.filename.suffix == ".lzma"
+        if not self.config.readwrite:
+            # Otherwise the next source to close the file wouldn't write it,
+            # thinking this one still had it open
+            if self.keeps_records_in_memory():
+                await self.dump_fd(None)
+            return
+        if self.journal_fd is None:
+            with self.write_opener() as fd:
+                written = await self.dump_fd(fd)
+            # The replayed journal is in the file now, don't replay it over
+            # later changes
+            if (
+                written
+                and self.keeps_records_in_memory()
+                and self.journal_path().is_file()
             ):
-                close = lzma.open(
-                    self.config.filename, self.WRITEMODE_COMPRESSED
+                self.journal_path().unlink()
+            return
+        self.journal_fd.close()
+        self.journal_fd = None
+        if self.config.keep_journal:
+            # Only the last source to close the file would write it
+            await self.dump_fd(None)
+            return
+        # Write to a new file and move it into place once complete, so that a
+        # crash while compacting leaves the file and journal as they were
+        compacted = self.config.filename.with_name(
+            self.config.filename.name + ".compact"
+        )
+        with self.write_opener(compacted) as fd:
+            written = await self.dump_fd(fd)
+        if not written:
+            compacted.unlink()
+            return
+        os.replace(compacted, self.config.filename)
+        self.journal_path().unlink()
+        self.logger.debug("%s compacted", self.config.filename)
+
+    def journal_path(self) -> pathlib.Path:
+        return self.config.filename.with_name(
+            self.config.filename.name + ".journal"
+        )
+
+    def open_journal(self):
+        """
+        Open the journal for appending
+        """
+        journal_fd = open(self.journal_path(), "a")
+        # End an incomplete last entry so that it doesn't run into the next
+        if journal_fd.tell():
+            with open(self.journal_path(), "rb") as fd:
+                fd.seek(-1, os.SEEK_END)
+                if fd.read(1) != b"\n":
+                    journal_fd.write("\n")
+        return journal_fd
+
+    def journal_records(self, records: List[Record]):
+        """
+        Append records to the journal, if open
+        """
+        if self.journal_fd is None:
+            return
+        for record in records:
+            self.journal_fd.write(
+                json.dumps(
+                    {
+                        "tag": self.config.tag,
+                        "key": record.key,
+                        "data": record.dict(),
+                    }
                 )
-            elif self.config.filename.suffix == ".zip":
-                close = self.zip_closer_helper()
-            else:
-                close = open(self.config.filename, self.WRITEMODE, newline="")
-            with close as fd:
-                await self.dump_fd(fd)
+                + "\n"
+            )
+        self.journal_fd.flush()
+
+    def replay_journal(self):
+        """
+        Load records with the source's tag from the journal into memory. Later
+        entries replace earlier ones.
+        """
+        if not self.journal_path().is_file():
+            return
+        replayed = 0
+        with open(self.journal_path()) as fd:
+            for line in fd:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line is incomplete if the process died writing it
+                    self.logger.warning(
+                        "%s: skipping incomplete entry", self.journal_path()
+                    )
+                    continue
+                if entry["tag"] != self.config.tag:
+                    continue
+                self.mem[entry["key"]] = Record(
+                    entry["key"], data=entry["data"]
+                )
+                replayed += 1
+        self.logger.debug(
+            "%s replayed %d records", self.journal_path(), replayed
+        )
 
     @contextmanager
     def zip_opener_helper(self):
@@ -119,9 +284,11 @@ class FileSource(BaseSource):
                     yield fd
 
     @contextmanager
-    def zip_closer_helper(self):
+    def zip_closer_helper(self, filename: pathlib.Path = None):
+        if filename is None:
+            filename = self.config.filename
         with zipfile.ZipFile(
-            self.config.filename, self.WRITEMODE, compression=zipfile.ZIP_BZIP2
+            filename, self.WRITEMODE, compression=zipfile.ZIP_BZIP2
         ) as archive:
             with archive.open(
                 self.__class__.__qualname__,
@@ -137,7 +304,10 @@ class FileSource(BaseSource):
 
     @abc.abstractmethod
     async def dump_fd(self, fd):
-        pass  # pragma: no cover
+        """
+        Write records to fd. Should return True if written. If fd is None
+        nothing is written, only the source is marked as closed.
+        """
 
 
 @config
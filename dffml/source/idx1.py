@@ -3,14 +3,34 @@
 """
 Loads records from an IDX1 file
 """
+import io
+import mmap
 import struct
+from typing import AsyncIterator, List
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 from ..record import Record
 from ..base import config, field
-from .memory import MemorySource
+from .memory import MemorySource, MemorySourceContext
+from .source import DEFAULT_BATCH_SIZE, BaseSourceContext, RecordBatch
 from .file import BinaryFileSource
 from ..util.entrypoint import entrypoint
 
+# struct format characters of IDX data types, by the type code in the third
+# byte of the magic number. All values are stored big endian.
+IDX_TYPES = {
+    0x08: "B",
+    0x09: "b",
+    0x0B: "h",
+    0x0C: "i",
+    0x0D: "f",
+    0x0E: "d",
+}
+
 
 @config
 class IDXSourceConfig:
@@ -24,33 +44,162 @@ class IDX1SourceConfig(IDXSourceConfig):
     pass
 
 
+class IDXSourceContext(MemorySourceContext):
+    """
+    Creates records from the mapped file as they are requested. Records which
+    have been updated are kept in memory.
+    """
+
+    async def records(self) -> AsyncIterator[Record]:
+        for i in range(0, self.parent.size):
+            key = str(i)
+            if key in self.parent.mem:
+                yield self.parent.mem[key]
+            else:
+                yield self.parent.idx_record(i)
+        for key, record in self.parent.mem.items():
+            if self.parent.idx_index(key) is None:
+                yield record
+
+    async def record(self, key: str) -> Record:
+        if key in self.parent.mem:
+            return self.parent.mem[key]
+        i = self.parent.idx_index(key)
+        if i is None:
+            return Record(key)
+        return self.parent.idx_record(i)
+
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        # Updated records may have other features, batch them from records()
+        if self.parent.mem or features != [self.parent.config.feature]:
+            async for batch in BaseSourceContext.batches(
+                self, features, batch_size
+            ):
+                yield batch
+            return
+        for start in range(0, self.parent.size, batch_size):
+            stop = min(start + batch_size, self.parent.size)
+            yield RecordBatch(
+                list(map(str, range(start, stop))),
+                {features[0]: self.parent.idx_slice(start, stop)},
+            )
+
+
 @entrypoint("idx1")
 class IDX1Source(BinaryFileSource, MemorySource):
     """
     Source to read files in IDX1 format (such as MNIST digit label dataset).
+
+    Uncompressed files are memory mapped, compressed files are decompressed
+    into memory once. Records are created as they are accessed, the feature
+    data of IDX3 records is a tuple. If NumPy is installed, feature data of
+    batches are NumPy arrays.
     """
 
     CONFIG = IDX1SourceConfig
+    CONTEXT = IDXSourceContext
 
-    async def load_fd(self, xfile):
-        # Reading the binary datafile's details
-        magic, size = struct.unpack(">II", xfile.read(8))
+    def __init__(self, config):
+        super().__init__(config)
+        self.buffer = b""
+        self.array = None
+        self.fmt = "B"
+        self.offset = 0
+        self.size = 0
+        self.inner = 1
+        self.entry = struct.Struct(">B")
 
-        # Reading the rest of binary datafile one byte at a time
+    async def _empty_file_init(self):
+        self.buffer = b""
+        self.size = 0
+        return {}
+
+    async def load_fd(self, xfile):
         self.mem = {}
-        for i in range(size):
-            self.mem[str(i)] = Record(
-                str(i),
-                data={
-                    "features": {
-                        self.config.feature: struct.unpack(
-                            ">b", xfile.read(1)
-                        )[0]
-                    }
-                },
+        # Map uncompressed files rather than reading them
+        if isinstance(xfile, io.BufferedReader):
+            try:
+                self.buffer = mmap.mmap(
+                    xfile.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                # Empty files can't be mapped
+                self.buffer = xfile.read()
+        else:
+            self.buffer = xfile.read()
+        # Magic number is two zero bytes, the type of the data, and the number
+        # of dimensions. Followed by the size of each dimension.
+        _, data_type, ndims = struct.unpack_from(">HBB", self.buffer, 0)
+        dims = struct.unpack_from(f">{ndims}I", self.buffer, 4)
+        self.fmt = IDX_TYPES[data_type]
+        self.offset = 4 + 4 * ndims
+        self.size = dims[0]
+        self.inner = 1
+        for dim in dims[1:]:
+            self.inner *= dim
+        # Unpacks the data of one entry
+        self.entry = struct.Struct(f">{self.inner}{self.fmt}")
+        self.array = None
+        if numpy is not None:
+            self.array = numpy.frombuffer(
+                self.buffer,
+                dtype=numpy.dtype(">" + self.fmt),
+                count=self.size * self.inner,
+                offset=self.offset,
             )
+            if self.inner != 1:
+                self.array = self.array.reshape(self.size, self.inner)
+        self.logger.debug("%r loaded %d records", self, self.size)
+
+    async def _close(self):
+        await super()._close()
+        # Leave closing the mapping to the garbage collector
+        self.buffer = b""
+        self.array = None
+
+    def idx_index(self, key: str):
+        """
+        Index of the entry in the file with the given key, or None
+        """
+        try:
+            i = int(key)
+        except ValueError:
+            return None
+        if str(i) != key or not 0 <= i < self.size:
+            return None
+        return i
+
+    def idx_value(self, i: int):
+        """
+        Data of the entry at the given index
+        """
+        # Unpacking straight from the file is quicker than going through NumPy
+        values = self.entry.unpack_from(
+            self.buffer, self.offset + i * self.entry.size
+        )
+        if self.inner == 1:
+            return values[0]
+        return values
+
+    def idx_slice(self, start: int, stop: int):
+        """
+        Data of the entries from start to stop
+        """
+        if self.array is not None:
+            batch = self.array[start:stop]
+            # Single bytes have no byte order, give a view of the file data
+            if batch.dtype.itemsize == 1 or batch.dtype.isnative:
+                return batch
+            # Copy out of the big endian file data
+            return batch.astype(batch.dtype.newbyteorder("="))
+        return [self.idx_value(i) for i in range(start, stop)]
 
-        self.logger.debug("%r loaded %d records", self, len(self.mem))
+    def idx_record(self, i: int) -> Record:
+        return Record(
+            str(i), data={"features": {self.config.feature: self.idx_value(i)}}
+        )
 
     async def dump_fd(self, fd):
         raise NotImplementedError
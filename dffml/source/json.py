@@ -8,7 +8,7 @@ from typing import Dict
 
 from ..record import Record
 from .memory import MemorySource
-from .file import FileSource, FileSourceConfig
+from .file import FileSource, FileSourceConfig, FileSourceContext
 from ..util.entrypoint import entrypoint
 
 from .log import LOGGER
@@ -44,6 +44,7 @@ class JSONSource(FileSource, MemorySource):
     """
 
     CONFIG = JSONSourceConfig
+    CONTEXT = FileSourceContext
     OPEN_JSON_FILES: Dict[str, OpenJSONFile] = {}
     OPEN_JSON_FILES_LOCK: asyncio.Lock = asyncio.Lock()
 
@@ -84,8 +85,12 @@ class JSONSource(FileSource, MemorySource):
                 record.key: record.dict() for record in self.mem.values()
             }
             self.logger.debug(f"{self.config.filename} updated")
-            if await self.OPEN_JSON_FILES[self.config.filename].dec():
-                del self.OPEN_JSON_FILES[self.config.filename]
-                json.dump(records, fd)
-                self.logger.debug(f"{self.config.filename} written")
+            if not await self.OPEN_JSON_FILES[self.config.filename].dec():
+                return False
+            del self.OPEN_JSON_FILES[self.config.filename]
+            if fd is None:
+                return False
+            json.dump(records, fd)
+            self.logger.debug(f"{self.config.filename} written")
         LOGGER.debug("%r saved %d records", self, len(self.mem))
+        return True
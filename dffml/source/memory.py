@@ -7,7 +7,13 @@ from typing import Dict, List, AsyncIterator
 
 from ..base import config, field
 from ..record import Record
-from .source import BaseSourceContext, BaseSource
+from .source import (
+    DEFAULT_BATCH_SIZE,
+    BaseSourceContext,
+    BaseSource,
+    RecordBatch,
+    iter_record_batches,
+)
 from ..util.entrypoint import entrypoint
 
 
@@ -22,6 +28,14 @@ class MemorySourceContext(BaseSourceContext):
     async def record(self, key: str) -> Record:
         return self.parent.mem.get(key, Record(key))
 
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        for batch in iter_record_batches(
+            self.parent.mem.values(), features, batch_size
+        ):
+            yield batch
+
 
 @config
 class MemorySourceConfig:
@@ -6,7 +6,23 @@ source project's source URL.
 """
 import abc
 import unittest
-from typing import AsyncIterator, List, Optional, Callable
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 from ..base import (
     BaseDataFlowFacilitatorObjectContext,
@@ -22,6 +38,10 @@ from ..util.entrypoint import base_entry_point
 from .log import LOGGER
 
 
+# Number of records in each batch yielded by batches() if not given
+DEFAULT_BATCH_SIZE = 1024
+
+
 class NoRecordsWithMatchingFeatures(Exception):
     """
     Raised when :py:func:`SourcesContext.with_features` was called but no
@@ -41,6 +61,91 @@ class NoRecordsWithMatchingFeaturesHelper(unittest.TestCase):
         super().__init__(methodName="defaultTestResult")
 
 
+def column_array(column: Sequence[Any]) -> Sequence[Any]:
+    """
+    Column of feature data as a NumPy array, or unchanged if NumPy isn't
+    installed. Columns of values NumPy can't give one type, such as mixed
+    types or array features of different shapes, become arrays of objects.
+    """
+    if numpy is None or isinstance(column, numpy.ndarray):
+        return column
+    # NumPy would convert mixed types to one type, changing the values
+    if (
+        len(set(map(type, column))) <= 1
+        and len(set(map(numpy.shape, column))) <= 1
+    ):
+        array = numpy.asarray(column)
+        if not array.dtype.hasobject:
+            return array
+    array = numpy.empty(len(column), dtype=object)
+    for i, value in enumerate(column):
+        array[i] = value
+    return array
+
+
+class RecordBatch(NamedTuple):
+    """
+    Feature data for a group of records, stored by column rather than by
+    record. Columns are NumPy arrays if NumPy is installed, otherwise lists.
+    """
+
+    keys: List[str]
+    features: Dict[str, Sequence[Any]]
+
+    def arrays(self) -> "RecordBatch":
+        """
+        Batch with each column as a NumPy array, see :py:func:`column_array`
+        """
+        return RecordBatch(
+            self.keys,
+            {
+                feature: column_array(column)
+                for feature, column in self.features.items()
+            },
+        )
+
+
+def _add_to_batch(batch: RecordBatch, record: Record, features: List[str]):
+    record_features = record.features()
+    if not all(feature in record_features for feature in features):
+        return
+    batch.keys.append(record.key)
+    for feature in features:
+        batch.features[feature].append(record_features[feature])
+
+
+def iter_record_batches(
+    records: Iterable[Record], features: List[str], batch_size: int
+) -> Iterator[RecordBatch]:
+    """
+    Group the records which have all of the given features into batches
+    """
+    batch = RecordBatch([], {feature: [] for feature in features})
+    for record in records:
+        _add_to_batch(batch, record, features)
+        if len(batch.keys) == batch_size:
+            yield batch.arrays()
+            batch = RecordBatch([], {feature: [] for feature in features})
+    if batch.keys:
+        yield batch.arrays()
+
+
+async def record_batches(
+    records: AsyncIterator[Record], features: List[str], batch_size: int
+) -> AsyncIterator[RecordBatch]:
+    """
+    Group the records which have all of the given features into batches
+    """
+    batch = RecordBatch([], {feature: [] for feature in features})
+    async for record in records:
+        _add_to_batch(batch, record, features)
+        if len(batch.keys) == batch_size:
+            yield batch.arrays()
+            batch = RecordBatch([], {feature: [] for feature in features})
+    if batch.keys:
+        yield batch.arrays()
+
+
 class BaseSourceContext(BaseDataFlowFacilitatorObjectContext):
     def __init__(self, parent: "BaseSource") -> None:
         self.parent = parent
@@ -71,6 +176,32 @@ class BaseSourceContext(BaseDataFlowFacilitatorObjectContext):
         {'key': 'one', 'features': {'feed': 'face'}, 'extra': {}}
         """
 
+    async def update_many(self, records: List[Record]):
+        """
+        Updates many records at once. Sources which have to make a round trip
+        for each call to :py:meth:`update` override this to write all the
+        records at once.
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> from dffml import *
+        >>>
+        >>> async def main():
+        ...     async with MemorySource(records=[]) as source:
+        ...         async with source() as ctx:
+        ...             await ctx.update_many([Record("one"), Record("two")])
+        ...             async for record in ctx.records():
+        ...                 print(record.key)
+        >>>
+        >>> asyncio.run(main())
+        one
+        two
+        """
+        for record in records:
+            await self.update(record)
+
     @abc.abstractmethod
     async def records(self) -> AsyncIterator[Record]:
         """
@@ -121,6 +252,65 @@ class BaseSourceContext(BaseDataFlowFacilitatorObjectContext):
         {'key': 'one', 'extra': {}}
         """
 
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        """
+        Get many records at once, by key. Sources which have to make a round
+        trip for each call to :py:meth:`record` override this to look up all
+        the keys at once.
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> from dffml import *
+        >>>
+        >>> async def main():
+        ...     async with MemorySource(records=[Record("example", data=dict(features=dict(dead="beef")))]) as source:
+        ...         async with source() as ctx:
+        ...             records = await ctx.records_by_key(["example", "one"])
+        ...             for key, record in records.items():
+        ...                 print(key, record.features())
+        >>>
+        >>> asyncio.run(main())
+        example {'dead': 'beef'}
+        one {}
+        """
+        return {key: await self.record(key) for key in keys}
+
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        """
+        Feature data of records which have all of the given features, in
+        batches of up to batch_size records stored by column. Columns are
+        NumPy arrays if NumPy is installed. Sources override this to create
+        batches without creating a Record for each row.
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> from dffml import *
+        >>>
+        >>> async def main():
+        ...     async with MemorySource(records=[
+        ...         Record(str(i), data=dict(features=dict(x=i, y=i * 2)))
+        ...         for i in range(0, 5)
+        ...     ]) as source:
+        ...         async with source() as ctx:
+        ...             async for batch in ctx.batches(["x", "y"], 2):
+        ...                 print(batch.keys, batch.features["y"].tolist())
+        >>>
+        >>> asyncio.run(main())
+        ['0', '1'] [0, 2]
+        ['2', '3'] [4, 6]
+        ['4'] [8]
+        """
+        async for batch in record_batches(
+            self.records(), features, batch_size
+        ):
+            yield batch
+
 
 @base_entry_point("dffml.source", "source")
 class BaseSource(BaseDataFlowFacilitatorObject):
@@ -142,22 +332,62 @@ class SourcesContext(AsyncContextManagerListContext):
         for source in self:
             await source.update(record)
 
+    async def update_many(self, records: List[Record]):
+        """
+        Updates many records in all sources
+        """
+        LOGGER.debug("Updating %d records", len(records))
+        for source in self:
+            await source.update_many(records)
+
     async def records(
-        self, validation: Optional[Callable[[Record], bool]] = None
+        self,
+        validation: Optional[Callable[[Record], bool]] = None,
+        *,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
     ) -> AsyncIterator[Record]:
         """
-        Retrieves records from all sources
+        Retrieves records from all sources. Records from the first source are
+        merged with records of the same key from the other sources, which are
+        looked up chunk_size keys at a time.
         """
         for source in self:
+            # Nothing to join, yield records as soon as the source does
+            if not self.data[1:]:
+                async for record in source.records():
+                    if validation is None or validation(record):
+                        yield record
+                break
+            chunk = []
             async for record in source.records():
-                # NOTE In Python 3.7.3 self[1:] works, however in Python >
-                # 3.7.3 only self.data works
-                for other_source in self.data[1:]:
-                    record.merge(await other_source.record(record.key))
+                chunk.append(record)
+                if len(chunk) < chunk_size:
+                    continue
+                for record in await self.join(chunk):
+                    if validation is None or validation(record):
+                        yield record
+                chunk = []
+            for record in await self.join(chunk):
                 if validation is None or validation(record):
                     yield record
             break
 
+    async def join(self, records: List[Record]) -> List[Record]:
+        """
+        Merge records from the first source with records of the same key
+        from all the other sources
+        """
+        # NOTE In Python 3.7.3 self[1:] works, however in Python >
+        # 3.7.3 only self.data works
+        if not records or not self.data[1:]:
+            return records
+        keys = [record.key for record in records]
+        for other_source in self.data[1:]:
+            others = await other_source.records_by_key(keys)
+            for record in records:
+                record.merge(others[record.key])
+        return records
+
     async def record(self, key: str):
         """
         Retrieve and or register record will all sources
@@ -167,6 +397,38 @@ class SourcesContext(AsyncContextManagerListContext):
             record.merge(await source.record(key))
         return record
 
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        """
+        Retrieve many records from all sources at once
+        """
+        records = {key: Record(key) for key in keys}
+        for source in self:
+            found = await source.records_by_key(list(records.keys()))
+            for key, record in records.items():
+                record.merge(found[key])
+        return records
+
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        """
+        Feature data of records which have all of the given features, in
+        batches stored by column. If there is only one source its own
+        batches() is used, otherwise records are merged across sources.
+        """
+        if len(self.data) == 1:
+            found = False
+            async for batch in self.data[0].batches(features, batch_size):
+                found = True
+                yield batch
+            if found:
+                return
+        # Merge records across sources, raises if none had the features
+        async for batch in record_batches(
+            self.with_features(features), features, batch_size
+        ):
+            yield batch
+
     async def with_features(
         self, features: List[str]
     ) -> AsyncIterator[Record]:
@@ -222,6 +484,15 @@ class ValidationSourcesContext(SourcesContext):
             ):
                 yield record
 
+    async def batches(
+        self, features: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[RecordBatch]:
+        # Batches must go through records() to be validated
+        async for batch in record_batches(
+            self.with_features(features), features, batch_size
+        ):
+            yield batch
+
 
 class ValidationSources(Sources):
     """
@@ -14,6 +14,9 @@ class WrapperSourceContext(BaseSourceContext):
     async def update(self, record: Record):
         await self.sctx.update(record)
 
+    async def update_many(self, records: List[Record]):
+        await self.sctx.update_many(records)
+
     async def record(self, key: str) -> AsyncIterator[Record]:
         return await self.sctx.record(key)
 
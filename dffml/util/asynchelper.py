@@ -11,6 +11,8 @@ from contextlib import AsyncExitStack
 from typing import (
     Dict,
     Any,
+    List,
+    AsyncIterable,
     AsyncIterator,
     Tuple,
     Type,
@@ -132,6 +134,41 @@ async def concurrently(
                 task.exception()
 
 
+async def batched(
+    iterable: AsyncIterable[Any], size: int
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield lists of up to ``size`` items from an async iterable, in order.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from dffml import *
+    >>>
+    >>> async def numbers():
+    ...     for i in range(0, 5):
+    ...         yield i
+    >>>
+    >>> async def main():
+    ...     async for batch in batched(numbers(), 2):
+    ...         print(batch)
+    >>>
+    >>> asyncio.run(main())
+    [0, 1]
+    [2, 3]
+    [4]
+    """
+    batch = []
+    async for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 async def aenter_stack(
     obj: Any,
     context_managers: Dict[str, AsyncContextManager],
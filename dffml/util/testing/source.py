@@ -93,6 +93,123 @@ class SourceTest(abc.ABC):
                         records[empty_key].features(), empty_record.features()
                     )
 
+    async def test_batches(self):
+        features = ["PetalLength", "PetalWidth", "SepalLength", "SepalWidth"]
+        records = [
+            Record(
+                f"batch_{i}",
+                data={
+                    "features": {
+                        feature: float(i * (j + 1))
+                        for j, feature in enumerate(features)
+                    }
+                },
+            )
+            for i in range(0, 5)
+        ]
+
+        source = await self.setUpSource()
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                for record in records:
+                    await sourceContext.update(record)
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                found = {}
+                async for batch in sourceContext.batches(features[:2], 2):
+                    self.assertLessEqual(len(batch.keys), 2)
+                    self.assertEqual(set(batch.features), set(features[:2]))
+                    for i, key in enumerate(batch.keys):
+                        found[key] = {
+                            feature: batch.features[feature][i]
+                            for feature in features[:2]
+                        }
+                for record in records:
+                    self.assertEqual(
+                        found[record.key], record.features(features[:2])
+                    )
+                with self.subTest(missing_feature=True):
+                    async for batch in sourceContext.batches(
+                        features[:1] + ["missing"]
+                    ):
+                        self.fail(f"Records do not have feature: {batch}")
+
+    async def test_records_by_key(self):
+        records = [
+            Record(
+                f"by_key_{i}",
+                data={
+                    "features": {
+                        "PetalLength": float(i),
+                        "PetalWidth": float(i),
+                        "SepalLength": float(i),
+                        "SepalWidth": float(i),
+                    }
+                },
+            )
+            for i in range(0, 3)
+        ]
+        source = await self.setUpSource()
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                for record in records:
+                    await sourceContext.update(record)
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                found = await sourceContext.records_by_key(
+                    ["by_key_2", "by_key_0", "by_key_missing"]
+                )
+                self.assertEqual(
+                    set(found), {"by_key_2", "by_key_0", "by_key_missing"}
+                )
+                for i in [0, 2]:
+                    self.assertEqual(
+                        found[f"by_key_{i}"].features(), records[i].features()
+                    )
+                self.assertFalse(found["by_key_missing"].features())
+
+    async def test_update_many(self):
+        def make_record(i, value):
+            return Record(
+                f"many_{i}",
+                data={
+                    "features": {
+                        "PetalLength": float(i),
+                        "PetalWidth": float(i),
+                        "SepalLength": float(i),
+                        "SepalWidth": float(i),
+                    },
+                    "prediction": {
+                        "target_name": RecordPrediction(
+                            value=value, confidence=0.5
+                        )
+                    },
+                },
+            )
+
+        source = await self.setUpSource()
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                await sourceContext.update_many(
+                    [make_record(i, "before") for i in range(0, 3)]
+                )
+        async with source as testSource:
+            # Existing records are updated along with new ones
+            async with testSource() as sourceContext:
+                await sourceContext.update_many(
+                    [make_record(i, "after") for i in range(1, 4)]
+                )
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                for i, value in enumerate(["before"] + ["after"] * 3):
+                    record = await sourceContext.record(f"many_{i}")
+                    self.assertEqual(
+                        record.features(), make_record(i, value).features()
+                    )
+                    self.assertEqual(
+                        record.prediction("target_name")["value"], value
+                    )
+
 
 class FileSourceTest(SourceTest):
     """
@@ -111,6 +228,86 @@ class FileSourceTest(SourceTest):
                     )
                     await super().test_update()
 
+    async def test_batches(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            self.testfile = os.path.join(testdir, str(random.random()))
+            await super().test_batches()
+
+    async def test_records_by_key(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            self.testfile = os.path.join(testdir, str(random.random()))
+            await super().test_records_by_key()
+
+    async def test_update_many(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            self.testfile = os.path.join(testdir, str(random.random()))
+            await super().test_update_many()
+
+    async def test_journal(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            self.testfile = os.path.join(testdir, str(random.random()))
+            journal = self.testfile + ".journal"
+
+            async def journaled(**kwargs):
+                source = await self.setUpSource()
+                source.config = source.config._replace(journal=True, **kwargs)
+                return source
+
+            # Updates are written to the journal as they happen
+            source = await journaled(keep_journal=True)
+            async with source, source() as sctx:
+                await sctx.update_many(
+                    [
+                        Record(str(i), data={"features": {"feed": i}})
+                        for i in range(0, 3)
+                    ]
+                )
+                self.assertTrue(os.path.isfile(journal))
+            self.assertFalse(os.path.isfile(self.testfile))
+            # Journal is replayed on open without journal set
+            source = await self.setUpSource()
+            source.config = source.config._replace(readwrite=False)
+            async with source, source() as sctx:
+                self.assertEqual(
+                    {
+                        record.key: record.feature("feed")
+                        async for record in sctx.records()
+                    },
+                    {"0": 0, "1": 1, "2": 2},
+                )
+            self.assertTrue(os.path.isfile(journal))
+            # Process died while writing an entry
+            with open(journal, "a") as fd:
+                fd.write('{"tag": "untagged", "key": "3", "da')
+            # Journal is replayed on open, file is rewritten on close
+            source = await journaled()
+            async with source, source() as sctx:
+                await sctx.update(Record("1", data={"features": {"feed": 10}}))
+            self.assertFalse(os.path.isfile(journal))
+            source = await self.setUpSource()
+            async with source, source() as sctx:
+                self.assertEqual(
+                    {
+                        record.key: record.feature("feed")
+                        async for record in sctx.records()
+                    },
+                    {"0": 0, "1": 10, "2": 2},
+                )
+            # Rewriting the file without journal set removes the journal, so
+            # that it isn't replayed over later changes
+            source = await journaled(keep_journal=True)
+            async with source, source() as sctx:
+                await sctx.update(Record("2", data={"features": {"feed": 20}}))
+            source = await self.setUpSource()
+            async with source, source() as sctx:
+                await sctx.update(Record("2", data={"features": {"feed": 30}}))
+            self.assertFalse(os.path.isfile(journal))
+            source = await journaled()
+            async with source, source() as sctx:
+                self.assertEqual(
+                    (await sctx.record("2")).feature("feed"), 30,
+                )
+
     async def test_tag(self):
         with tempfile.TemporaryDirectory() as testdir:
             self.testfile = os.path.join(testdir, str(random.random()))
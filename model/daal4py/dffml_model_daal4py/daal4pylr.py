@@ -96,7 +96,7 @@ class DAAL4PyLRModel(SimpleModel):
             -model-location tempdir \
             -sources f=csv \
             -source-filename test.csv \
-            -scorer mse \
+            -scorer mse
         0.6666666666666666
 
     Make a prediction
@@ -18,6 +18,7 @@ from dffml.model.accuracy import Accuracy
 from dffml.base import config, field
 from dffml.feature.feature import Feature, Features
 from dffml.source.source import Sources, SourcesContext
+from dffml.util.asynchelper import batched
 from dffml.model.model import ModelContext, ModelNotTrained
 from .utils import NumpyToTensor, PyTorchLoss, CrossEntropyLossFunction
 
@@ -39,6 +40,12 @@ class PyTorchModelConfig:
         "Number of iterations to pass over all records in a source", default=20
     )
     batch_size: int = field("Batch size", default=32)
+    threads: int = field(
+        "Number of CPU threads to use for prediction, PyTorch's default if "
+        "not given. PyTorch's number of threads is process wide, it's set "
+        "while running the model and restored after",
+        default=None,
+    )
     validation_split: float = field(
         "Split training data for Validation", default=0.0
     )
@@ -199,14 +206,28 @@ class PyTorchModelContext(ModelContext):
 
         return dataset, len(dataset)
 
-    async def prediction_data_generator(self, data):
+    async def prediction_data_generator(self, data: List[Any]):
+        """
+        DataLoader yielding feature data as batches of tensors. Images are
+        only resized to a common size when imageSize is given, otherwise each
+        batch holds the images of one shape so that they can be stacked.
+        """
         dataset = NumpyToTensor(
-            [data],
+            data,
             size=self.parent.config.imageSize,
             norm_mean=self.parent.config.normalize_mean,
             norm_std=self.parent.config.normalize_std,
         )
-        dataloader = torch.utils.data.DataLoader(dataset)
+        if self.parent.config.imageSize:
+            batches = [list(range(len(dataset)))]
+        else:
+            shapes = {}
+            for i, value in enumerate(data):
+                shapes.setdefault(np.shape(value), []).append(i)
+            batches = list(shapes.values())
+        dataloader = torch.utils.data.DataLoader(
+            dataset, batch_sampler=batches
+        )
         return dataloader
 
     async def train(self, sources: Sources):
@@ -353,6 +374,40 @@ class PyTorchModelContext(ModelContext):
         # Save the model at the specified path
         torch.save(self._model, self.model_path)
 
+    def predict_batch(self, records: List[Record], val):
+        """
+        Run the model on a batch of feature tensors and set the prediction of
+        the record each tensor came from.
+        """
+        target = self.parent.config.predict.name
+        # The number of threads is process wide, only change it while running
+        # the model
+        num_threads = torch.get_num_threads()
+        if self.parent.config.threads is not None:
+            torch.set_num_threads(self.parent.config.threads)
+        try:
+            output = self._model(val)
+        finally:
+            if self.parent.config.threads is not None:
+                torch.set_num_threads(num_threads)
+
+        if self.classifications:
+            prob = torch.nn.functional.softmax(output, dim=1)
+            confidences, prediction_values = prob.topk(1, dim=1)
+            for record, confidence, prediction_value in zip(
+                records, confidences, prediction_values
+            ):
+                record.predicted(
+                    target,
+                    self.cids[prediction_value.item()],
+                    confidence.item(),
+                )
+        else:
+            for i, record in enumerate(records):
+                row = slice(i, i + 1)
+                confidence = 1.0 - self.criterion(val[row], output[row]).item()
+                record.predicted(target, output[row].tolist(), confidence)
+
     async def predict(
         self, sources: SourcesContext
     ) -> AsyncIterator[Tuple[Record, Any, float]]:
@@ -363,27 +418,24 @@ class PyTorchModelContext(ModelContext):
             raise ModelNotTrained("Train model before prediction.")
 
         self._model.eval()
-        async for record in sources.with_features(self.features):
-            feature_data = record.features(self.features)[self.features[0]]
-            predict = await self.prediction_data_generator(feature_data)
-            target = self.parent.config.predict.name
-
-            # Disable gradient calculation for prediction
-            with torch.no_grad():
-                for val in predict:
-                    val = val.to(self.device)
-                    output = self._model(val)
-
-                    if self.classifications:
-                        prob = torch.nn.functional.softmax(output, dim=1)
-                        confidence, prediction_value = prob.topk(1, dim=1)
-                        record.predicted(
-                            target,
-                            self.cids[prediction_value.item()],
-                            confidence,
-                        )
-                    else:
-                        confidence = 1.0 - self.criterion(val, output).item()
-                        record.predicted(target, output, confidence)
+        # Run the model on batches of records rather than one at a time
+        async for records in batched(
+            sources.with_features(self.features),
+            self.parent.config.batch_size,
+        ):
+            predict = await self.prediction_data_generator(
+                [
+                    record.features(self.features)[self.features[0]]
+                    for record in records
+                ]
+            )
+            # Disable gradient calculation and tracking for prediction,
+            # inference_mode is only present in torch>=1.9
+            with getattr(torch, "inference_mode", torch.no_grad)():
+                for indices, val in zip(predict.batch_sampler, predict):
+                    self.predict_batch(
+                        [records[i] for i in indices], val.to(self.device)
+                    )
 
-            yield record
+            for record in records:
+                yield record
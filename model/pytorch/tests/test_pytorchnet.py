@@ -1,4 +1,6 @@
+import torch
 import torch.nn as nn
+import numpy as np
 import os
 import shutil
 import tempfile
@@ -8,9 +10,12 @@ from dffml.cli.cli import CLI
 from dffml.util.net import cached_download_unpack_archive
 from dffml.util.asynctestcase import AsyncTestCase
 from dffml.high_level import train, accuracy, predict
-from dffml import Features, Feature, DirectorySource
+from dffml import Features, Feature, DirectorySource, Record, MemorySource
 from dffml_model_pytorch import PyTorchNeuralNetwork
-from dffml_model_pytorch.utils import CrossEntropyLossFunction
+from dffml_model_pytorch.utils import (
+    CrossEntropyLossFunction,
+    MSELossFunction,
+)
 from dffml_model_pytorch.pytorch_accuracy_scorer import PytorchAccuracy
 
 
@@ -186,3 +191,137 @@ class TestPyTorchNeuralNetwork(AsyncTestCase):
         self.assertIn("confidence", results)
         self.assertIn(isinstance(results["value"], str), [True])
         self.assertTrue(results["confidence"])
+
+
+class TestPyTorchNeuralNetworkPredict(AsyncTestCase):
+    async def setUp(self):
+        await super().setUp()
+        generator = np.random.RandomState(0)
+        self.records = [
+            Record(
+                str(i),
+                data={
+                    "features": {
+                        "image": generator.randint(
+                            0, 256, (4, 4, 3), dtype=np.uint8
+                        )
+                    }
+                },
+            )
+            for i in range(5)
+        ]
+
+    async def predict(self, network, batch_size, **kwargs):
+        location = self.mktempdir()
+        torch.save(network, os.path.join(location, "model.pt"))
+        threads = torch.get_num_threads()
+        model = PyTorchNeuralNetwork(
+            features=Features(Feature("image", int, 4 * 4 * 3)),
+            predict=Feature("label", int, 1),
+            location=location,
+            network=network,
+            batch_size=batch_size,
+            threads=threads + 1,
+            **kwargs,
+        )
+        predictions = [
+            (key, prediction["label"])
+            async for key, _features, prediction in predict(
+                model, MemorySource(records=self.records)
+            )
+        ]
+        # The process wide number of threads is restored
+        self.assertEqual(torch.get_num_threads(), threads)
+        return predictions
+
+    async def test_classification(self):
+        network = nn.Sequential(nn.Flatten(), nn.Linear(4 * 4 * 3, 3))
+        kwargs = {
+            "classifications": ["rock", "paper", "scissors"],
+            "loss": CrossEntropyLossFunction(),
+        }
+        predictions = await self.predict(network, 1, **kwargs)
+        batch_predictions = await self.predict(network, 2, **kwargs)
+        self.assertEqual(
+            [key for key, _prediction in predictions],
+            [record.key for record in self.records],
+        )
+        for (key, prediction), (batch_key, batch_prediction) in zip(
+            predictions, batch_predictions
+        ):
+            self.assertEqual(key, batch_key)
+            self.assertIn(prediction["value"], kwargs["classifications"])
+            self.assertEqual(prediction["value"], batch_prediction["value"])
+            self.assertIsInstance(prediction["confidence"], float)
+            self.assertAlmostEqual(
+                prediction["confidence"],
+                batch_prediction["confidence"],
+                places=5,
+            )
+
+    async def test_regression(self):
+        network = nn.Conv2d(in_channels=3, out_channels=3, kernel_size=1)
+        kwargs = {"loss": MSELossFunction()}
+        predictions = await self.predict(network, 1, **kwargs)
+        batch_predictions = await self.predict(network, 2, **kwargs)
+        self.assertEqual(
+            [key for key, _prediction in predictions],
+            [record.key for record in self.records],
+        )
+        for (key, prediction), (batch_key, batch_prediction) in zip(
+            predictions, batch_predictions
+        ):
+            self.assertEqual(key, batch_key)
+            # Output of the network for the record
+            self.assertIsInstance(prediction["value"], list)
+            self.assertEqual(np.shape(prediction["value"]), (1, 3, 4, 4))
+            self.assertTrue(
+                np.allclose(prediction["value"], batch_prediction["value"])
+            )
+            self.assertIsInstance(prediction["confidence"], float)
+            self.assertAlmostEqual(
+                prediction["confidence"],
+                batch_prediction["confidence"],
+                places=5,
+            )
+
+    async def test_mixed_sizes(self):
+        generator = np.random.RandomState(0)
+        self.records = [
+            Record(
+                str(i),
+                data={
+                    "features": {
+                        "image": generator.randint(
+                            0, 256, (size, size, 3), dtype=np.uint8
+                        )
+                    }
+                },
+            )
+            for i, size in enumerate([4, 6, 4, 8, 6])
+        ]
+        network = nn.Conv2d(in_channels=3, out_channels=3, kernel_size=1)
+        kwargs = {"loss": MSELossFunction()}
+        # Without an imageSize images of each size are batched separately
+        predictions = await self.predict(network, 1, **kwargs)
+        batch_predictions = await self.predict(network, 5, **kwargs)
+        self.assertEqual(
+            [key for key, _prediction in batch_predictions],
+            [record.key for record in self.records],
+        )
+        for record, (key, prediction), (batch_key, batch_prediction) in zip(
+            self.records, predictions, batch_predictions
+        ):
+            size = record.feature("image").shape[0]
+            self.assertEqual(key, batch_key)
+            self.assertEqual(
+                np.shape(batch_prediction["value"]), (1, 3, size, size)
+            )
+            self.assertTrue(
+                np.allclose(prediction["value"], batch_prediction["value"])
+            )
+            self.assertAlmostEqual(
+                prediction["confidence"],
+                batch_prediction["confidence"],
+                places=5,
+            )
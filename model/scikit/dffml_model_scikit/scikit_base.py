@@ -6,9 +6,10 @@ Base class for Scikit models
 import json
 import pathlib
 import logging
+import itertools
 import importlib
 
-from typing import AsyncIterator, Tuple, Any, NamedTuple
+from typing import AsyncIterator, Tuple, Any, List, NamedTuple
 
 # https://intelpython.github.io/daal4py/sklearn.html
 try:
@@ -24,16 +25,23 @@ except Exception as error:
 
 from dffml.record import Record
 from dffml.model.accuracy import Accuracy
-from dffml.source.source import Sources, SourcesContext
+from dffml.source.source import (
+    Sources,
+    SourcesContext,
+    RecordBatch,
+    NoRecordsWithMatchingFeatures,
+)
 from dffml.model.model import ModelConfig, ModelContext, Model, ModelNotTrained
 from dffml.feature.feature import Features, Feature
 from dffml.util.crypto import secure_hash
+from dffml.util.asynchelper import batched
 
 
 class ScikitConfig(ModelConfig, NamedTuple):
     location: pathlib.Path
     predict: Feature
     features: Features
+    batch_size: int
 
 
 class ScikitContext(ModelContext):
@@ -58,7 +66,7 @@ class ScikitContext(ModelContext):
             [
                 "{}{}".format(k, v)
                 for k, v in self.parent.config._asdict().items()
-                if k not in ["features", "predict"]
+                if k not in ["features", "predict", "batch_size"]
             ]
         )
         return secure_hash(
@@ -77,26 +85,56 @@ class ScikitContext(ModelContext):
             del config["location"]
             del config["predict"]
             del config["features"]
+            del config["batch_size"]
             self.clf = self.parent.SCIKIT_MODEL(**config)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         pass
 
+    def _record_data(self, record: Record) -> List[Any]:
+        """
+        Values of the features of a record, with array features flattened
+        """
+        record_data = []
+        for feature in record.features(self.features).values():
+            record_data.extend(
+                [feature] if self.np.isscalar(feature) else feature
+            )
+        return record_data
+
+    def _batch_data(self, batch: RecordBatch):
+        """
+        Values of the features of a batch of records, one row per record, with
+        array features flattened
+        """
+        return self.np.column_stack(
+            [
+                self.np.asarray(batch.features[feature]).reshape(
+                    len(batch.keys), -1
+                )
+                for feature in self.features
+            ]
+        )
+
     async def train(self, sources: Sources):
         xdata = []
         ydata = []
-        async for record in sources.with_features(
-            self.features + [self.parent.config.predict.name]
+        # Feature data by column, which some sources give without creating a
+        # record for each row
+        async for batch in sources.batches(
+            self.features + [self.parent.config.predict.name],
+            self.parent.config.batch_size,
         ):
-            record_data = []
-            for feature in record.features(self.features).values():
-                record_data.extend(
-                    [feature] if self.np.isscalar(feature) else feature
-                )
-            xdata.append(record_data)
-            ydata.append(record.feature(self.parent.config.predict.name))
-        xdata = self.np.array(xdata)
+            xdata.append(self._batch_data(batch))
+            ydata.extend(batch.features[self.parent.config.predict.name])
+        if not xdata:
+            raise NoRecordsWithMatchingFeatures(
+                "No records with all of the features "
+                f"{self.features + [self.parent.config.predict.name]} to "
+                "train on"
+            )
+        xdata = self.np.concatenate(xdata)
         ydata = self.np.array(ydata)
         self.logger.info("Number of input records: {}".format(len(xdata)))
         self.clf.fit(xdata, ydata)
@@ -107,29 +145,31 @@ class ScikitContext(ModelContext):
     ) -> AsyncIterator[Tuple[Record, Any, float]]:
         if not self._filepath.is_file():
             raise ModelNotTrained("Train model before prediction.")
-        async for record in sources.with_features(self.features):
-            record_data = []
-            for feature in record.features(self.features).values():
-                record_data.extend(
-                    [feature] if self.np.isscalar(feature) else feature
-                )
-            predict = self.np.array([record_data])
+        target = self.parent.config.predict.name
+        dtype = self.parent.config.predict.dtype
+        # Predict many records with each call rather than one at a time
+        async for records in batched(
+            sources.with_features(self.features),
+            self.parent.config.batch_size,
+        ):
+            predict = self.np.array(list(map(self._record_data, records)))
+            values = self.clf.predict(predict)
+            # Classifiers which give probabilities give a confidence for each
+            # prediction, otherwise use the saved accuracy
+            if hasattr(self.clf, "predict_proba"):
+                confidences = self.clf.predict_proba(predict).max(axis=1)
+            else:
+                confidences = itertools.repeat(self.confidence)
             self.logger.debug(
-                "Predicted Value of {} for {}: {}".format(
-                    self.parent.config.predict,
-                    predict,
-                    self.clf.predict(predict),
-                )
-            )
-            target = self.parent.config.predict.name
-            record.predicted(
-                target,
-                self.parent.config.predict.dtype(self.clf.predict(predict)[0])
-                if self.parent.config.predict.dtype is not str
-                else self.clf.predict(predict)[0],
-                self.confidence,
+                "Predicted %d values of %s", len(records), target
             )
-            yield record
+            for record, value, confidence in zip(records, values, confidences):
+                record.predicted(
+                    target,
+                    dtype(value) if dtype is not str else value,
+                    float(confidence),
+                )
+                yield record
 
 
 class ScikitContextUnsprvised(ScikitContext):
@@ -141,6 +181,7 @@ class ScikitContextUnsprvised(ScikitContext):
             del config["location"]
             del config["features"]
             del config["predict"]
+            del config["batch_size"]
             self.clf = self.parent.SCIKIT_MODEL(**config)
         return self
 
@@ -175,28 +216,33 @@ class ScikitContextUnsprvised(ScikitContext):
                         yield label
 
                 labels = yield_labels()
-                predictor = lambda predict: [next(labels)]
+                predictor = lambda predict: [next(labels) for _ in predict]
         else:
             raise NotImplementedError(
                 f"Model is not a clusterer: {self.clf._estimator_type}"
             )
 
-        async for record in sources.with_features(self.features):
-            feature_data = record.features(self.features)
-            predict = self.np.array([list(feature_data.values())])
-            prediction = predictor(predict)
-            self.logger.debug(
-                "Predicted cluster for {}: {}".format(predict, prediction)
-            )
-            target = self.parent.config.predict.name
-            record.predicted(
-                target,
-                self.parent.config.predict.dtype(prediction[0])
-                if self.parent.config.predict.dtype is not str
-                else prediction[0],
-                self.confidence,
+        target = self.parent.config.predict.name
+        dtype = self.parent.config.predict.dtype
+        async for records in batched(
+            sources.with_features(self.features),
+            self.parent.config.batch_size,
+        ):
+            predict = self.np.array(
+                [
+                    list(record.features(self.features).values())
+                    for record in records
+                ]
             )
-            yield record
+            prediction = predictor(predict)
+            self.logger.debug("Predicted clusters of %d records", len(records))
+            for record, value in zip(records, prediction):
+                record.predicted(
+                    target,
+                    dtype(value) if dtype is not str else value,
+                    self.confidence,
+                )
+                yield record
 
 
 class Scikit(Model):
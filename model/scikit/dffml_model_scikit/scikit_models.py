@@ -53,6 +53,7 @@ from sklearn.cluster import (
 
 
 from dffml.base import field
+from dffml.source.source import DEFAULT_BATCH_SIZE
 from dffml.util.config.numpy import make_config_numpy
 from dffml.util.entrypoint import entrypoint
 from dffml.feature.feature import Feature, Features
@@ -130,6 +131,14 @@ for entry_point_name, name, cls in [
                 field("Location where state should be saved",),
             ),
             "features": (Features, field("Features to train on")),
+            "batch_size": (
+                int,
+                field(
+                    "Number of records to predict with each call to the "
+                    "model",
+                    default=DEFAULT_BATCH_SIZE,
+                ),
+            ),
         },
         **config_fields,
     }
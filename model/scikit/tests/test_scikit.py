@@ -4,7 +4,7 @@ import numpy as np
 
 from dffml.record import Record
 from dffml.high_level import accuracy
-from dffml.source.source import Sources
+from dffml.source.source import Sources, NoRecordsWithMatchingFeatures
 from dffml.source.memory import MemorySource, MemorySourceConfig
 from dffml.feature import Feature, Features
 from dffml.util.asynctestcase import AsyncTestCase
@@ -146,6 +146,9 @@ class TestScikitModel:
                     prediction = record.prediction(target).value
                     if self.MODEL_TYPE == "CLASSIFICATION":
                         self.assertIn(prediction, [2, 4])
+                        if hasattr(mctx.clf, "predict_proba"):
+                            confidence = record.prediction(target).confidence
+                            self.assertTrue(0 <= confidence <= 1)
                     elif self.MODEL_TYPE == "REGRESSION":
                         correct = FEATURE_DATA_REGRESSION[int(record.key)][3]
                         self.assertGreater(
@@ -155,6 +158,54 @@ class TestScikitModel:
                     elif self.MODEL_TYPE == "CLUSTERING":
                         self.assertIn(prediction, [-1, 0, 1, 2, 3, 4, 5, 6, 7])
 
+    async def test_03_predict_batch_size(self):
+        predictions = {}
+        for batch_size in [1, 3]:
+            model = self.MODEL(
+                self.model.config._replace(batch_size=batch_size)
+            )
+            async with self.sources as sources, model:
+                target = model.config.predict.name
+                async with sources() as sctx, model() as mctx:
+                    predictions[batch_size] = [
+                        (
+                            record.key,
+                            record.prediction(target).value,
+                            record.prediction(target).confidence,
+                        )
+                        async for record in mctx.predict(sctx)
+                    ]
+        # Same predictions in the same order no matter the batch size, up to
+        # floating point differences in predicting several rows at once
+        keys, values, confidences = zip(*predictions[1])
+        batch_keys, batch_values, batch_confidences = zip(*predictions[3])
+        self.assertEqual(keys, batch_keys)
+        self.assertTrue(np.allclose(values, batch_values))
+        self.assertTrue(
+            np.allclose(confidences, batch_confidences, equal_nan=True)
+        )
+        self.assertEqual(len(keys), len(self.records))
+
+
+class EmptySourcesContext:
+    async def batches(self, features, batch_size):
+        return
+        yield
+
+
+class TestScikitTrainEmpty(AsyncTestCase):
+    async def test_train(self):
+        model = dffml_model_scikit.scikit_models.LinearRegressionModel(
+            features=Features(Feature("A", float, 1)),
+            predict=Feature("X", float, 1),
+            location=self.mktempdir(),
+        )
+        async with model, model() as mctx:
+            with self.assertRaisesRegex(
+                NoRecordsWithMatchingFeatures, "train on"
+            ):
+                await mctx.train(EmptySourcesContext())
+
 
 FEATURE_DATA_CLASSIFICATION = [
     [5, 1, 1, 1, 2, 1, 3, 1, 1, 2],
@@ -0,0 +1,424 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2021 Intel Corporation
+"""
+Benchmark MemoryOrchestrator throughput and latency using synthetic dataflows.
+
+Each topology is built from trivial operations so that the time measured is
+the time spent by the orchestrator. Each benchmark runs in its own process so
+that the peak RSS reported is its own.
+
+    $ python scripts/bench_orchestrator.py --contexts 1000 --output bench.json
+    $ python scripts/bench_orchestrator.py --compare bench.json
+
+Results are saved as JSON. When given a previous results file to compare
+against, the exit code is 1 if operations per second dropped by more than
+the threshold for any benchmark.
+"""
+import sys
+import json
+import time
+import asyncio
+import pathlib
+import argparse
+import platform
+import resource
+import collections
+import multiprocessing
+import concurrent.futures
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from dffml import (
+    DataFlow,
+    Definition,
+    GetMulti,
+    GetSingle,
+    Input,
+    MemoryOrchestrator,
+    op,
+)
+from dffml.version import VERSION
+
+# Number of synthetic operations which have been run
+RAN = collections.Counter()
+
+
+def increment_op(name: str, value: Definition, result: Definition, **kwargs):
+    """
+    Create an operation which adds one to its input
+    """
+
+    async def increment(value: int) -> Dict[str, int]:
+        RAN["operations"] += 1
+        return {"result": value + 1}
+
+    return op(
+        name=name,
+        inputs={"value": value},
+        outputs={"result": result},
+        **kwargs,
+    )(increment)
+
+
+def chain(size: int) -> Tuple[DataFlow, Callable[[int], List[Input]]]:
+    """
+    size operations, each using the output of the previous one
+    """
+    definitions = [
+        Definition(name=f"chain.{i}", primitive="int")
+        for i in range(0, size + 1)
+    ]
+    dataflow = DataFlow(
+        *[
+            increment_op(f"chain_{i}", definitions[i], definitions[i + 1])
+            for i in range(0, size)
+        ],
+        GetSingle,
+    )
+    return (
+        dataflow,
+        lambda i: [
+            Input(value=i, definition=definitions[0]),
+            Input(
+                value=[definitions[-1].name],
+                definition=GetSingle.op.inputs["spec"],
+            ),
+        ],
+    )
+
+
+def fanout(size: int) -> Tuple[DataFlow, Callable[[int], List[Input]]]:
+    """
+    One operation whose output is expanded into size inputs, each used by
+    another operation. All of their outputs are collected with GetMulti.
+    """
+    start = Definition(name="fanout.start", primitive="int")
+    item = Definition(name="fanout.item", primitive="int")
+    result = Definition(name="fanout.result", primitive="int")
+
+    @op(
+        name="fanout_expand",
+        inputs={"value": start},
+        outputs={"items": item},
+        expand=["items"],
+    )
+    async def fanout_expand(value: int) -> Dict[str, List[int]]:
+        RAN["operations"] += 1
+        return {"items": [value + i for i in range(0, size)]}
+
+    dataflow = DataFlow(
+        fanout_expand, increment_op("fanout_increment", item, result), GetMulti
+    )
+    return (
+        dataflow,
+        lambda i: [
+            Input(value=i, definition=start),
+            Input(value=[result.name], definition=GetMulti.op.inputs["spec"]),
+        ],
+    )
+
+
+def diamond(size: int) -> Tuple[DataFlow, Callable[[int], List[Input]]]:
+    """
+    size diamonds in a row. Each splits its input into two operations, which
+    are joined by an operation taking both of their outputs.
+    """
+    operations = []
+    joined = [
+        Definition(name=f"diamond.{i}", primitive="int")
+        for i in range(0, size + 1)
+    ]
+    for i in range(0, size):
+        left = Definition(name=f"diamond.{i}.left", primitive="int")
+        right = Definition(name=f"diamond.{i}.right", primitive="int")
+
+        async def join(left: int, right: int) -> Dict[str, int]:
+            RAN["operations"] += 1
+            return {"result": left + right}
+
+        operations.extend(
+            [
+                increment_op(f"diamond_{i}_left", joined[i], left),
+                increment_op(f"diamond_{i}_right", joined[i], right),
+                op(
+                    name=f"diamond_{i}_join",
+                    inputs={"left": left, "right": right},
+                    outputs={"result": joined[i + 1]},
+                )(join),
+            ]
+        )
+    dataflow = DataFlow(*operations, GetSingle)
+    return (
+        dataflow,
+        lambda i: [
+            Input(value=i, definition=joined[0]),
+            Input(
+                value=[joined[-1].name],
+                definition=GetSingle.op.inputs["spec"],
+            ),
+        ],
+    )
+
+
+def conditions(size: int) -> Tuple[DataFlow, Callable[[int], List[Input]]]:
+    """
+    size stages, each with an operation checking if its input is even or odd
+    followed by one of two operations which only run for even or odd inputs.
+    """
+    operations = []
+    values = [
+        Definition(name=f"conditions.{i}", primitive="int")
+        for i in range(0, size + 1)
+    ]
+    for i in range(0, size):
+        is_even = Definition(name=f"conditions.{i}.even", primitive="bool")
+        is_odd = Definition(name=f"conditions.{i}.odd", primitive="bool")
+
+        async def parity(value: int) -> Dict[str, bool]:
+            RAN["operations"] += 1
+            return {"even": value % 2 == 0, "odd": value % 2 == 1}
+
+        operations.extend(
+            [
+                op(
+                    name=f"conditions_{i}_parity",
+                    inputs={"value": values[i]},
+                    outputs={"even": is_even, "odd": is_odd},
+                )(parity),
+                increment_op(
+                    f"conditions_{i}_even",
+                    values[i],
+                    values[i + 1],
+                    conditions=[is_even],
+                ),
+                increment_op(
+                    f"conditions_{i}_odd",
+                    values[i],
+                    values[i + 1],
+                    conditions=[is_odd],
+                ),
+            ]
+        )
+    dataflow = DataFlow(*operations, GetSingle)
+    return (
+        dataflow,
+        lambda i: [
+            Input(value=i, definition=values[0]),
+            Input(
+                value=[values[-1].name],
+                definition=GetSingle.op.inputs["spec"],
+            ),
+        ],
+    )
+
+
+TOPOLOGIES = {
+    "chain": chain,
+    "fanout": fanout,
+    "diamond": diamond,
+    "conditions": conditions,
+}
+
+
+def percentile(ordered: List[float], percent: float) -> float:
+    """
+    Nearest rank percentile of a sorted list
+    """
+    if not ordered:
+        return 0.0
+    index = max(0, int(round(percent / 100.0 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+async def benchmark(
+    topology: str,
+    size: int,
+    contexts: int,
+    max_ctxs: int = None,
+    max_operations: int = None,
+) -> Dict[str, Any]:
+    """
+    Run a synthetic dataflow over the given number of contexts and measure
+    how long it took
+    """
+    dataflow, create_inputs = TOPOLOGIES[topology](size)
+    RAN.clear()
+    started: Dict[str, float] = {}
+    latencies: List[float] = []
+
+    async def input_sets() -> AsyncIterator[Tuple[str, List[Input]]]:
+        for i in range(0, contexts):
+            started[str(i)] = time.perf_counter()
+            yield str(i), create_inputs(i)
+
+    async with MemoryOrchestrator(
+        max_ctxs=max_ctxs, max_operations=max_operations
+    ) as orchestrator:
+        async with orchestrator(dataflow) as octx:
+            start = time.perf_counter()
+            async for ctx, _results in octx.run(input_sets()):
+                latencies.append(
+                    time.perf_counter()
+                    - started.pop((await ctx.handle()).as_string())
+                )
+            seconds = time.perf_counter() - start
+    operations = RAN["operations"]
+    latencies.sort()
+    return {
+        "topology": topology,
+        "size": size,
+        "contexts": contexts,
+        "max_ctxs": max_ctxs,
+        "max_operations": max_operations,
+        "operations": operations,
+        "seconds": seconds,
+        "operations_per_second": operations / seconds,
+        "contexts_per_second": contexts / seconds,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        # Linux reports kilobytes, macOS reports bytes
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        // (1024 if sys.platform == "darwin" else 1),
+    }
+
+
+def run_benchmark(*args) -> Dict[str, Any]:
+    return asyncio.run(benchmark(*args))
+
+
+def key(result: Dict[str, Any]) -> Tuple:
+    return tuple(
+        result[name]
+        for name in (
+            "topology",
+            "size",
+            "contexts",
+            "max_ctxs",
+            "max_operations",
+        )
+    )
+
+
+def compare(
+    previous: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> bool:
+    """
+    Print the change in operations per second for each benchmark. Return True
+    if any dropped by more than threshold.
+    """
+    regressed = False
+    previous = {
+        key(result): result for result in previous.get("benchmarks", [])
+    }
+    for result in current["benchmarks"]:
+        if key(result) not in previous:
+            continue
+        before = previous[key(result)]["operations_per_second"]
+        change = (result["operations_per_second"] - before) / before
+        marker = ""
+        if change < -threshold:
+            marker = " REGRESSION"
+            regressed = True
+        print(
+            f"{result['topology']}[{result['size']}] x {result['contexts']}: "
+            f"{before:.1f} -> {result['operations_per_second']:.1f} "
+            f"operations/s ({change:+.1%}){marker}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark MemoryOrchestrator with synthetic dataflows"
+    )
+    parser.add_argument(
+        "--topology",
+        nargs="+",
+        choices=list(TOPOLOGIES.keys()),
+        default=list(TOPOLOGIES.keys()),
+        help="Dataflow shapes to benchmark",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs="+",
+        default=[4],
+        help="Length of chains, width of fan out, or number of stages",
+    )
+    parser.add_argument(
+        "--contexts",
+        type=int,
+        nargs="+",
+        default=[100],
+        help="Number of contexts to run each dataflow over",
+    )
+    parser.add_argument(
+        "--max-ctxs", type=int, default=None, help="Orchestrator max_ctxs"
+    )
+    parser.add_argument(
+        "--max-operations",
+        type=int,
+        default=None,
+        help="Orchestrator max_operations",
+    )
+    parser.add_argument(
+        "--output", type=pathlib.Path, help="Save results as JSON to file"
+    )
+    parser.add_argument(
+        "--compare",
+        type=pathlib.Path,
+        help="Previous results to compare operations per second against",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fractional drop in operations per second considered a regression",
+    )
+
+    args = parser.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "dffml": VERSION,
+        "benchmarks": [],
+    }
+    # Run each benchmark in a new process so peak RSS is not shared
+    mp_context = multiprocessing.get_context("spawn")
+    for topology in args.topology:
+        for size in args.size:
+            for contexts in args.contexts:
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=mp_context
+                ) as pool:
+                    result = pool.submit(
+                        run_benchmark,
+                        topology,
+                        size,
+                        contexts,
+                        args.max_ctxs,
+                        args.max_operations,
+                    ).result()
+                results["benchmarks"].append(result)
+                print(
+                    f"{topology}[{size}] x {contexts}: "
+                    f"{result['operations_per_second']:.1f} operations/s "
+                    f"p50 {result['latency']['p50'] * 1000:.2f}ms "
+                    f"p99 {result['latency']['p99'] * 1000:.2f}ms "
+                    f"peak RSS {result['peak_rss_kb'] // 1024}MB"
+                )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4, sort_keys=True))
+
+    if args.compare and compare(
+        json.loads(args.compare.read_text()), results, args.threshold
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -92,6 +92,7 @@ setup(
             "op = dffml.source.op:OpSource",
             "dir = dffml.source.dir:DirectorySource",
             "dataframe = dffml.source.dataframe:DataFrameSource",
+            "cache = dffml.source.cache:FeatureCacheSource",
             "iris.training = dffml.source.dataset.iris:iris_training.source",
         ],
         "dffml.port": ["json = dffml.port.json:JSON"],
@@ -66,17 +66,40 @@ class MySQLDatabaseContext(SQLDatabaseContext):
         )
         await self.conn.execute(query, query_values)
 
+    async def insert_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        if not rows:
+            return
+        # All rows are inserted into the columns of the first
+        query, _ = self.insert_query(table_name, rows[0])
+        self.logger.debug(query)
+        # aiomysql turns many INSERTs into one multiple row INSERT
+        await self.conn.executemany(
+            query, [[row[col] for col in rows[0]] for row in rows]
+        )
+
+    def insert_or_update_query(self, table_name: str, data: Dict[str, Any]):
+        query, query_values = self.insert_query(table_name, data)
+        query += " ON DUPLICATE KEY UPDATE " + " ,".join(
+            [f"`{col}` = VALUES(`{col}`)" for col in data]
+        )
+        return query, query_values
+
     async def insert_or_update(self, table_name: str, data: Dict[str, Any]):
-        col_exp = ", ".join([f"`{col}`" for col in data])
-        query = (
-            f"INSERT INTO {table_name} "
-            + f"( {col_exp} )"
-            + f" VALUES( {', '.join([self.BIND_DECLARATION] * len(data))} ) "
-            + " ON DUPLICATE KEY UPDATE "
-            + " ,".join([f"`{col}` = {self.BIND_DECLARATION}" for col in data])
+        query, query_values = self.insert_or_update_query(table_name, data)
+        await self.conn.execute(query, query_values)
+
+    async def insert_or_update_many(
+        self, table_name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        if not rows:
+            return
+        query, _ = self.insert_or_update_query(table_name, rows[0])
+        self.logger.debug(query)
+        await self.conn.executemany(
+            query, [[row[col] for col in rows[0]] for row in rows]
         )
-        vals = list(data.values()) * 2
-        await self.conn.execute(query, vals)
 
     async def __aenter__(self) -> "MySQLDatabaseContext":
         self.__conn = self.parent.db.cursor(aiomysql.DictCursor)
@@ -1,6 +1,7 @@
 import ssl
 import itertools
 import collections
+from contextlib import asynccontextmanager
 from typing import AsyncIterator, NamedTuple, Dict, List, Tuple
 
 import aiomysql
@@ -37,7 +38,14 @@ class MySQLSourceConfig:
     update: str = field("Query to update a single record")
     record: str = field("Query to get a single record")
     records: str = field("Query to get a single record")
-    init: str = field("Query to run on initial connection", default=None)
+    records_by_key: str = field(
+        "Query to get many records, the list of keys is bound to a single "
+        "parameter. Such as SELECT * FROM table WHERE `key` IN %s",
+        default=None,
+    )
+    init: str = field(
+        "Query to run on each new connection to the server", default=None
+    )
     host: str = field("Host/address to connect to", default="127.0.0.1")
     port: int = field("Port to connect to", default=3306)
     ca: str = field(
@@ -46,10 +54,31 @@ class MySQLSourceConfig:
     insecure: bool = field(
         "Must be true to accept risks of non-TLS connection", default=False
     )
+    pool_size: int = field(
+        "Maximum number of connections, at least 2. Each query uses one "
+        "while it runs, iterating over records holds one until done",
+        default=10,
+    )
+    fetch_size: int = field(
+        "Number of rows to fetch from the server at a time when iterating "
+        "over records",
+        default=1000,
+    )
 
 
 class MySQLSourceContext(BaseSourceContext):
-    async def update(self, record: Record):
+    @asynccontextmanager
+    async def cursor(self, cursor_cls=aiomysql.DictCursor):
+        """
+        Cursor on a connection from the pool, which is committed and returned
+        to the pool once done
+        """
+        async with self.parent.pool.acquire() as db:
+            async with db.cursor(cursor_cls) as conn:
+                yield conn
+            await db.commit()
+
+    def record_to_values(self, record: Record) -> List:
         # Column name of value mapping
         bindings = {self.parent.config.key: record.key}
         # Features
@@ -79,9 +108,23 @@ class MySQLSourceContext(BaseSourceContext):
         values = list(bindings.values())
         if not "REPLACE" in self.parent.config.update.upper():
             values += list(bindings.values())[1:]
+        return values
+
+    async def update(self, record: Record):
+        values = self.record_to_values(record)
         # Execute the update query
-        await self.conn.execute(self.parent.config.update, values)
-        self.logger.debug("Updated: %s: %r", record.key, bindings)
+        async with self.cursor() as conn:
+            await conn.execute(self.parent.config.update, values)
+        self.logger.debug("Updated: %s: %r", record.key, values)
+
+    async def update_many(self, records: List[Record]):
+        # Execute the update query once for all records
+        async with self.cursor() as conn:
+            await conn.executemany(
+                self.parent.config.update,
+                list(map(self.record_to_values, records)),
+            )
+        self.logger.debug("Updated %d records", len(records))
 
     def row_to_record(self, row):
         features = {}
@@ -105,26 +148,28 @@ class MySQLSourceContext(BaseSourceContext):
         )
 
     async def records(self) -> AsyncIterator[Record]:
-        # Execute the query to get all records
-        await self.conn.execute(self.parent.config.records)
-        # Grab records batch by batch until none are left
-        result = [True]
-        while result:
-            # Grab another batch
-            result = await self.conn.fetchmany()
-            if not result:
-                continue
-            # Convert row objects to Record objects
-            for row in result:
-                yield self.row_to_record(row)
+        # Stream records using a server side cursor, which holds its connection
+        # until all rows are read. Queries made meanwhile use other connections.
+        async with self.cursor(aiomysql.SSDictCursor) as conn:
+            # Execute the query to get all records
+            await conn.execute(self.parent.config.records)
+            # Grab records batch by batch until none are left
+            result = [True]
+            while result:
+                # Grab another batch
+                result = await conn.fetchmany(self.parent.config.fetch_size)
+                # Convert row objects to Record objects
+                for row in result:
+                    yield self.row_to_record(row)
 
     async def record(self, key: str):
         # Create a blank record in case it doesn't exist within the source
         record = Record(key)
         # Execute the query to get a single record from a key
-        await self.conn.execute(self.parent.config.record, (key,))
-        # Retrieve the result
-        row = await self.conn.fetchone()
+        async with self.cursor() as conn:
+            await conn.execute(self.parent.config.record, (key,))
+            # Retrieve the result
+            row = await conn.fetchone()
         # Convert it to a record if it exists and populate the previously blank
         # record by merging the two
         if row is not None:
@@ -132,14 +177,21 @@ class MySQLSourceContext(BaseSourceContext):
         self.logger.debug("Got: %s: %r", record.key, record.export())
         return record
 
-    async def __aenter__(self) -> "MySQLSourceContext":
-        self.__conn = self.parent.db.cursor(aiomysql.DictCursor)
-        self.conn = await self.__conn.__aenter__()
-        return self
-
-    async def __aexit__(self, exc_type, exc_value, traceback):
-        await self.__conn.__aexit__(exc_type, exc_value, traceback)
-        await self.parent.db.commit()
+    async def records_by_key(self, keys: List[str]) -> Dict[str, Record]:
+        if self.parent.config.records_by_key is None or not keys:
+            return await super().records_by_key(keys)
+        found = {key: Record(key) for key in keys}
+        # Execute the query to get all the records in one round trip
+        async with self.cursor() as conn:
+            await conn.execute(
+                self.parent.config.records_by_key, (list(found.keys()),)
+            )
+            rows = await conn.fetchall()
+        for row in rows:
+            record = self.row_to_record(row)
+            if record.key in found:
+                found[record.key].merge(record)
+        return found
 
 
 @entrypoint("mysql")
@@ -169,6 +221,16 @@ class MySQLSource(BaseSource):
     CONTEXT = MySQLSourceContext
     CONFIG = MySQLSourceConfig
 
+    def __init__(self, config):
+        super().__init__(config)
+        # Queries made while iterating over records would wait forever for a
+        # second connection
+        if self.config.pool_size < 2:
+            raise ValueError(
+                "pool_size must be at least 2, queries made while iterating "
+                "over records need a connection other than the one it holds"
+            )
+
     async def __aenter__(self) -> "MySQLSource":
         # Verify MySQL connection using provided certificate, if given
         ssl_ctx = None
@@ -191,16 +253,12 @@ class MySQLSource(BaseSource):
             password=self.config.password,
             db=self.config.db,
             ssl=ssl_ctx,
+            maxsize=self.config.pool_size,
+            # Run initial connection SQL, if given, on every connection
+            init_command=self.config.init,
         )
-        self.__db = self.pool.acquire()
-        self.db = await self.__db.__aenter__()
-        # Run initial connection SQL if given
-        if self.config.init is not None:
-            async with self.db.cursor(aiomysql.DictCursor) as conn:
-                await conn.execute(self.config.init)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self.__db.__aexit__(exc_type, exc_value, traceback)
         self.pool.close()
         await self.pool.wait_closed()
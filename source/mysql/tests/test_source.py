@@ -1,9 +1,11 @@
 import socket
+import asyncio
 import inspect
 import unittest
 import contextlib
 from unittest.mock import patch
 
+from dffml.record import Record
 from dffml.util.testing.source import SourceTest
 from dffml.util.asynctestcase import AsyncTestCase
 
@@ -54,6 +56,7 @@ CREATE TABLE IF NOT EXISTS `record_data` (
             init=cls.SQL_SETUP,
             record="SELECT * FROM record_data WHERE `key`=%s",
             records="SELECT * FROM record_data",
+            records_by_key="SELECT * FROM record_data WHERE `key` IN %s",
             update=inspect.cleandoc(
                 """
                 INSERT INTO record_data
@@ -100,3 +103,25 @@ CREATE TABLE IF NOT EXISTS `record_data` (
 
     async def setUpSource(self):
         return MySQLSource(self.source_config)
+
+    async def test_concurrent_contexts(self):
+        source = await self.setUpSource()
+        async with source as testSource:
+            async with testSource() as sourceContext:
+                await sourceContext.update_many(
+                    [Record(f"concurrent_{i}") for i in range(0, 10)]
+                )
+
+            async def read():
+                # Each context has a connection of its own
+                async with testSource() as sourceContext:
+                    return [
+                        record.key
+                        async for record in sourceContext.records()
+                        if record.key.startswith("concurrent_")
+                    ]
+
+            for keys in await asyncio.gather(*[read() for _ in range(0, 4)]):
+                self.assertEqual(
+                    sorted(keys), sorted(f"concurrent_{i}" for i in range(10))
+                )
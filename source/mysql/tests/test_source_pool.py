@@ -0,0 +1,193 @@
+import asyncio
+import contextlib
+from unittest.mock import patch
+
+import aiomysql
+
+from dffml.record import Record
+from dffml.util.asynctestcase import AsyncTestCase
+
+from dffml_source_mysql.source import MySQLSourceConfig, MySQLSource
+
+COLUMNS = ["key", "x", "y", "y_confidence"]
+
+
+class FakeCursor:
+    """
+    Cursor which runs the queries of the source config against rows in memory
+    """
+
+    def __init__(self, pool, cursor_cls):
+        self.pool = pool
+        self.cursor_cls = cursor_cls
+        self.result = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def execute(self, query, args=None):
+        self.pool.executed.append((self.cursor_cls, query))
+        if query == self.pool.config.records:
+            self.result = list(self.pool.rows.values())
+        elif query == self.pool.config.record:
+            self.result = [
+                row for key, row in self.pool.rows.items() if key == args[0]
+            ]
+        elif query == self.pool.config.update:
+            self.pool.rows[args[0]] = dict(zip(COLUMNS, args))
+
+    async def executemany(self, query, args):
+        for values in args:
+            await self.execute(query, values)
+
+    async def fetchmany(self, size):
+        # Let other coroutines run while waiting on the server
+        await asyncio.sleep(0)
+        rows, self.result = self.result[:size], self.result[size:]
+        self.pool.fetched.append(len(rows))
+        return rows
+
+    async def fetchone(self):
+        rows = await self.fetchmany(1)
+        return rows[0] if rows else None
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, cursor_cls):
+        return FakeCursor(self.pool, cursor_cls)
+
+    async def commit(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, config, maxsize, init_command):
+        self.config = config
+        self.maxsize = maxsize
+        self.init_command = init_command
+        self.acquired = 0
+        self.max_acquired = 0
+        self.rows = {}
+        self.executed = []
+        self.fetched = []
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        # A real pool would wait forever for a connection to be released
+        if self.acquired == self.maxsize:
+            raise AssertionError("All connections in use")
+        self.acquired += 1
+        self.max_acquired = max(self.acquired, self.max_acquired)
+        try:
+            yield FakeConnection(self)
+        finally:
+            self.acquired -= 1
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+class TestMySQLSourcePool(AsyncTestCase):
+    async def setUp(self):
+        await super().setUp()
+        self.source_config = MySQLSourceConfig(
+            user="user",
+            password="pass",
+            db="db",
+            key="key",
+            features={"x": "x"},
+            predictions={"y": ("y", "y_confidence")},
+            insecure=True,
+            record="SELECT * FROM record_data WHERE `key`=%s",
+            records="SELECT * FROM record_data",
+            update="REPLACE INTO record_data VALUES (%s, %s, %s, %s)",
+            init="SET NAMES utf8mb4",
+            pool_size=2,
+            fetch_size=2,
+        )
+        self.pool = None
+
+        async def create_pool(**kwargs):
+            self.pool = FakePool(
+                self.source_config, kwargs["maxsize"], kwargs["init_command"]
+            )
+            return self.pool
+
+        self._stack.enter_context(
+            patch.object(aiomysql, "create_pool", create_pool)
+        )
+
+    async def test_init(self):
+        async with MySQLSource(self.source_config):
+            # Run by the pool on each connection it makes
+            self.assertEqual(self.pool.init_command, self.source_config.init)
+
+    def test_pool_size(self):
+        with self.assertRaisesRegex(ValueError, "pool_size"):
+            MySQLSource(self.source_config._replace(pool_size=1))
+
+    async def test_records(self):
+        async with MySQLSource(self.source_config) as source:
+            async with source() as sctx:
+                await sctx.update_many(
+                    [
+                        Record(str(i), data={"features": {"x": i}})
+                        for i in range(0, 5)
+                    ]
+                )
+                async for record in sctx.records():
+                    # The context's connection is free for other queries
+                    await sctx.update(
+                        Record(
+                            record.key,
+                            data={"features": {"x": record.feature("x") * 2}},
+                        )
+                    )
+                self.assertEqual(
+                    [
+                        (await sctx.record(str(i))).feature("x")
+                        for i in range(0, 5)
+                    ],
+                    [0, 2, 4, 6, 8],
+                )
+        # Records were streamed with a server side cursor, fetch_size at a time
+        self.assertIn(
+            (aiomysql.SSDictCursor, self.source_config.records),
+            self.pool.executed,
+        )
+        self.assertEqual(self.pool.fetched[:4], [2, 2, 1, 0])
+        self.assertEqual(self.pool.max_acquired, 2)
+        self.assertEqual(self.pool.acquired, 0)
+
+    async def test_concurrent_contexts(self):
+        async with MySQLSource(self.source_config) as source:
+            async with source() as sctx:
+                await sctx.update_many(
+                    [
+                        Record(str(i), data={"features": {"x": i}})
+                        for i in range(0, 3)
+                    ]
+                )
+
+            async def read():
+                async with source() as sctx:
+                    return [record.key async for record in sctx.records()]
+
+            for keys in await asyncio.gather(read(), read()):
+                self.assertEqual(keys, ["0", "1", "2"])
+            # Open contexts don't hold connections, there can be more of them
+            # than the pool has
+            async with source() as actx, source() as bctx, source() as cctx:
+                for sctx in (actx, bctx, cctx):
+                    self.assertEqual((await sctx.record("1")).feature("x"), 1)
+        self.assertEqual(self.pool.max_acquired, 2)
+        self.assertEqual(self.pool.acquired, 0)
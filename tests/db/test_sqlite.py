@@ -1,11 +1,15 @@
 import os
+import asyncio
 import tempfile
+from unittest import mock
 
 from dffml.util.asynctestcase import AsyncTestCase
 from dffml.db.sqlite import SqliteDatabase, SqliteDatabaseConfig
 
 
 class TestSqlDatabase(AsyncTestCase):
+    CONNECTIONS = 0
+
     @classmethod
     def setUpClass(cls):
         fileno, cls.database_name = tempfile.mkstemp(suffix=".db")
@@ -17,7 +21,11 @@ class TestSqlDatabase(AsyncTestCase):
 
     async def setUp(self):
         self.sdb = SqliteDatabase(
-            SqliteDatabaseConfig(filename=self.database_name)
+            SqliteDatabaseConfig(
+                filename=self.database_name,
+                connections=self.CONNECTIONS,
+                fetch_size=2,
+            )
         )
         await self.sdb.__aenter__()
         self.table_name = "myTable"
@@ -100,3 +108,112 @@ class TestSqlDatabase(AsyncTestCase):
             await db_ctx.insert_or_update(self.table_name, data)
             results = [row async for row in db_ctx.lookup(self.table_name)]
             self.assertEqual(results, expected)
+
+    async def test_5_insert_many(self):
+        rows = [
+            {"key": i, "firstName": "Jane", "lastName": str(i), "age": i}
+            for i in range(20, 30)
+        ]
+        async with self.sdb() as db_ctx:
+            await db_ctx.insert_many(self.table_name, rows)
+            results = [
+                row
+                async for row in db_ctx.lookup(
+                    self.table_name, conditions=[[["firstName", "=", "Jane"]]]
+                )
+            ]
+            self.assertEqual(results, rows)
+
+    async def test_6_concurrent_lookup(self):
+        async def lookup():
+            async with self.sdb() as db_ctx:
+                return [
+                    row["key"]
+                    async for row in db_ctx.lookup(self.table_name, ["key"])
+                ]
+
+        results = await asyncio.gather(*[lookup() for _ in range(0, 4)])
+        for keys in results:
+            self.assertEqual(keys, [12] + list(range(20, 30)))
+
+    async def test_7_insert_or_update_many(self):
+        rows = [
+            {"key": 12, "firstName": "Bill", "lastName": "Smith"},
+            {"key": 20, "firstName": "Janet", "lastName": "Smith"},
+            {"key": 40, "firstName": "Jack", "lastName": "Smith"},
+        ]
+        async with self.sdb() as db_ctx:
+            await db_ctx.insert_or_update_many(self.table_name, rows)
+            results = [
+                row
+                async for row in db_ctx.lookup(
+                    self.table_name, conditions=[[["lastName", "=", "Smith"]]],
+                )
+            ]
+            # Columns not given are left as they were
+            self.assertEqual(
+                results,
+                [
+                    {**rows[0], "age": 40.0},
+                    {**rows[1], "age": 20.0},
+                    {**rows[2], "age": None},
+                ],
+            )
+
+    async def test_8_insert_or_update_unique(self):
+        table_name = "uniqueTable"
+        async with self.sdb() as db_ctx:
+            await db_ctx.create_table(
+                table_name, {"name": "text UNIQUE", "age": "real"}
+            )
+            await db_ctx.insert(table_name, {"name": "John", "age": 16})
+            # There's no primary key, rows conflict on the UNIQUE column
+            await db_ctx.insert_or_update_many(
+                table_name,
+                [{"name": "John", "age": 17}, {"name": "Jane", "age": 18}],
+            )
+            results = [row async for row in db_ctx.lookup(table_name)]
+            self.assertEqual(
+                results,
+                [{"name": "John", "age": 17}, {"name": "Jane", "age": 18}],
+            )
+
+
+class TestSqlDatabasePooled(TestSqlDatabase):
+    CONNECTIONS = 2
+
+    async def test_9_update_in_lookup(self):
+        async with self.sdb() as db_ctx:
+            async for row in db_ctx.lookup(self.table_name, ["key"]):
+                await db_ctx.update(
+                    self.table_name,
+                    {"age": 50},
+                    conditions=[[["key", "=", row["key"]]]],
+                )
+            self.assertEqual(
+                {
+                    row["age"]
+                    async for row in db_ctx.lookup(self.table_name, ["age"])
+                },
+                {50},
+            )
+
+    def test_one_connection(self):
+        with self.assertRaisesRegex(ValueError, "connections"):
+            SqliteDatabase(
+                SqliteDatabaseConfig(
+                    filename=self.database_name, connections=1
+                )
+            )
+
+
+class TestSqlDatabaseNoUpsert(TestSqlDatabase):
+    """
+    SQLite older than 3.24 has no INSERT ... ON CONFLICT DO UPDATE
+    """
+
+    async def setUp(self):
+        patcher = mock.patch("dffml.db.sqlite.SQLITE_UPSERT", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        await super().setUp()
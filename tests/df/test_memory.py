@@ -1,3 +1,6 @@
+import asyncio
+import os
+import threading
 from unittest.mock import patch
 from typing import NamedTuple
 
@@ -13,13 +16,21 @@ from dffml import (
 )
 from dffml.util.cli.arg import Arg, parse_unknown
 from dffml.util.entrypoint import entrypoint
-from dffml.df.types import Definition, DataFlow, Input
-from dffml.df.base import op, BaseKeyValueStore
+from dffml.df.types import Definition, DataFlow, Input, Parameter
+from dffml.df.base import op, BaseKeyValueStore, StringInputSetContext
+from dffml.operation.output import remap, RemapConfig
 from dffml.df.memory import (
+    MemoryInputSet,
+    MemoryInputSetConfig,
+    MemoryParameterSet,
+    MemoryParameterSetConfig,
     MemoryKeyValueStore,
     MemoryRedundancyChecker,
     MemoryRedundancyCheckerConfig,
+    MemoryLockNetworkContext,
     MemoryOrchestrator,
+    MemoryOperationImplementationNetwork,
+    MemoryOperationImplementationNetworkConfig,
 )
 from dffml.util.asynctestcase import AsyncTestCase
 
@@ -45,6 +56,11 @@ def load_kvstore_with_args(loading=None):
     return [KeyValueStoreWithArguments]
 
 
+@op
+async def pair(a: int, b: int) -> str:
+    return f"{a}:{b}"
+
+
 class TestMemoryRedundancyChecker(AsyncTestCase):
     @patch.object(BaseKeyValueStore, "load", load_kvstore_with_args)
     def test_args(self):
@@ -64,7 +80,15 @@ class TestMemoryRedundancyChecker(AsyncTestCase):
                                         default=MemoryKeyValueStore(),
                                     ),
                                     "config": {},
-                                }
+                                },
+                                "key": {
+                                    "plugin": Arg(
+                                        type=str,
+                                        help="Key creation method, 'tuple' (kept in memory) or 'sha384' (for persistent or shared key value stores). Defaults to 'tuple' for MemoryKeyValueStore, otherwise 'sha384'",
+                                        default=None,
+                                    ),
+                                    "config": {},
+                                },
                             },
                         }
                     },
@@ -89,6 +113,84 @@ class TestMemoryRedundancyChecker(AsyncTestCase):
             )
             self.assertEqual(was.kvstore.config.filename, "somefile")
 
+    async def test_key(self):
+        for key in MemoryRedundancyChecker.KEYS:
+            with self.subTest(key=key):
+                dataflow = DataFlow(pair)
+                operation = dataflow.operations[pair.op.name]
+                ctx = StringInputSetContext("key")
+                parameter_sets = [
+                    MemoryParameterSet(
+                        MemoryParameterSetConfig(
+                            ctx=ctx,
+                            parameters=[
+                                Parameter(
+                                    key=input_name,
+                                    value=item.value,
+                                    origin=item,
+                                    definition=item.definition,
+                                )
+                                for input_name, item in inputs.items()
+                            ],
+                        )
+                    )
+                    for inputs in [
+                        {
+                            "a": Input(
+                                value=1, definition=pair.op.inputs["a"]
+                            ),
+                            "b": Input(
+                                value=2, definition=pair.op.inputs["b"]
+                            ),
+                        },
+                        {
+                            "a": Input(
+                                value=3, definition=pair.op.inputs["a"]
+                            ),
+                            "b": Input(
+                                value=4, definition=pair.op.inputs["b"]
+                            ),
+                        },
+                    ]
+                ]
+                async with MemoryRedundancyChecker(
+                    MemoryRedundancyCheckerConfig(key=key)
+                ) as rchecker:
+                    async with rchecker() as rctx:
+                        self.assertEqual(
+                            [
+                                taken
+                                async for _, taken in rctx.take_if_non_existant(
+                                    operation,
+                                    parameter_sets[0],
+                                    parameter_sets[0],
+                                    parameter_sets[1],
+                                )
+                            ],
+                            [True, False, True],
+                        )
+                        self.assertEqual(
+                            [
+                                taken
+                                async for _, taken in rctx.take_if_non_existant(
+                                    operation, *parameter_sets
+                                )
+                            ],
+                            [False, False],
+                        )
+                        # Keys are stored as unique creates them
+                        if key == "tuple":
+                            self.assertIn(
+                                await rctx.unique(
+                                    operation, parameter_sets[0]
+                                ),
+                                rctx.taken["key"],
+                            )
+
+    def test_key_invalid(self):
+        with self.assertRaises(ValueError):
+            MemoryRedundancyChecker(MemoryRedundancyCheckerConfig(key="md5"))
+
 
 CONDITION = Definition(name="condition", primitive="boolean")
 
@@ -202,3 +304,438 @@ class TestMemoryOperationImplementationNetworkContext(AsyncTestCase):
         except OperationException as error:
             self.assertEqual(error.__cause__.__class__, Exception)
             self.assertEqual(error.__cause__.args[0], "Failure 2")
+
+
+@op(
+    inputs={"value": Definition(name="value", primitive="int")},
+    outputs={"result": Definition(name="doubled", primitive="int")},
+)
+async def double(value: int):
+    return {"result": value * 2}
+
+
+class TestMemoryInputNetworkContext(AsyncTestCase):
+    async def test_gather_inputs_new_input_set(self):
+        dataflow = DataFlow(pair)
+        operation = dataflow.operations[pair.op.name]
+        async with MemoryOrchestrator() as orchestrator:
+            async with orchestrator(dataflow) as octx:
+                ctx = StringInputSetContext("gather")
+
+                async def add_and_gather(value, definition):
+                    input_set = MemoryInputSet(
+                        MemoryInputSetConfig(
+                            ctx=ctx,
+                            inputs=[Input(value=value, definition=definition)],
+                        )
+                    )
+                    await octx.ictx.add(input_set)
+                    return sorted(
+                        [
+                            (await parameter_set._asdict())
+                            async for parameter_set in octx.ictx.gather_inputs(
+                                octx.rctx,
+                                operation,
+                                dataflow,
+                                ctx=ctx,
+                                new_input_set=input_set,
+                            )
+                        ],
+                        key=lambda parameters: tuple(parameters.values()),
+                    )
+
+                self.assertEqual(
+                    await add_and_gather(1, pair.op.inputs["a"]), []
+                )
+                self.assertEqual(
+                    await add_and_gather(2, pair.op.inputs["a"]), []
+                )
+                self.assertEqual(
+                    await add_and_gather(10, pair.op.inputs["b"]),
+                    [{"a": 1, "b": 10}, {"a": 2, "b": 10}],
+                )
+                self.assertEqual(
+                    await add_and_gather(3, pair.op.inputs["a"]),
+                    [{"a": 3, "b": 10}],
+                )
+                self.assertEqual(
+                    await add_and_gather(20, pair.op.inputs["b"]),
+                    [{"a": 1, "b": 20}, {"a": 2, "b": 20}, {"a": 3, "b": 20},],
+                )
+
+    async def test_remove_ctx(self):
+        async with MemoryOrchestrator() as orchestrator:
+            async with orchestrator(DataFlow(pair)) as octx:
+                async for _ctx, _results in octx.run(
+                    {
+                        str(i): [
+                            Input(value=i, definition=pair.op.inputs["a"]),
+                            Input(value=i, definition=pair.op.inputs["b"]),
+                        ]
+                        for i in range(0, 10)
+                    }
+                ):
+                    pass
+                self.assertFalse(octx.ictx.ctxhd)
+                self.assertFalse(octx.ictx.ctxhd_locks)
+                self.assertFalse(octx.ictx.input_notification_set)
+
+    async def test_ctx_lock_removed(self):
+        async with MemoryOrchestrator() as orchestrator:
+            async with orchestrator(DataFlow(pair)) as octx:
+                inside = []
+
+                async def hold():
+                    async with octx.ictx.ctx_lock("a"):
+                        inside.append(None)
+                        self.assertEqual(len(inside), 1)
+                        await asyncio.sleep(0.01)
+                        inside.pop()
+
+                async with octx.ictx.ctx_lock("a"):
+                    waiting = asyncio.create_task(hold())
+                    await asyncio.sleep(0)
+                    # Removed as remove_ctx does, while held
+                    octx.ictx.ctxhd_locks.pop("a")
+                # Whatever was waiting on the removed lock must not run at the
+                # same time as something holding the lock which replaced it
+                await asyncio.gather(waiting, hold())
+
+    async def test_remove_ctx_reused(self):
+        # remap runs a dataflow using the input network of the context it's
+        # run within. Finishing that must not remove the inputs the other
+        # output operations need.
+        dataflow = DataFlow(
+            double,
+            remap,
+            GetSingle,
+            configs={
+                remap.op.name: RemapConfig(dataflow=DataFlow(GetSingle)),
+            },
+        )
+        async for _ctx, results in run(
+            dataflow,
+            [
+                Input(value=3, definition=double.op.inputs["value"]),
+                Input(
+                    value={"x": ["doubled"]},
+                    definition=remap.op.inputs["spec"],
+                ),
+                Input(
+                    value=["doubled"], definition=GetSingle.op.inputs["spec"]
+                ),
+            ],
+        ):
+            self.assertEqual(
+                results,
+                {remap.op.name: {"x": 6}, GetSingle.op.name: {"doubled": 6}},
+            )
+
+
+LOCKED = Definition(name="locked", primitive="int", lock=True)
+
+
+@op(
+    inputs={"value": LOCKED},
+    outputs={"result": Definition(name="incremented", primitive="int")},
+)
+async def locked_increment(value: int):
+    return {"result": value + 1}
+
+
+WITH_DEFAULT = Definition(name="with_default", primitive="int", default=5)
+
+
+@op(inputs={"value": WITH_DEFAULT})
+async def only_default(value: int) -> int:
+    return value
+
+
+@op(inputs={"a": pair.op.inputs["a"], "value": WITH_DEFAULT})
+async def add_default(a: int, value: int) -> int:
+    return a + value
+
+
+class TestMemoryOrchestratorContextDefaults(AsyncTestCase):
+    async def test_defaults(self):
+        async for _ctx, results in run(
+            DataFlow(only_default, add_default, GetSingle),
+            [
+                Input(value=1, definition=pair.op.inputs["a"]),
+                Input(
+                    value=[
+                        only_default.op.outputs["result"].name,
+                        add_default.op.outputs["result"].name,
+                    ],
+                    definition=GetSingle.op.inputs["spec"],
+                ),
+            ],
+        ):
+            self.assertEqual(
+                results,
+                {
+                    only_default.op.outputs["result"].name: 5,
+                    add_default.op.outputs["result"].name: 6,
+                },
+            )
+
+
+class TestMemoryOrchestratorContextStats(AsyncTestCase):
+    async def test_flat(self):
+        async with MemoryOrchestrator() as orchestrator:
+            async with orchestrator(
+                DataFlow(locked_increment, GetSingle)
+            ) as octx:
+                for i in range(0, 3):
+                    async for ctx, results in octx.run(
+                        {
+                            str(j): [
+                                Input(value=j, definition=LOCKED),
+                                Input(
+                                    value=["incremented"],
+                                    definition=GetSingle.op.inputs["spec"],
+                                ),
+                            ]
+                            for j in range(0, 5)
+                        }
+                    ):
+                        self.assertEqual(
+                            results["incremented"],
+                            int((await ctx.handle()).as_string()) + 1,
+                        )
+                    self.assertEqual(
+                        octx.stats(),
+                        {
+                            "operations_running": 0,
+                            "operations_queued": 0,
+                            "operations_queued_max": 0,
+                            "contexts": 0,
+                            "inputs": 0,
+                            "locks": 0,
+                            "redundancy_keys": 0,
+                        },
+                    )
+                self.assertFalse(
+                    octx.ictx.ctx_notification_set.notification_items
+                )
+
+    async def test_reuse(self):
+        ran = []
+
+        @op(inputs={"value": LOCKED})
+        async def count(value: int):
+            ran.append(value)
+
+        dataflow = DataFlow(count, locked_increment, GetSingle)
+        async with MemoryOrchestrator() as orchestrator:
+            async with orchestrator(dataflow) as octx:
+                ctx = await octx.ictx.sadd(
+                    "a",
+                    Input(value=1, definition=LOCKED),
+                    Input(
+                        value=["incremented"],
+                        definition=GetSingle.op.inputs["spec"],
+                    ),
+                )
+                # Run the context using all the networks of the parent
+                async with orchestrator(
+                    dataflow,
+                    reuse={
+                        "ictx": octx.ictx,
+                        "lctx": octx.lctx,
+                        "rctx": octx.rctx,
+                    },
+                ) as child:
+                    async for _ctx, results in child.run(ctx=ctx):
+                        self.assertEqual(results, {"incremented": 2})
+                # Networks which belong to the parent still hold the context,
+                # so operations the child ran aren't run again
+                self.assertEqual(octx.stats()["contexts"], 1)
+                self.assertTrue(octx.stats()["redundancy_keys"])
+                async for _ctx, _results in octx.run(ctx=ctx):
+                    pass
+                self.assertEqual(ran, [1])
+                self.assertEqual(
+                    octx.stats(),
+                    {
+                        "operations_running": 0,
+                        "operations_queued": 0,
+                        "operations_queued_max": 0,
+                        "contexts": 0,
+                        "inputs": 0,
+                        "locks": 0,
+                        "redundancy_keys": 0,
+                    },
+                )
+
+
+class TestMemoryOrchestratorContextLocking(AsyncTestCase):
+    async def acquired(self, dataflow, inputs):
+        acquired = []
+        acquire = MemoryLockNetworkContext.acquire
+
+        def track(lctx, parameter_set):
+            acquired.append(parameter_set)
+            return acquire(lctx, parameter_set)
+
+        with patch.object(MemoryLockNetworkContext, "acquire", new=track):
+            async for _ctx, _results in run(dataflow, inputs):
+                pass
+        return acquired
+
+    async def test_lock_not_required(self):
+        self.assertFalse(
+            await self.acquired(
+                DataFlow(pair),
+                [
+                    Input(value=1, definition=pair.op.inputs["a"]),
+                    Input(value=2, definition=pair.op.inputs["b"]),
+                ],
+            )
+        )
+
+    async def test_lock_required(self):
+        self.assertEqual(
+            len(
+                await self.acquired(
+                    DataFlow(locked_increment),
+                    [Input(value=1, definition=LOCKED)],
+                )
+            ),
+            1,
+        )
+
+
+class TestMemoryOrchestratorConcurrency(AsyncTestCase):
+    async def run_limited(self, max_operations=None, max_concurrent=None):
+        running = {"now": 0, "max": 0}
+
+        @op(max_concurrent=max_concurrent)
+        async def track(value: int) -> int:
+            running["now"] += 1
+            running["max"] = max(running["now"], running["max"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return value
+
+        async with MemoryOrchestrator(
+            max_operations=max_operations
+        ) as orchestrator:
+            async with orchestrator(DataFlow(track)) as octx:
+                async for _ctx, _results in octx.run(
+                    [
+                        Input(value=i, definition=track.op.inputs["value"])
+                        for i in range(0, 10)
+                    ]
+                ):
+                    pass
+                stats = octx.stats()
+        return running["max"], stats
+
+    async def test_unlimited(self):
+        most, stats = await self.run_limited()
+        self.assertEqual(most, 10)
+        self.assertEqual(stats["operations_queued_max"], 0)
+
+    async def test_max_operations(self):
+        most, stats = await self.run_limited(max_operations=2)
+        self.assertEqual(most, 2)
+        self.assertEqual(stats["operations_queued_max"], 8)
+        self.assertEqual(stats["operations_queued"], 0)
+        self.assertEqual(stats["operations_running"], 0)
+
+    async def test_max_concurrent(self):
+        most, stats = await self.run_limited(max_concurrent=3)
+        self.assertEqual(most, 3)
+        self.assertEqual(stats["operations_queued_max"], 7)
+
+
+class TestMemoryOrchestratorContextStreaming(AsyncTestCase):
+    async def test_max_ctxs(self):
+        pulled = []
+        running = {"now": 0, "max": 0}
+
+        @op
+        async def track(value: int) -> int:
+            running["now"] += 1
+            running["max"] = max(running["now"], running["max"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return value
+
+        async def input_sets():
+            for i in range(0, 10):
+                pulled.append(i)
+                # Never more than max_ctxs contexts seeded but not completed
+                self.assertLessEqual(len(pulled) - len(completed), 2)
+                yield str(i), [
+                    Input(value=i, definition=track.op.inputs["value"]),
+                    Input(
+                        value=[track.op.outputs["result"].name],
+                        definition=GetSingle.op.inputs["spec"],
+                    ),
+                ]
+
+        completed = []
+        async with MemoryOrchestrator(max_ctxs=2) as orchestrator:
+            async with orchestrator(DataFlow(track, GetSingle)) as octx:
+                async for ctx, results in octx.run(input_sets()):
+                    completed.append((await ctx.handle()).as_string())
+                    self.assertEqual(
+                        results[track.op.outputs["result"].name],
+                        int(completed[-1]),
+                    )
+
+        self.assertEqual(sorted(map(int, completed)), pulled)
+        self.assertEqual(running["max"], 2)
+
+
+@op(executor="thread")
+def thread_ident() -> int:
+    return threading.get_ident()
+
+
+@op(executor="process")
+def process_pid() -> int:
+    return os.getpid()
+
+
+class TestMemoryOperationImplementationNetworkExecutor(AsyncTestCase):
+    async def test_executor(self):
+        for func, current in [
+            (thread_ident, threading.get_ident()),
+            (process_pid, os.getpid()),
+        ]:
+            with self.subTest(executor=func.op.executor):
+                async for _ctx, results in run(
+                    DataFlow(func, GetSingle),
+                    [
+                        Input(
+                            value=[func.op.outputs["result"].name],
+                            definition=GetSingle.op.inputs["spec"],
+                        )
+                    ],
+                ):
+                    self.assertNotEqual(
+                        results[func.op.outputs["result"].name], current
+                    )
+
+    async def test_pool_not_entered(self):
+        network = MemoryOperationImplementationNetwork(
+            MemoryOperationImplementationNetworkConfig()
+        )
+        with self.assertRaisesRegex(RuntimeError, "async with"):
+            network.pool("thread")
+        async with network:
+            pool = network.pool("thread")
+            self.assertIs(network.pool("thread"), pool)
+        # Pools are shut down on exit
+        with self.assertRaisesRegex(RuntimeError, "async with"):
+            network.pool("thread")
+
+    def test_executor_async(self):
+        with self.assertRaisesRegex(ValueError, "executor"):
+
+            @op(executor="thread")
+            async def not_offloadable():
+                pass  # pragma: no cover
@@ -0,0 +1,155 @@
+import os
+import pathlib
+from unittest import mock
+
+import numpy
+
+from dffml.record import Record
+from dffml.source.csv import CSVSource
+from dffml.source.json import JSONSource
+from dffml.source.memory import MemorySource
+from dffml.source.cache import FeatureCacheSource
+from dffml.util.testing.source import SourceTest
+from dffml.util.asynctestcase import AsyncTestCase
+
+
+class TestFeatureCacheSource(SourceTest, AsyncTestCase):
+    async def setUp(self):
+        await super().setUp()
+        self.testfile = pathlib.Path(self.mktempfile() + ".csv")
+        self.cachedir = pathlib.Path(self.mktempdir())
+
+    async def setUpSource(self):
+        return FeatureCacheSource(
+            source=CSVSource(
+                filename=self.testfile, allowempty=True, readwrite=True
+            ),
+            directory=self.cachedir,
+        )
+
+    async def read_batches(self, source, features):
+        # Cached data is only used until the file changes, so read without
+        # rewriting the file on close
+        if getattr(source.config.source.config, "readwrite", False):
+            source = FeatureCacheSource(
+                source=CSVSource(filename=self.testfile),
+                directory=self.cachedir,
+            )
+        async with source, source() as sctx:
+            return [
+                (batch.keys, {k: list(v) for k, v in batch.features.items()})
+                async for batch in sctx.batches(features, 2)
+            ]
+
+    async def test_cached(self):
+        source = await self.setUpSource()
+        async with source, source() as sctx:
+            await sctx.update_many(
+                [
+                    Record(str(i), data={"features": {"x": i, "y": i / 2}})
+                    for i in range(3)
+                ]
+            )
+        # Batches which cache the feature data are arrays from the cache too
+        source = FeatureCacheSource(
+            source=CSVSource(filename=self.testfile), directory=self.cachedir,
+        )
+        async with source, source() as sctx:
+            async for batch in sctx.batches(["x", "y"], 2):
+                self.assertIsInstance(batch.features["x"], numpy.memmap)
+        batches = await self.read_batches(source, ["x", "y"])
+        self.assertEqual(
+            batches,
+            [
+                (["0", "1"], {"x": [0, 1], "y": [0.0, 0.5]}),
+                (["2"], {"x": [2], "y": [1.0]}),
+            ],
+        )
+        # Read from memory mapped cache files without reading the file
+        with mock.patch.object(
+            CSVSource, "read_opener", side_effect=AssertionError
+        ):
+            self.assertEqual(
+                await self.read_batches(source, ["x", "y"]), batches
+            )
+            source = FeatureCacheSource(
+                source=CSVSource(filename=self.testfile),
+                directory=self.cachedir,
+            )
+            async with source, source() as sctx:
+                async for batch in sctx.batches(["x", "y"], 2):
+                    self.assertIsInstance(batch.features["x"], numpy.memmap)
+                    # Copy-on-write, changes aren't written to the cache
+                    batch.features["x"][0] = 10
+        self.assertEqual(await self.read_batches(source, ["x", "y"]), batches)
+        # Other features are cached separately
+        self.assertEqual(
+            await self.read_batches(source, ["y"]),
+            [(["0", "1"], {"y": [0.0, 0.5]}), (["2"], {"y": [1.0]})],
+        )
+
+    async def test_file_changed(self):
+        source = await self.setUpSource()
+        async with source, source() as sctx:
+            await sctx.update(Record("0", data={"features": {"x": 0}}))
+        self.assertEqual(
+            await self.read_batches(source, ["x"]), [(["0"], {"x": [0]})]
+        )
+        # Write the file without going through the cache source
+        async with source.config.source, source.config.source() as sctx:
+            await sctx.update(Record("1", data={"features": {"x": 1}}))
+        # Modification time may not have changed if quick enough
+        stat = os.stat(self.testfile)
+        os.utime(
+            self.testfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9)
+        )
+        self.assertEqual(
+            await self.read_batches(source, ["x"]),
+            [(["0", "1"], {"x": [0, 1]})],
+        )
+        # Only data cached since the file last changed is kept
+        self.assertEqual(len(list(self.cachedir.glob("*/*/*"))), 1)
+
+    async def test_not_cached(self):
+        records = [
+            Record("0", data={"features": {"x": 0, "y": [1, 2]}}),
+            Record("1", data={"features": {"x": "a", "y": [3]}}),
+        ]
+        filename = pathlib.Path(self.mktempfile() + ".json")
+        async with JSONSource(
+            filename=filename, allowempty=True, readwrite=True
+        ) as source, source() as sctx:
+            await sctx.update_many(records)
+        source = FeatureCacheSource(
+            source=JSONSource(filename=filename), directory=self.cachedir,
+        )
+        # Mixed types and ragged arrays are read from the source every time
+        for features in (["x"], ["y"]):
+            for _ in range(2):
+                self.assertEqual(
+                    [record.feature(features[0]) for record in records],
+                    (await self.read_batches(source, features))[0][1][
+                        features[0]
+                    ],
+                )
+        self.assertFalse(list(self.cachedir.rglob("*.npy")))
+
+    async def test_no_file(self):
+        records = [
+            Record(str(i), data={"features": {"x": i}}) for i in range(3)
+        ]
+        source = FeatureCacheSource(
+            source=MemorySource(records=records), directory=self.cachedir,
+        )
+        # Nothing to tell when the data changes, so it's never cached
+        with self.assertLogs(source.logger, level="WARNING"):
+            self.assertEqual(
+                await self.read_batches(source, ["x"]),
+                [(["0", "1"], {"x": [0, 1]}), (["2"], {"x": [2]})],
+            )
+        records[0].evaluated({"x": 5})
+        self.assertEqual(
+            await self.read_batches(source, ["x"]),
+            [(["0", "1"], {"x": [5, 1]}), (["2"], {"x": [2]})],
+        )
+        self.assertFalse(list(self.cachedir.rglob("*.npy")))
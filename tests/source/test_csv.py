@@ -7,10 +7,15 @@ import random
 import pathlib
 import inspect
 
-from dffml.source.csv import CSVSource, CSVSourceConfig
+from dffml.source.csv import (
+    CSVSource,
+    CSVSourceConfig,
+    CSVSourceStreamReadOnlyError,
+)
 from dffml.util.testing.source import FileSourceTest
 from dffml.util.asynctestcase import AsyncTestCase
 from dffml.record import Record
+from dffml.feature import Feature, Features
 from dffml.util.cli.arg import parse_unknown
 
 
@@ -110,3 +115,178 @@ class TestCSVSource(FileSourceTest, AsyncTestCase):
                     record_b = await sctx.record("b")
                     self.assertEqual(record_a.feature("ValueColumn"), 42)
                     self.assertEqual(record_b.feature("ValueColumn"), 420)
+
+    async def test_stream(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            testfile = pathlib.Path(testdir, "stream.csv")
+            testfile.write_text(
+                inspect.cleandoc(
+                    """
+                    key,tag,value
+                    a,untagged,42
+                    b,other,420
+                    c,untagged,"quoted
+                    newline"
+                    d,untagged,4200
+                    """
+                )
+            )
+            for index in [None, pathlib.Path(testdir, "index")]:
+                with self.subTest(index=index):
+                    async with CSVSource(
+                        CSVSourceConfig(
+                            filename=testfile, stream=True, index=index
+                        )
+                    ) as source:
+                        self.assertFalse(source.mem)
+                        async with source() as sctx:
+                            self.assertEqual(
+                                [
+                                    record.key
+                                    async for record in sctx.records()
+                                ],
+                                ["a", "c", "d"],
+                            )
+                            record = await sctx.record("d")
+                            self.assertEqual(record.feature("value"), 4200)
+                            record = await sctx.record("c")
+                            self.assertEqual(
+                                record.feature("value"), "quoted\nnewline"
+                            )
+                            # Other tags are not found
+                            record = await sctx.record("b")
+                            self.assertFalse(record.features())
+                            with self.assertRaises(
+                                CSVSourceStreamReadOnlyError
+                            ):
+                                await sctx.update(Record("e"))
+
+    async def test_stream_blank_lines(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            testfile = pathlib.Path(testdir, "stream.csv")
+            testfile.write_text('key,x\na,1\n\nb,2\n\r\nc,"3\n\n4"\nd,5\n')
+            for index in [None, pathlib.Path(testdir, "index")]:
+                with self.subTest(index=index):
+                    async with CSVSource(
+                        CSVSourceConfig(
+                            filename=testfile, stream=True, index=index
+                        )
+                    ) as source, source() as sctx:
+                        self.assertEqual(
+                            {
+                                key: (await sctx.record(key)).feature("x")
+                                for key in ["a", "b", "c", "d"]
+                            },
+                            {"a": 1, "b": 2, "c": "3\n\n4", "d": 5},
+                        )
+
+    async def test_stream_index_rebuilt(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            testfile = pathlib.Path(testdir, "stream.csv")
+            config = CSVSourceConfig(
+                filename=testfile,
+                stream=True,
+                index=pathlib.Path(testdir, "index"),
+            )
+            for contents, key, expected in [
+                ("value\n1\n2\n", "1", 2),
+                ("value\n1\n2\n20000\n", "2", 20000),
+            ]:
+                testfile.write_text(contents)
+                async with CSVSource(config) as source:
+                    async with source() as sctx:
+                        record = await sctx.record(key)
+                        self.assertEqual(record.feature("value"), expected)
+
+    async def test_stream_readwrite(self):
+        with self.assertRaises(CSVSourceStreamReadOnlyError):
+            CSVSource(
+                CSVSourceConfig(
+                    filename="feedface", stream=True, readwrite=True
+                )
+            )
+
+    async def test_dtypes(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            testfile = pathlib.Path(testdir, "dtypes.csv")
+            testfile.write_text(
+                inspect.cleandoc(
+                    """
+                    key, count, ratio, zipcode, flag, other, prediction_flag, confidence_flag
+                    a, 42, 0.5, 01234, yes, 42, True, 0.9
+                    b, 1e3, 1, 98765, false, "[1, 2]",,
+                    """
+                )
+            )
+            async with CSVSource(
+                CSVSourceConfig(
+                    filename=testfile,
+                    dtypes=Features(
+                        Feature("count", int, 1),
+                        Feature("ratio", float, 1),
+                        Feature("zipcode", str, 1),
+                        Feature("flag", bool, 1),
+                    ),
+                )
+            ) as source:
+                async with source() as sctx:
+                    record_a = await sctx.record("a")
+                    record_b = await sctx.record("b")
+            self.assertEqual(
+                record_a.features(),
+                {
+                    "count": 42,
+                    "ratio": 0.5,
+                    "zipcode": "01234",
+                    "flag": True,
+                    "other": 42,
+                },
+            )
+            self.assertEqual(record_a.prediction("flag").value, "True")
+            self.assertEqual(record_a.prediction("flag").confidence, 0.9)
+            # Values which can't be cast are parsed as Python literals
+            self.assertEqual(
+                record_b.features(),
+                {
+                    "count": 1000.0,
+                    "ratio": 1.0,
+                    "zipcode": "98765",
+                    "flag": False,
+                    "other": [1, 2],
+                },
+            )
+            self.assertFalse(record_b.data.prediction)
+
+    async def test_stream_batches(self):
+        with tempfile.TemporaryDirectory() as testdir:
+            testfile = pathlib.Path(testdir, "stream.csv")
+            testfile.write_text(
+                inspect.cleandoc(
+                    """
+                    key,tag,a,b
+                    a,untagged,1,x
+                    b,other,2,y
+                    c,untagged,3,
+                    d,untagged,4,z
+                    e,untagged,5,w
+                    """
+                )
+            )
+            async with CSVSource(
+                CSVSourceConfig(filename=testfile, stream=True)
+            ) as source:
+                async with source() as sctx:
+                    batches = [
+                        batch async for batch in sctx.batches(["a", "b"], 2)
+                    ]
+            # Rows with other tags or missing features are skipped
+            self.assertEqual(
+                [batch.keys for batch in batches], [["a", "d"], ["e"]]
+            )
+            self.assertEqual(
+                [
+                    {k: v.tolist() for k, v in batch.features.items()}
+                    for batch in batches
+                ],
+                [{"a": [1, 4], "b": ["x", "z"]}, {"a": [5], "b": ["w"]}],
+            )
@@ -39,6 +39,10 @@ class TestDataFrameSource(AsyncTestCase):
             ),
         )
 
+        # Appended to the DataFrame which was passed in
+        self.assertEqual(df["A"].tolist(), [1, 4, 7])
+        self.assertIs(source.config.dataframe, df)
+
         # Load all the records
         records = [record async for record in load(source)]
 
@@ -102,3 +106,50 @@ class TestDataFrameSource(AsyncTestCase):
                 "C": {"confidence": 0.0, "value": 14},
             },
         )
+
+    async def test_batches(self):
+        df = pd.DataFrame({"A": range(0, 5), "B": range(5, 10), "C": [0] * 5})
+        source = DataFrameSource(
+            DataFrameSourceConfig(dataframe=df, predictions=["C"])
+        )
+        async with source, source() as sctx:
+            batches = [batch async for batch in sctx.batches(["A", "B"], 2)]
+            self.assertEqual(
+                [batch.keys for batch in batches],
+                [["0", "1"], ["2", "3"], ["4"]],
+            )
+            self.assertEqual(
+                [list(batch.features["B"]) for batch in batches],
+                [[5, 6], [7, 8], [9]],
+            )
+            # Prediction columns are not features
+            self.assertFalse([batch async for batch in sctx.batches(["C"])])
+
+    async def test_record(self):
+        df = pd.DataFrame({"A": [1, 2], "C": [3, 4]})
+        source = DataFrameSource(
+            DataFrameSourceConfig(dataframe=df, predictions=["C"])
+        )
+        async with source, source() as sctx:
+            record = await sctx.record("1")
+            self.assertEqual(record.features(), {"A": 2})
+            self.assertEqual(record.prediction("C")["value"], 4)
+            self.assertFalse((await sctx.record("missing")).features())
+
+    async def test_update_existing_rows(self):
+        df = pd.DataFrame({"A": range(0, 4), "C": [0] * 4})
+        source = DataFrameSource(
+            DataFrameSourceConfig(dataframe=df, predictions=["C"])
+        )
+        async with source:
+            async with source() as sctx:
+                async for record in sctx.records():
+                    record.predicted(
+                        "C", record.feature("A") * 10, float("nan")
+                    )
+                    await sctx.update(record)
+                # Not written until the context exits
+                self.assertEqual(df["C"].tolist(), [0] * 4)
+            # Written in place to the rows the records were read from
+            self.assertEqual(df["C"].tolist(), [0, 10, 20, 30])
+            self.assertIs(source.config.dataframe, df)
@@ -3,6 +3,8 @@ import sqlite3
 import tempfile
 from typing import Dict
 
+import numpy
+
 from dffml.db.sqlite import SqliteDatabaseConfig, SqliteDatabase
 from dffml.util.asynctestcase import AsyncTestCase
 from dffml.util.testing.source import SourceTest
@@ -75,6 +77,40 @@ class TestDbSource(AsyncTestCase, SourceTest):
     async def setUpSource(self):
         return DbSource(self.source_config)
 
+    def execute(self, query, *args):
+        conn = sqlite3.connect(self.database_name)
+        conn.execute(query, args)
+        conn.commit()
+        conn.close()
+
+    async def test_batches_null(self):
+        self.execute(
+            "INSERT INTO `TestTable` (`key`, `feature_PetalLength`) "
+            "VALUES (?, ?)",
+            "null_feature",
+            1.5,
+        )
+        self.addCleanup(
+            self.execute,
+            "DELETE FROM `TestTable` WHERE `key` = ?",
+            "null_feature",
+        )
+        async with await self.setUpSource() as source, source() as sctx:
+            record = await sctx.record("null_feature")
+            self.assertFalse(record.features(["PetalLength", "PetalWidth"]))
+            async for batch in sctx.batches(["PetalLength", "PetalWidth"]):
+                # Rows with NULL for a feature don't have that feature
+                self.assertNotIn("null_feature", batch.keys)
+                self.assertIsInstance(
+                    batch.features["PetalLength"], numpy.ndarray
+                )
+            keys = [
+                key
+                async for batch in sctx.batches(["PetalLength"])
+                for key in batch.keys
+            ]
+            self.assertIn("null_feature", keys)
+
 
 # TODO: Potential shortcoming: Is there a way to call this source from the CLI and pass the db object (e.g. SqliteDatabase)?
 # dffml list records -sources primary=dbsource -source-db_implementation sqlite -source-table_name testTable -source-db ??? -source-model_columns "key feature_PetalLength feature_PetalWidth feature_SepalLength feature_SepalWidth target_name_confidence target_name_value"
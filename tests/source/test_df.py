@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from dffml.source.df import DataFlowSource, DataFlowSourceConfig
 from dffml.util.asynctestcase import AsyncTestCase
 from dffml.feature import Features, Feature
@@ -6,6 +8,7 @@ from dffml.source.memory import MemorySource, MemorySourceConfig
 from dffml.record import Record
 from dffml.df.base import op
 from dffml.df.types import Input, DataFlow, Definition, InputFlow
+from dffml.df.memory import MemoryOrchestratorContext
 from dffml.operation.output import AssociateDefinition
 
 
@@ -123,3 +126,93 @@ class TestDataFlowSource(AsyncTestCase):
         for i, record in enumerate(NEW_RECORDS):
             with self.subTest(i=i):
                 self.assertDictEqual(record.features(), records[i].features())
+
+    async def test_records_by_key(self):
+        # The dataflow updates the records of the source it wraps, use new ones
+        source = MemorySource(
+            MemorySourceConfig(
+                records=[
+                    Record(
+                        str(i),
+                        data={
+                            "features": {
+                                "Years": A[i],
+                                "Expertise": B[i],
+                                "Trust": C[i],
+                                "Salary": D[i],
+                            }
+                        },
+                    )
+                    for i in range(4)
+                ]
+            )
+        )
+        async with DataFlowSource(
+            self.config(
+                source=Sources(source),
+                dataflow=TEST_DATAFLOW1,
+                features=TEST_FEATURE,
+            )
+        ) as source:
+            async with source() as dfsctx:
+                records = await dfsctx.records_by_key(["1", "3"])
+        self.assertEqual(list(records.keys()), ["1", "3"])
+        for i in [1, 3]:
+            with self.subTest(i=i):
+                self.assertDictEqual(
+                    NEW_RECORDS[i].features(), records[str(i)].features()
+                )
+
+    async def test_records_by_key_no_strict(self):
+        run_operations_for_ctx = (
+            MemoryOrchestratorContext.run_operations_for_ctx
+        )
+
+        async def fail_on_2(self, ctx, *, strict=True):
+            if ctx.record.key == "2":
+                raise ValueError("Failed on 2")
+            return await run_operations_for_ctx(self, ctx, strict=strict)
+
+        source = MemorySource(
+            MemorySourceConfig(
+                records=[
+                    Record(
+                        str(i),
+                        data={
+                            "features": {
+                                "Years": A[i],
+                                "Expertise": B[i],
+                                "Trust": C[i],
+                                "Salary": D[i],
+                            }
+                        },
+                    )
+                    for i in range(4)
+                ]
+            )
+        )
+        async with DataFlowSource(
+            DataFlowSourceConfig(
+                source=Sources(source),
+                dataflow=TEST_DATAFLOW1,
+                features=TEST_FEATURE,
+                no_strict=True,
+            )
+        ) as source:
+            async with source() as dfsctx:
+                with patch.object(
+                    MemoryOrchestratorContext,
+                    "run_operations_for_ctx",
+                    fail_on_2,
+                ):
+                    records = await dfsctx.records_by_key(["1", "2"])
+        self.assertEqual(list(records.keys()), ["1", "2"])
+        self.assertDictEqual(
+            NEW_RECORDS[1].features(), records["1"].features()
+        )
+        # The context of the record the dataflow failed for is dropped, the
+        # record is left as it was
+        self.assertDictEqual(
+            {"Years": A[2], "Expertise": B[2], "Trust": C[2], "Salary": D[2]},
+            records["2"].features(),
+        )
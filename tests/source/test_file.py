@@ -72,6 +72,22 @@ class TestFileSource(AsyncTestCase):
                                     ),
                                     "config": {},
                                 },
+                                "journal": {
+                                    "plugin": Arg(
+                                        action="store_true",
+                                        default=False,
+                                        help="Append records to a JSON lines journal next to the file as they are updated. The journal is replayed when the file is opened",
+                                    ),
+                                    "config": {},
+                                },
+                                "keep_journal": {
+                                    "plugin": Arg(
+                                        action="store_true",
+                                        default=False,
+                                        help="Don't rewrite the file on close, leave the journal to be replayed on open. The file is rewritten by the next source to close it without this set",
+                                    ),
+                                    "config": {},
+                                },
                             },
                         }
                     },
@@ -1,9 +1,12 @@
+import gzip
 import json
+import struct
 import pathlib
 
 from dffml.util.net import cached_download
 from dffml.util.crypto import secure_hash
 from dffml.util.asynctestcase import AsyncTestCase
+from dffml.record import Record
 
 from dffml.source.idx1 import IDX1SourceConfig, IDX1Source
 from dffml.source.idx3 import IDX3SourceConfig, IDX3Source
@@ -56,3 +59,106 @@ class TestIDXSources(AsyncTestCase):
                             algorithm="sha384",
                         )
                         self.assertEqual(is_hash, IDX3_FIRST_LAST[i])
+
+
+class TestIDXSourcesLocal(AsyncTestCase):
+    IMAGES = [bytes(range(i, i + 6)) for i in range(0, 5)]
+    LABELS = [3, 1, 4, 1, 5]
+
+    def write(self, filename, header, data):
+        opener = gzip.open if filename.suffix == ".gz" else open
+        with opener(filename, "wb") as fd:
+            fd.write(header + data)
+
+    async def test_idx1(self):
+        for suffix in ["", ".gz"]:
+            with self.subTest(suffix=suffix):
+                filename = pathlib.Path(self.mktempdir(), "labels" + suffix)
+                self.write(
+                    filename,
+                    struct.pack(">HBBI", 0, 0x08, 1, len(self.LABELS)),
+                    bytes(self.LABELS),
+                )
+                async with IDX1Source(
+                    IDX1SourceConfig(filename=str(filename), feature="label")
+                ) as source:
+                    async with source() as sctx:
+                        records = [record async for record in sctx.records()]
+                        self.assertEqual(
+                            [record.feature("label") for record in records],
+                            self.LABELS,
+                        )
+                        record = await sctx.record("2")
+                        self.assertEqual(record.feature("label"), 4)
+                        record = await sctx.record("5")
+                        self.assertFalse(record.features())
+                        batches = [
+                            batch async for batch in sctx.batches(["label"], 2)
+                        ]
+                        self.assertEqual(
+                            [batch.keys for batch in batches],
+                            [["0", "1"], ["2", "3"], ["4"]],
+                        )
+                        self.assertEqual(
+                            [
+                                list(batch.features["label"])
+                                for batch in batches
+                            ],
+                            [[3, 1], [4, 1], [5]],
+                        )
+
+    async def test_idx1_big_endian(self):
+        labels = [300, -2, 1000]
+        filename = pathlib.Path(self.mktempdir(), "labels")
+        self.write(
+            filename,
+            struct.pack(">HBBI", 0, 0x0B, 1, len(labels)),
+            struct.pack(f">{len(labels)}h", *labels),
+        )
+        async with IDX1Source(
+            IDX1SourceConfig(filename=str(filename), feature="label")
+        ) as source:
+            async with source() as sctx:
+                records = [record async for record in sctx.records()]
+                self.assertEqual(
+                    [record.feature("label") for record in records], labels
+                )
+                # Batches are copied out of the file's data in native order
+                async for batch in sctx.batches(["label"]):
+                    self.assertTrue(batch.features["label"].dtype.isnative)
+                    self.assertTrue(batch.features["label"].flags.writeable)
+                    self.assertEqual(list(batch.features["label"]), labels)
+
+    async def test_idx3(self):
+        for suffix in ["", ".gz"]:
+            with self.subTest(suffix=suffix):
+                filename = pathlib.Path(self.mktempdir(), "images" + suffix)
+                self.write(
+                    filename,
+                    struct.pack(">HBBIII", 0, 0x08, 3, len(self.IMAGES), 2, 3),
+                    b"".join(self.IMAGES),
+                )
+                async with IDX3Source(
+                    IDX3SourceConfig(filename=str(filename), feature="image")
+                ) as source:
+                    async with source() as sctx:
+                        records = [record async for record in sctx.records()]
+                        self.assertEqual(
+                            [record.feature("image") for record in records],
+                            [tuple(image) for image in self.IMAGES],
+                        )
+                        # Batches of bytes are views of the file's data
+                        async for batch in sctx.batches(["image"]):
+                            self.assertFalse(
+                                batch.features["image"].flags.writeable
+                            )
+                        # Updated records are kept in memory
+                        await sctx.update(
+                            Record("1", data={"features": {"image": [42]}})
+                        )
+                        record = await sctx.record("1")
+                        self.assertEqual(record.feature("image"), [42])
+                        batches = [
+                            batch async for batch in sctx.batches(["image"])
+                        ]
+                        self.assertEqual(len(batches[0].keys), 5)
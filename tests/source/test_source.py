@@ -0,0 +1,106 @@
+from dffml.record import Record
+from dffml.source.memory import (
+    MemorySource,
+    MemorySourceConfig,
+    MemorySourceContext,
+)
+from dffml.source.source import (
+    Sources,
+    ValidationSources,
+    NoRecordsWithMatchingFeatures,
+)
+from dffml.util.asynctestcase import AsyncTestCase
+
+
+class CountingMemorySourceContext(MemorySourceContext):
+    async def records_by_key(self, keys):
+        self.parent.calls.append(keys)
+        return await super().records_by_key(keys)
+
+    async def records(self):
+        async for record in super().records():
+            self.parent.yielded.append(record.key)
+            yield record
+
+
+class CountingMemorySource(MemorySource):
+    CONTEXT = CountingMemorySourceContext
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = []
+        self.yielded = []
+
+
+class TestSourcesContext(AsyncTestCase):
+    async def setUp(self):
+        await super().setUp()
+        self.first = MemorySource(
+            MemorySourceConfig(
+                records=[
+                    Record(str(i), data={"features": {"a": i}})
+                    for i in range(0, 5)
+                ]
+            )
+        )
+        self.second = MemorySource(
+            MemorySourceConfig(
+                records=[
+                    Record(str(i), data={"features": {"b": i * 2}})
+                    for i in range(0, 5)
+                ]
+            )
+        )
+
+    async def test_batches(self):
+        async with Sources(self.first) as sources, sources() as sctx:
+            batches = [batch async for batch in sctx.batches(["a"], 2)]
+        self.assertEqual(
+            [batch.keys for batch in batches], [["0", "1"], ["2", "3"], ["4"]]
+        )
+        self.assertEqual(
+            [batch.features["a"].tolist() for batch in batches],
+            [[0, 1], [2, 3], [4]],
+        )
+
+    async def test_batches_merged(self):
+        async with Sources(
+            self.first, self.second
+        ) as sources, sources() as sctx:
+            batches = [batch async for batch in sctx.batches(["a", "b"])]
+        self.assertEqual(
+            {k: v.tolist() for k, v in batches[0].features.items()},
+            {"a": [0, 1, 2, 3, 4], "b": [0, 2, 4, 6, 8]},
+        )
+
+    async def test_batches_validation(self):
+        async with ValidationSources(
+            lambda record: record.feature("a") % 2 == 0, self.first
+        ) as sources, sources() as sctx:
+            batches = [batch async for batch in sctx.batches(["a"])]
+        self.assertEqual(batches[0].keys, ["0", "2", "4"])
+
+    async def test_batches_no_matching_features(self):
+        async with Sources(self.first) as sources, sources() as sctx:
+            with self.assertRaises(NoRecordsWithMatchingFeatures):
+                async for batch in sctx.batches(["b"]):
+                    pass
+
+    async def test_records_joined_by_chunk(self):
+        second = CountingMemorySource(self.second.config)
+        async with Sources(self.first, second) as sources, sources() as sctx:
+            records = [record async for record in sctx.records(chunk_size=2)]
+        self.assertEqual(
+            [record.features() for record in records],
+            [{"a": i, "b": i * 2} for i in range(0, 5)],
+        )
+        # One lookup per chunk of keys rather than one per record
+        self.assertEqual(second.calls, [["0", "1"], ["2", "3"], ["4"]])
+
+    async def test_records_single_source(self):
+        first = CountingMemorySource(self.first.config)
+        async with Sources(first) as sources, sources() as sctx:
+            async for record in sctx.records():
+                # Records are yielded as soon as the source yields them
+                self.assertEqual(first.yielded[-1], record.key)
+        self.assertEqual(first.calls, [])
@@ -0,0 +1,58 @@
+import pathlib
+import importlib.util
+
+from dffml.util.asynctestcase import AsyncTestCase
+
+SCRIPT_PATH = (
+    pathlib.Path(__file__).parents[1] / "scripts" / "bench_orchestrator.py"
+)
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location(
+        "bench_orchestrator", SCRIPT_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchOrchestrator(AsyncTestCase):
+    async def test_topologies(self):
+        bench = load_script()
+        size, contexts = 2, 3
+        for topology, operations in {
+            "chain": size,
+            "fanout": 1 + size,
+            "diamond": 3 * size,
+            "conditions": 2 * size,
+        }.items():
+            with self.subTest(topology=topology):
+                result = await bench.benchmark(topology, size, contexts)
+                self.assertEqual(result["operations"], operations * contexts)
+                self.assertGreater(result["operations_per_second"], 0)
+                self.assertLessEqual(
+                    result["latency"]["p50"], result["latency"]["max"]
+                )
+
+    def test_compare(self):
+        bench = load_script()
+        previous = {
+            "benchmarks": [
+                {
+                    "topology": "chain",
+                    "size": 4,
+                    "contexts": 100,
+                    "max_ctxs": None,
+                    "max_operations": None,
+                    "operations_per_second": 1000.0,
+                }
+            ]
+        }
+        current = {
+            "benchmarks": [
+                dict(previous["benchmarks"][0], operations_per_second=850.0)
+            ]
+        }
+        self.assertFalse(bench.compare(previous, current, 0.2))
+        self.assertTrue(bench.compare(previous, current, 0.1))
@@ -169,13 +169,26 @@ class TestOrchestrator(AsyncTestCase):
 
     async def test_run(self):
         calc_strings_check = {"add 40 and 2": 42, "multiply 42 and 10": 420}
-        # TODO(p0) Implement and test asyncgenerator
         callstyles_no_expand = [
             "asyncgenerator",
             "dict",
             "dict_custom_input_set_context",
         ]
+
+        async def asyncgenerator():
+            for to_calc in calc_strings_check.keys():
+                yield to_calc, [
+                    Input(
+                        value=to_calc, definition=parse_line.op.inputs["line"]
+                    ),
+                    Input(
+                        value=[add.op.outputs["sum"].name],
+                        definition=GetSingle.op.inputs["spec"],
+                    ),
+                ]
+
         callstyles = {
+            "asyncgenerator": asyncgenerator(),
             "dict": {
                 to_calc: [
                     Input(
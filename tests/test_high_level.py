@@ -1,21 +1,50 @@
 """
 This file contains integration tests for the high level (very abstract) APIs.
 """
+import random
 import importlib
 import contextlib
+from unittest import mock
 
 from dffml.record import Record
-from dffml import run, train, accuracy, predict, save, load
+from dffml import (
+    run,
+    train,
+    accuracy,
+    predict,
+    save,
+    load,
+    sweep,
+    cross_validate,
+)
 from dffml.source.csv import CSVSource
 from dffml.feature.feature import Features, Feature
 from dffml.util.asynctestcase import AsyncTestCase
-from dffml.accuracy import MeanSquaredErrorAccuracy
+from dffml.model.slr import SLRModel
+from dffml.util.entrypoint import entrypoint
+from dffml.accuracy import (
+    MeanSquaredErrorAccuracy,
+    ClassificationAccuracy,
+    AccuracyScorer,
+    AccuracyContext,
+    AccuracyScorers,
+)
 
 from .test_df import TestOrchestrator, DATAFLOW
 
 FEATURE_NAMES = ["Years", "Expertise", "Trust", "Salary"]
 
 
+class CountAccuracyContext(AccuracyContext):
+    async def score(self, mctx, sources):
+        return float(len([record async for record in mctx.predict(sources)]))
+
+
+@entrypoint("count")
+class CountAccuracy(AccuracyScorer):
+    CONTEXT = CountAccuracyContext
+
+
 class TestML(AsyncTestCase):
     async def populate_source(self, source_cls, *records, **kwargs):
         kwargs.setdefault("allowempty", True)
@@ -135,6 +164,200 @@ class TestML(AsyncTestCase):
         self.assertEqual(round(predictions[0][2]["Salary"]["value"]), 70)
         self.assertEqual(round(predictions[1][2]["Salary"]["value"]), 80)
 
+    async def test_accuracy_scorers(self):
+        model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        await train(model, CSVSource(filename=self.train_filename))
+        with mock.patch.object(
+            SLRModel, "predict", autospec=True, side_effect=SLRModel.predict,
+        ) as mock_predict:
+            scores = await accuracy(
+                model,
+                AccuracyScorers(
+                    MeanSquaredErrorAccuracy(), ClassificationAccuracy()
+                ),
+                CSVSource(filename=self.test_filename),
+            )
+        # Both scores come from one pass of predictions
+        mock_predict.assert_called_once()
+        self.assertEqual(scores, {"mse": 0.0, "clf": 1.0})
+        self.assertEqual(
+            scores["mse"],
+            await accuracy(
+                model,
+                MeanSquaredErrorAccuracy(),
+                CSVSource(filename=self.test_filename),
+            ),
+        )
+
+    async def test_accuracy_scorers_without_accumulators(self):
+        model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        await train(model, CSVSource(filename=self.train_filename))
+        with mock.patch.object(
+            SLRModel, "predict", autospec=True, side_effect=SLRModel.predict,
+        ) as mock_predict:
+            scores = await accuracy(
+                model,
+                AccuracyScorers(CountAccuracy()),
+                CSVSource(filename=self.test_filename),
+            )
+        # No pass of predictions is made for scorers without accumulators
+        mock_predict.assert_called_once()
+        self.assertEqual(scores, {"count": 2.0})
+
+    async def test_sweep(self):
+        model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        source = CSVSource(filename=self.train_filename)
+        grid = {
+            "features": [
+                Features(Feature("Years", int, 1)),
+                Features(Feature("Trust", float, 1)),
+            ]
+        }
+        rows = await sweep(
+            model,
+            AccuracyScorers(MeanSquaredErrorAccuracy()),
+            source,
+            grid=grid,
+            folds=2,
+            processes=1,
+        )
+        self.assertEqual(
+            [(row["features"], row["fold"]) for row in rows],
+            [
+                (features, fold)
+                for features in grid["features"]
+                for fold in range(2)
+            ],
+        )
+        # The first fold is scored on the first half of the records by a
+        # model trained on the second half
+        fold_model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        await train(fold_model, *self.train_records[2:])
+        self.assertEqual(
+            rows[0]["mse"],
+            await accuracy(
+                fold_model,
+                MeanSquaredErrorAccuracy(),
+                *self.train_records[:2],
+            ),
+        )
+        # Folds are scored the same in a pool of processes
+        self.assertEqual(
+            [row["mse"] for row in rows],
+            [
+                row["mse"]
+                for row in await sweep(
+                    model,
+                    AccuracyScorers(MeanSquaredErrorAccuracy()),
+                    source,
+                    grid=grid,
+                    folds=2,
+                    processes=2,
+                )
+            ],
+        )
+        self.assertEqual(
+            [row["mse"] for row in rows[:2]],
+            await cross_validate(
+                model, MeanSquaredErrorAccuracy(), source, folds=2
+            ),
+        )
+        # With AccuracyScorers each fold has only its scores
+        self.assertEqual(
+            [{"mse": row["mse"]} for row in rows[:2]],
+            await cross_validate(
+                model,
+                AccuracyScorers(MeanSquaredErrorAccuracy()),
+                source,
+                folds=2,
+            ),
+        )
+        with self.assertRaises(ValueError):
+            await cross_validate(
+                model, MeanSquaredErrorAccuracy(), source, folds=1
+            )
+        # Grid keys which would be overwritten in each row
+        for scorer, key in [
+            (MeanSquaredErrorAccuracy(), "location"),
+            (MeanSquaredErrorAccuracy(), "fold"),
+            (MeanSquaredErrorAccuracy(), "accuracy"),
+            (AccuracyScorers(MeanSquaredErrorAccuracy()), "mse"),
+        ]:
+            with self.subTest(key=key), self.assertRaisesRegex(
+                ValueError, key
+            ):
+                await sweep(model, scorer, source, grid={key: [None]})
+
+    async def test_sweep_shuffle(self):
+        model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        records = [
+            Record(str(i), data={"features": {"Years": i, "Salary": i * i}})
+            for i in range(6)
+        ]
+        # The first fold is scored on the first half of the shuffled records
+        shuffled = list(records)
+        random.Random(0).shuffle(shuffled)
+        fold_model = SLRModel(
+            location=self.mktempdir(),
+            predict=Feature("Salary", int, 1),
+            features=Features(Feature("Years", int, 1)),
+        )
+        await train(fold_model, *shuffled[3:])
+        scores = await cross_validate(
+            model,
+            MeanSquaredErrorAccuracy(),
+            *records,
+            folds=2,
+            processes=1,
+            shuffle=True,
+            seed=0,
+        )
+        self.assertEqual(
+            scores[0],
+            await accuracy(
+                fold_model, MeanSquaredErrorAccuracy(), *shuffled[:3]
+            ),
+        )
+        # Shuffled the same way with the same seed
+        self.assertEqual(
+            scores,
+            await cross_validate(
+                model,
+                MeanSquaredErrorAccuracy(),
+                *records,
+                folds=2,
+                processes=1,
+                shuffle=True,
+                seed=0,
+            ),
+        )
+        self.assertNotEqual(
+            scores,
+            await cross_validate(
+                model, MeanSquaredErrorAccuracy(), *records, folds=2
+            ),
+        )
+
 
 class TestDataFlow(TestOrchestrator):
     @contextlib.asynccontextmanager